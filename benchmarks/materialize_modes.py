@@ -0,0 +1,122 @@
+"""
+Compare serial, thread-pool and asyncio folder materialization
+
+Every filesystem step is delayed by a fixed latency before it runs, which
+simulates the round trip of a network share on a local disk. The same
+synthetic template is materialized into a fresh temporary directory in each
+mode.
+
+Usage:
+    python benchmarks/materialize_modes.py [--nodes 300] [--latency-ms 5]
+                                           [--workers 16] [--repeat 3] [--json]
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import materializer  # noqa: E402
+from src.materializer import CompiledStructure, execute_plan, execute_plan_async  # noqa: E402
+
+
+def make_template(nodes: int, fanout: int = 6, auto_every: int = 10) -> dict:
+    """Build a template with about ``nodes`` folders plus a few files
+
+    Every ``auto_every``-th top-level folder is marked "auto" so the sync
+    tree and its shortcuts are exercised too.
+    """
+    count = 0
+    top = []
+    queue = []
+    while count < nodes:
+        if len(top) < fanout or not queue:
+            folder = {"name": f"folder_{count:04d}", "folders": []}
+            if len(top) % auto_every == auto_every - 1:
+                folder["attribute"] = "auto"
+            top.append(folder)
+        else:
+            parent = queue.pop(0)
+            folder = {"name": f"sub_{count:04d}", "folders": []}
+            parent["folders"].append(folder)
+            if len(parent["folders"]) < fanout:
+                queue.insert(0, parent)
+        queue.append(folder)
+        count += 1
+    files = [{"name": "README.txt"}, {"name": "notes.txt", "attribute": "auto"}]
+    return {"folders": top, "files": files}
+
+
+def create_link(link_path: str, target_path: str, is_dir=None):
+    if is_dir is None:
+        is_dir = os.path.isdir(target_path)
+    os.symlink(target_path, link_path, target_is_directory=is_dir)
+
+
+def with_latency(latency: float):
+    """Wrap materializer.run_step so every step sleeps first"""
+    original = materializer.run_step
+
+    def slow_run_step(step, link):
+        time.sleep(latency)
+        original(step, link)
+
+    return original, slow_run_step
+
+
+def run_mode(mode: str, compiled: CompiledStructure, workers: int) -> float:
+    root = tempfile.mkdtemp(prefix=f"pfm-bench-{mode}-")
+    try:
+        plan = compiled.build_plan(os.path.join(root, "parent", "Project"), os.path.join(root, "sync", "Project"))
+        start = time.perf_counter()
+        if mode == "serial":
+            execute_plan(plan, create_link, max_workers=1)
+        elif mode == "threads":
+            execute_plan(plan, create_link, max_workers=workers)
+        else:
+            asyncio.run(execute_plan_async(plan, create_link, concurrency=workers))
+        return time.perf_counter() - start
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=300, help="number of folders in the template")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="simulated latency per filesystem call")
+    parser.add_argument("--workers", type=int, default=16, help="threads / async concurrency")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per mode (best is reported)")
+    parser.add_argument("--modes", default="serial,threads,asyncio")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    compiled = CompiledStructure(make_template(args.nodes))
+    steps = len(compiled.build_plan("/p", "/s"))
+    original, slow = with_latency(args.latency_ms / 1000.0)
+    materializer.run_step = slow
+    try:
+        results = {}
+        for mode in args.modes.split(","):
+            results[mode] = min(run_mode(mode, compiled, args.workers) for _ in range(args.repeat))
+    finally:
+        materializer.run_step = original
+
+    if args.json:
+        print(json.dumps({"nodes": args.nodes, "steps": steps, "latency_ms": args.latency_ms,
+                          "workers": args.workers, "seconds": results}, indent=2))
+        return 0
+    print(f"{steps} steps, {args.latency_ms:g} ms latency, {args.workers} workers")
+    baseline = results.get("serial")
+    for mode, seconds in results.items():
+        speedup = f"  x{baseline / seconds:.1f}" if baseline else ""
+        print(f"  {mode:<8} {seconds * 1000:8.1f} ms{speedup}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
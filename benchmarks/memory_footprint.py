@@ -0,0 +1,133 @@
+"""
+Measure the memory footprint and GC cost of the project records
+
+Compares the slotted Project with a plain class that keeps its attributes
+in a per-instance __dict__ (the layout Project had before), loaded from the
+same parsed JSON, and the snapshot encoder (one dict per record at a time)
+with encoding a full list of to_dict() results:
+
+- retained bytes per record (tracemalloc, after the parsed dicts are freed)
+- time of a full gc.collect() with the records alive
+- peak bytes allocated while encoding the snapshot text
+
+Usage:
+    python benchmarks/memory_footprint.py [--projects 100000] [--repeat 3] [--json]
+"""
+import os
+import gc
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import Project  # noqa: E402
+from src.storage import encode_records  # noqa: E402
+from models_hot_paths import write_registry  # noqa: E402
+
+
+class DictProject:
+    """Project as a plain class with an instance __dict__"""
+
+    def __init__(self, id, name, description="", status="active", start_date="", end_date="", group_id=0,
+                 archive_path=""):
+        self.id = id
+        self.name = name
+        self.description = description
+        self.status = status
+        self.start_date = start_date
+        self.end_date = end_date
+        self.group_id = group_id
+        self.archive_path = archive_path
+
+    def to_dict(self):
+        return dict(self.__dict__)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{key: data.get(key, "") for key in (
+            "id", "name", "description", "status", "start_date", "end_date", "group_id", "archive_path"
+        )})
+
+
+def load(text: str, from_dict) -> list:
+    """Parse the registry text into records, dropping the parsed dicts"""
+    return [from_dict(item) for item in json.loads(text)]
+
+
+def retained_bytes(text: str, from_dict) -> int:
+    """Bytes still allocated after loading the records (strings included)"""
+    gc.collect()
+    tracemalloc.start()
+    records = load(text, from_dict)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return size
+
+
+def gc_seconds(text: str, from_dict, repeat: int) -> float:
+    """Best time of a full collection while the records are alive"""
+    records = load(text, from_dict)  # noqa: F841 (kept alive)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        gc.collect()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def encode_peak(records, encode) -> int:
+    gc.collect()
+    tracemalloc.start()
+    encode(records)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--projects", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3, help="gc.collect() runs (best is reported)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    import tempfile
+    with tempfile.TemporaryDirectory(prefix="pfm-memory-") as directory:
+        write_registry(directory, args.projects, 1000)
+        with open(os.path.join(directory, "project_lists.json"), encoding="utf-8") as f:
+            text = f.read()
+
+    results = {"projects": args.projects}
+    for label, from_dict in (("dict", DictProject.from_dict), ("slots", Project.from_dict)):
+        results[label] = {
+            "bytes_per_record": retained_bytes(text, from_dict) / args.projects,
+            "gc_collect_ms": gc_seconds(text, from_dict, args.repeat) * 1000,
+        }
+    records = load(text, Project.from_dict)
+    results["encode_peak_bytes"] = {
+        "list_of_dicts": encode_peak(
+            records, lambda rs: json.dumps([r.to_dict() for r in rs], indent=2, ensure_ascii=False)
+        ),
+        "per_record": encode_peak(records, lambda rs: encode_records(rs, 2)),
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    print(f"{args.projects} projects")
+    for label in ("dict", "slots"):
+        print(f"  {label:<6} {results[label]['bytes_per_record']:8.0f} bytes/record"
+              f"  gc.collect {results[label]['gc_collect_ms']:7.1f} ms")
+    peaks = results["encode_peak_bytes"]
+    print(f"  snapshot encode peak: {peaks['list_of_dicts'] / 2**20:.1f} MiB with a list of dicts, "
+          f"{peaks['per_record'] / 2**20:.1f} MiB per record")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,342 @@
+"""
+Benchmark the ProjectManager and StructureManager hot paths at scale
+
+"run" generates synthetic registries (projects spread over groups) and a deep
+structure template in a scratch directory, preferably on tmpfs (/dev/shm),
+points the models module at them and times:
+
+- load_projects (cold: a new ProjectManager; warm: served from memory)
+- count_projects and get_project on a new ProjectManager (streamed)
+- save_projects, add_project, update_project, delete_project
+- get_group_by_id
+- _has_auto_items (only the deepest node is "auto", so the whole template is
+  walked) and create_project_folders
+
+Results are written as JSON. "compare" reads two result files and flags the
+cases whose median got slower by more than a threshold; it exits with
+status 1 when anything regressed, so it can gate CI.
+
+Usage:
+    python benchmarks/models_hot_paths.py run [--sizes 1000,10000,100000] [--groups 1000]
+        [--nodes 1500] [--backend json] [--repeat 5] [--dir /dev/shm] [--output FILE]
+    python benchmarks/models_hot_paths.py compare BASE.json NEW.json [--threshold 0.2]
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import contextlib
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import models  # noqa: E402
+from src.config import FSYNC_POLICY, STATUS_ACTIVE, STATUS_INACTIVE  # noqa: E402
+from src.models import ProjectManager, StructureManager  # noqa: E402
+
+RESULTS_VERSION = 1
+
+# Module paths redirected to the scratch directory while a case runs
+REGISTRY_PATHS = {
+    "PROJECT_LISTS_FILE": "project_lists.json",
+    "PROJECT_GROUPS_FILE": "project_groups.json",
+    "PROJECT_DB_FILE": "project_registry.db",
+    "STRUCTURE_JSON": "project_folder_structure.json",
+}
+
+
+def default_directory() -> str:
+    """tmpfs when available, so disk latency does not drown the numbers"""
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+
+@contextlib.contextmanager
+def isolated_registry(directory: str):
+    """Point the models module at registry files inside ``directory``"""
+    saved = {name: getattr(models, name) for name in REGISTRY_PATHS}
+    for name, filename in REGISTRY_PATHS.items():
+        setattr(models, name, os.path.join(directory, filename))
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(models, name, value)
+
+
+def write_registry(directory: str, projects: int, groups: int):
+    """Write project and group JSON files with synthetic records"""
+    group_records = [
+        {"id": i, "name": f"Group {i:05d}", "description": f"Synthetic group {i}", "status": STATUS_ACTIVE}
+        for i in range(1, groups + 1)
+    ]
+    project_records = []
+    for i in range(1, projects + 1):
+        inactive = i % 5 == 0
+        project_records.append({
+            "id": i,
+            "name": f"Project {i:07d}",
+            "description": f"Synthetic project number {i} for benchmarking",
+            "status": STATUS_INACTIVE if inactive else STATUS_ACTIVE,
+            "start_date": "2024-01-01",
+            "end_date": "2024-12-31" if inactive else "",
+            "group_id": i % (groups + 1),
+        })
+    for filename, records in (("project_lists.json", project_records), ("project_groups.json", group_records)):
+        with open(os.path.join(directory, filename), "w", encoding="utf-8") as f:
+            json.dump(records, f, indent=2)
+
+
+def make_template(nodes: int, fanout: int = 4) -> dict:
+    """Template with ``nodes`` folders in breadth-first levels of ``fanout``
+
+    Only the last (deepest) folder and file are "auto", which is the worst
+    case for _has_auto_items.
+    """
+    root = {"folders": [], "files": [{"name": "README.txt"}]}
+    queue = [root]
+    created = []
+    while len(created) < nodes:
+        parent = queue.pop(0)
+        for _ in range(fanout):
+            if len(created) >= nodes:
+                break
+            folder = {"name": f"folder_{len(created):05d}", "comment": "synthetic", "folders": []}
+            parent["folders"].append(folder)
+            created.append(folder)
+            queue.append(folder)
+    created[-1]["attribute"] = "auto"
+    created[-1]["files"] = [{"name": "notes.txt", "attribute": "auto"}]
+    return root
+
+
+def summarize(samples: list, number: int = 1) -> dict:
+    """Per-call statistics in milliseconds"""
+    per_call = sorted(sample / number * 1000 for sample in samples)
+    p95 = per_call[min(len(per_call) - 1, int(round(0.95 * (len(per_call) - 1))))]
+    return {
+        "samples": len(per_call),
+        "number": number,
+        "min_ms": per_call[0],
+        "median_ms": statistics.median(per_call),
+        "mean_ms": statistics.fmean(per_call),
+        "p95_ms": p95,
+    }
+
+
+def measure(func, repeat: int, number: int = 1) -> dict:
+    """Run ``func(i)`` ``number`` times per sample, ``repeat`` samples"""
+    samples = []
+    counter = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func(counter)
+            counter += 1
+        samples.append(time.perf_counter() - start)
+    return summarize(samples, number)
+
+
+def registry_cases(directory: str, size: int, groups: int, backend: str, repeat: int) -> dict:
+    """Time the ProjectManager operations against a registry of ``size`` projects"""
+    write_registry(directory, size, groups)
+    results = {}
+    rng = random.Random(size)
+    with isolated_registry(directory):
+        pm = ProjectManager(backend)
+        pm.preload()
+
+        def load_cold(_):
+            ProjectManager(backend).load_projects()
+
+        results["load_projects (cold)"] = measure(load_cold, repeat)
+        # Streamed from the file by a manager that has not loaded the list
+        results["count_projects (cold)"] = measure(lambda _: ProjectManager(backend).count_projects(1), repeat)
+        results["get_project (cold)"] = measure(lambda _: ProjectManager(backend).get_project(size // 2), repeat)
+        results["load_projects"] = measure(lambda _: pm.load_projects(), repeat)
+
+        projects = pm.load_projects()
+        results["save_projects"] = measure(lambda _: pm.save_projects(projects), repeat)
+
+        added = []
+        results["add_project"] = measure(
+            lambda i: added.append(pm.add_project(f"Benchmark {i:05d}", "added", STATUS_ACTIVE, 1)), repeat
+        )
+
+        def update(_):
+            project = pm.get_project(rng.randint(1, size))
+            project.description = f"updated {rng.random()}"
+            pm.update_project(project)
+
+        results["update_project"] = measure(update, repeat)
+        results["delete_project"] = measure(lambda i: pm.delete_project(added[i].id), repeat)
+
+        results["get_group_by_id"] = measure(lambda _: pm.get_group_by_id(rng.randint(1, groups)), repeat, 1000)
+        pm.flush()
+    return results
+
+
+def structure_cases(directory: str, nodes: int, repeat: int) -> dict:
+    """Time the StructureManager operations against a template of ``nodes`` folders"""
+    template = make_template(nodes)
+    template.update({
+        "parent_directory": os.path.join(directory, "parent"),
+        "sync_directory": os.path.join(directory, "sync"),
+        # A fixed strategy keeps the one-off link probe out of the numbers
+        "link_strategy": "symlink",
+    })
+    for name in ("parent", "sync"):
+        os.makedirs(template[f"{name}_directory"])
+    with open(os.path.join(directory, REGISTRY_PATHS["STRUCTURE_JSON"]), "w", encoding="utf-8") as f:
+        json.dump(template, f)
+
+    results = {}
+    with isolated_registry(directory):
+        sm = StructureManager()
+        structure = sm.load_structure()
+        results["_has_auto_items"] = measure(lambda _: sm._has_auto_items(structure), repeat, 10)
+        results["_has_auto_items (cached)"] = measure(lambda _: sm._has_auto_items(), repeat, 10)
+
+        def create(i):
+            name = f"Project {i:05d}"
+            sm.create_project_folders(
+                os.path.join(sm.get_parent_directory(), name),
+                sync_path=os.path.join(sm.get_sync_directory(), name),
+            )
+
+        results["create_project_folders"] = measure(create, repeat)
+    return results
+
+
+def cmd_run(args) -> int:
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    root = tempfile.mkdtemp(prefix="pfm-bench-", dir=args.dir)
+    results = {}
+    try:
+        for size in sizes:
+            directory = os.path.join(root, f"registry-{size}")
+            os.makedirs(directory)
+            start = time.perf_counter()
+            for case, stats in registry_cases(directory, size, args.groups, args.backend, args.repeat).items():
+                results[f"projects={size}/{case}"] = stats
+            print(f"projects={size}: {time.perf_counter() - start:.1f}s", file=sys.stderr)
+            shutil.rmtree(directory, ignore_errors=True)
+
+        directory = os.path.join(root, "structure")
+        os.makedirs(directory)
+        for case, stats in structure_cases(directory, args.nodes, args.repeat).items():
+            results[f"nodes={args.nodes}/{case}"] = stats
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    data = {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": args.backend,
+            "fsync_policy": FSYNC_POLICY,
+            "directory": args.dir,
+            "groups": args.groups,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    text = json.dumps(data, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.output:
+        for case, stats in results.items():
+            print(f"  {case:<48} {stats['median_ms']:10.3f} ms", file=sys.stderr)
+    return 0
+
+
+def compare(base: dict, new: dict, threshold: float, min_ms: float) -> list:
+    """Rows of (case, base ms, new ms, ratio, status) for the cases in both runs"""
+    rows = []
+    for case, stats in new["results"].items():
+        if case not in base["results"]:
+            rows.append((case, None, stats["median_ms"], None, "new"))
+            continue
+        before = base["results"][case]["median_ms"]
+        after = stats["median_ms"]
+        ratio = after / before if before else float("inf")
+        status = "ok"
+        if after - before > min_ms and ratio > 1 + threshold:
+            status = "REGRESSION"
+        elif before - after > min_ms and ratio < 1 / (1 + threshold):
+            status = "faster"
+        rows.append((case, before, after, ratio, status))
+    for case in base["results"]:
+        if case not in new["results"]:
+            rows.append((case, base["results"][case]["median_ms"], None, None, "missing"))
+    return rows
+
+
+def cmd_compare(args) -> int:
+    runs = []
+    for path in (args.base, args.new):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != RESULTS_VERSION:
+            print(f"{path}: unsupported results version {data.get('version')}", file=sys.stderr)
+            return 2
+        runs.append(data)
+    for key in ("backend", "fsync_policy", "python", "platform"):
+        before, after = (run["meta"].get(key) for run in runs)
+        if before != after:
+            print(f"warning: {key} differs ({before} vs {after})", file=sys.stderr)
+    rows = compare(runs[0], runs[1], args.threshold, args.min_ms)
+    if args.json:
+        print(json.dumps([dict(zip(("case", "base_ms", "new_ms", "ratio", "status"), row)) for row in rows], indent=2))
+    else:
+        for case, before, after, ratio, status in rows:
+            before_text = "-" if before is None else f"{before:.3f}"
+            after_text = "-" if after is None else f"{after:.3f}"
+            ratio_text = "" if ratio is None else f"x{ratio:.2f}"
+            print(f"{case:<48} {before_text:>10} {after_text:>10} {ratio_text:>7}  {status}")
+    regressions = sum(1 for row in rows if row[4] == "REGRESSION")
+    if not args.json:
+        print(f"{regressions} regression(s) (threshold {args.threshold:.0%}, noise floor {args.min_ms} ms)")
+    return 1 if regressions else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.required = True
+
+    p = commands.add_parser("run", help="run the benchmarks and write JSON results")
+    p.add_argument("--sizes", default="1000,10000,100000", help="registry sizes (number of projects)")
+    p.add_argument("--groups", type=int, default=1000, help="number of groups")
+    p.add_argument("--nodes", type=int, default=1500, help="folders in the structure template")
+    p.add_argument("--backend", default="json", choices=["json", "journal", "sqlite"])
+    p.add_argument("--repeat", type=int, default=5, help="samples per case")
+    p.add_argument("--dir", default=default_directory(), help="scratch directory (default: tmpfs if available)")
+    p.add_argument("--output", "-o", help="write the results here instead of stdout")
+    p.set_defaults(func=cmd_run)
+
+    p = commands.add_parser("compare", help="compare two result files")
+    p.add_argument("base")
+    p.add_argument("new")
+    p.add_argument("--threshold", type=float, default=0.2, help="relative slowdown reported as a regression")
+    p.add_argument("--min-ms", type=float, default=0.01, help="ignore differences below this (noise floor)")
+    p.add_argument("--json", action="store_true", help="print the comparison as JSON")
+    p.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
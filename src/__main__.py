@@ -0,0 +1,8 @@
+"""
+Headless entry point: python -m src <command>
+"""
+import sys
+from .cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,434 @@
+"""
+Archival of inactive projects
+
+An inactive project (status inactive with an end date) can be packed into a
+single compressed archive in the archive directory: its folder under the
+parent directory and its counterpart under the sync directory are stored as
+``parent/<name>/...`` and ``sync/<name>/...``. Files are streamed into the
+archive and read back in ARCHIVE_CHUNK pieces, so memory use does not grow
+with project size. Shortcuts are stored as links, not followed.
+
+Archiving is three steps, so no crash or failure can leave folders deleted
+without the archive path on record:
+
+1. archive() writes each archive and reads it back; every entry must match
+   what was written. Nothing is deleted.
+2. record() stores the archive paths on the Projects in one save.
+3. clean_up() removes the original folders. Folders that cannot be removed
+   are reported as failures; the project stays archived.
+
+restore() unpacks archives into the current parent/sync directories, record()
+clears the archive paths and clean_up() then deletes the archives.
+
+Folder work runs on worker threads; record() updates the registry and must
+run where the ProjectManager's listeners expect it (the Tk thread in the
+GUI).
+"""
+import os
+import stat
+import shutil
+import tarfile
+import zipfile
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from .config import ARCHIVE_FORMAT, ARCHIVE_CHUNK, STATUS_INACTIVE
+from .materializer import MaterializeCancelled
+from .models import Project
+
+# format -> (file extension, tarfile mode; None for zip)
+ARCHIVE_FORMATS = {
+    "tar.gz": (".tar.gz", "w:gz"),
+    "tar.xz": (".tar.xz", "w:xz"),
+    "zip": (".zip", None),
+}
+
+PARENT_PREFIX = "parent"
+SYNC_PREFIX = "sync"
+
+
+class ArchiveError(Exception):
+    """Raised when an archive cannot be written, verified or restored"""
+
+
+class ArchiveResult:
+    """Outcome of archiving or restoring several projects"""
+
+    def __init__(self):
+        self.done: List[Tuple[object, str]] = []     # (project, archive path)
+        self.failed: List[Tuple[str, str]] = []      # (project name, reason)
+        self.cancelled = False
+
+    def summary(self) -> str:
+        lines = [f"{len(self.done)} project(s) done, {len(self.failed)} failed."]
+        if self.cancelled:
+            lines[0] += " Cancelled before the rest were started."
+        for name, reason in self.failed:
+            lines.append(f"  {name}: {reason}")
+        return "\n".join(lines)
+
+
+def is_archivable(project) -> bool:
+    """Inactive, ended and not archived yet"""
+    return project.status == STATUS_INACTIVE and bool(project.end_date) and not project.archive_path
+
+
+def _remove_path(path: str):
+    """Delete a project root; a symlinked root is unlinked, not followed"""
+    if os.path.islink(path) or not os.path.isdir(path):
+        os.unlink(path)
+    else:
+        shutil.rmtree(path)
+
+
+def _check(cancelled: Optional[Callable[[], bool]]):
+    if cancelled is not None and cancelled():
+        raise MaterializeCancelled()
+
+
+def _walk(root: str, prefix: str) -> List[Tuple[str, str]]:
+    """(path, archive name) of root and everything below it, links not followed"""
+    entries = [(root, prefix)]
+    for dirpath, dirnames, filenames in os.walk(root):
+        relative = os.path.relpath(dirpath, root)
+        base = prefix if relative == "." else prefix + "/" + relative.replace(os.sep, "/")
+        for name in sorted(dirnames) + sorted(filenames):
+            entries.append((os.path.join(dirpath, name), base + "/" + name))
+        # os.walk lists symlinked folders in dirnames but does not enter them
+    return entries
+
+
+def _manifest_entry(path: str) -> Tuple[str, int]:
+    st = os.lstat(path)
+    if stat.S_ISLNK(st.st_mode):
+        return ("l", 0)
+    if stat.S_ISDIR(st.st_mode):
+        return ("d", 0)
+    return ("f", st.st_size)
+
+
+def write_archive(archive_path: str, roots: List[Tuple[str, str]], fmt: str = ARCHIVE_FORMAT,
+                  cancelled: Optional[Callable[[], bool]] = None) -> Dict[str, Tuple[str, int]]:
+    """Stream the (folder, archive prefix) roots into a new archive
+
+    Returns the manifest {archive name: (kind, size)} of what was written.
+    """
+    if fmt not in ARCHIVE_FORMATS:
+        raise ArchiveError(f"Unknown archive format '{fmt}'")
+    _, mode = ARCHIVE_FORMATS[fmt]
+    entries = [entry for root, prefix in roots for entry in _walk(root, prefix)]
+    manifest: Dict[str, Tuple[str, int]] = {}
+
+    if mode is not None:
+        with tarfile.open(archive_path, mode) as tar:
+            for path, name in entries:
+                _check(cancelled)
+                manifest[name] = _manifest_entry(path)
+                tar.add(path, arcname=name, recursive=False)
+        return manifest
+
+    with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as zf:
+        for path, name in entries:
+            _check(cancelled)
+            kind, size = manifest[name] = _manifest_entry(path)
+            if kind == "l":
+                # Stored the way Info-ZIP does: mode S_IFLNK, data = link target
+                info = zipfile.ZipInfo(name)
+                info.create_system = 3
+                info.external_attr = (stat.S_IFLNK | 0o777) << 16
+                zf.writestr(info, os.readlink(path))
+            else:
+                zf.write(path, arcname=name)
+    return manifest
+
+
+def _zip_kind(info: zipfile.ZipInfo) -> str:
+    mode = info.external_attr >> 16
+    if info.create_system == 3 and stat.S_ISLNK(mode):
+        return "l"
+    return "d" if info.is_dir() else "f"
+
+
+def _drain(stream) -> int:
+    size = 0
+    while True:
+        chunk = stream.read(ARCHIVE_CHUNK)
+        if not chunk:
+            return size
+        size += len(chunk)
+
+
+def verify_archive(archive_path: str, manifest: Dict[str, Tuple[str, int]], fmt: str = ARCHIVE_FORMAT,
+                   cancelled: Optional[Callable[[], bool]] = None):
+    """Read the whole archive back and compare it with the manifest
+
+    File data is decompressed in chunks (which also checks the CRCs); raises
+    ArchiveError on any difference.
+    """
+    found: Dict[str, Tuple[str, int]] = {}
+    try:
+        if ARCHIVE_FORMATS[fmt][1] is not None:
+            with tarfile.open(archive_path, "r:*") as tar:
+                for member in tar:
+                    _check(cancelled)
+                    if member.issym():
+                        found[member.name] = ("l", 0)
+                    elif member.isdir():
+                        found[member.name] = ("d", 0)
+                    else:
+                        found[member.name] = ("f", _drain(tar.extractfile(member)))
+        else:
+            with zipfile.ZipFile(archive_path) as zf:
+                for info in zf.infolist():
+                    _check(cancelled)
+                    name = info.filename.rstrip("/")
+                    kind = _zip_kind(info)
+                    if kind == "f":
+                        with zf.open(info) as stream:
+                            found[name] = ("f", _drain(stream))
+                    else:
+                        found[name] = (kind, 0)
+    except (OSError, EOFError, tarfile.TarError, zipfile.BadZipFile) as e:
+        raise ArchiveError(f"Archive '{archive_path}' is unreadable: {e}")
+
+    if found != manifest:
+        differing = sorted(set(found.items()) ^ set(manifest.items()))
+        raise ArchiveError(f"Archive '{archive_path}' does not match the folders ({differing[0][0]} ...)")
+
+
+def _safe_target(root: str, relative: str) -> str:
+    """Destination of an archive member; refuses names escaping root"""
+    target = os.path.normpath(os.path.join(root, relative))
+    if os.path.isabs(relative) or os.path.commonpath([root, target]) != os.path.normpath(root):
+        raise ArchiveError(f"Refusing to extract '{relative}' outside '{root}'")
+    return target
+
+
+def extract_archive(archive_path: str, destinations: Dict[str, str], fmt: Optional[str] = None,
+                    cancelled: Optional[Callable[[], bool]] = None):
+    """Unpack an archive; destinations maps archive prefixes to folders"""
+    if fmt is None:
+        fmt = "zip" if archive_path.endswith(".zip") else "tar.gz"
+
+    def destination(name: str) -> str:
+        prefix, _, rest = name.partition("/")
+        if prefix not in destinations:
+            raise ArchiveError(f"Unexpected entry '{name}' in archive")
+        return _safe_target(destinations[prefix], rest)
+
+    if fmt != "zip":
+        with tarfile.open(archive_path, "r:*") as tar:
+            for member in tar:
+                _check(cancelled)
+                target = destination(member.name)
+                if member.isdir():
+                    os.makedirs(target, exist_ok=True)
+                elif member.issym():
+                    os.symlink(member.linkname, target)
+                elif member.isfile():
+                    with tar.extractfile(member) as src, open(target, "wb") as dst:
+                        shutil.copyfileobj(src, dst, ARCHIVE_CHUNK)
+                    os.utime(target, (member.mtime, member.mtime))
+        return
+
+    with zipfile.ZipFile(archive_path) as zf:
+        for info in zf.infolist():
+            _check(cancelled)
+            target = destination(info.filename.rstrip("/"))
+            kind = _zip_kind(info)
+            if kind == "d":
+                os.makedirs(target, exist_ok=True)
+            elif kind == "l":
+                os.symlink(zf.read(info).decode("utf-8"), target)
+            else:
+                with zf.open(info) as src, open(target, "wb") as dst:
+                    shutil.copyfileobj(src, dst, ARCHIVE_CHUNK)
+
+
+class ProjectArchiver:
+    """Archives and restores project folders, many projects in parallel"""
+
+    def __init__(self, project_manager, structure_manager, fmt: str = ARCHIVE_FORMAT,
+                 max_workers: Optional[int] = None):
+        if fmt not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unknown archive format '{fmt}'")
+        self.project_manager = project_manager
+        self.structure_manager = structure_manager
+        self.fmt = fmt
+        self.max_workers = max_workers
+
+    def archivable(self) -> List:
+        """Inactive, ended projects whose folders are still on disk"""
+        return [project for project in self.project_manager.load_projects() if is_archivable(project)]
+
+    def _roots(self, name: str) -> Dict[str, str]:
+        """Archive prefix -> folder of one project"""
+        parent_dir = self.structure_manager.get_parent_directory()
+        sync_dir = self.structure_manager.get_sync_directory()
+        roots = {PARENT_PREFIX: os.path.join(parent_dir, name)}
+        if os.path.normcase(sync_dir) != os.path.normcase(parent_dir):
+            roots[SYNC_PREFIX] = os.path.join(sync_dir, name)
+        return roots
+
+    def _archive_path(self, name: str) -> str:
+        """A free archive file name for a project
+
+        An existing archive is never overwritten: it may be left by a run that
+        was interrupted before record(), or belong to an earlier project of
+        the same name.
+        """
+        archive_dir = self.structure_manager.get_archive_directory()
+        os.makedirs(archive_dir, exist_ok=True)
+        extension, _ = ARCHIVE_FORMATS[self.fmt]
+        archive_path = os.path.join(archive_dir, name + extension)
+        number = 2
+        while os.path.exists(archive_path):
+            archive_path = os.path.join(archive_dir, f"{name} ({number}){extension}")
+            number += 1
+        return archive_path
+
+    def archive_one(self, project, cancelled: Optional[Callable[[], bool]] = None) -> str:
+        """Write and verify one project's archive; returns the archive path
+
+        The folders are left in place until clean_up().
+        """
+        if not is_archivable(project):
+            raise ArchiveError("only inactive projects with an end date can be archived")
+        roots = {prefix: path for prefix, path in self._roots(project.name).items() if os.path.lexists(path)}
+        if PARENT_PREFIX not in roots:
+            raise ArchiveError(f"project folder '{self._roots(project.name)[PARENT_PREFIX]}' not found")
+
+        archive_path = self._archive_path(project.name)
+        partial = archive_path + ".partial"
+        try:
+            manifest = write_archive(
+                partial, [(path, f"{prefix}/{project.name}") for prefix, path in roots.items()], self.fmt, cancelled
+            )
+            verify_archive(partial, manifest, self.fmt, cancelled)
+            os.replace(partial, archive_path)
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+        return archive_path
+
+    def remove_originals(self, project, cancelled: Optional[Callable[[], bool]] = None):
+        """Delete the folders of a project whose archive is on record"""
+        errors = []
+        for path in self._roots(project.name).values():
+            if not os.path.lexists(path):
+                continue
+            try:
+                _remove_path(path)
+            except OSError as e:
+                errors.append(f"'{path}' ({e})")
+        if errors:
+            raise ArchiveError(f"archived, but could not remove {', '.join(errors)}; delete it by hand")
+
+    def restore_one(self, project, cancelled: Optional[Callable[[], bool]] = None) -> str:
+        """Unpack one project's archive; returns the archive path
+
+        The archive is kept until clean_up().
+        """
+        archive_path = project.archive_path
+        if not archive_path or not os.path.exists(archive_path):
+            raise ArchiveError(f"archive '{archive_path}' not found")
+        roots = self._roots(project.name)
+        for path in roots.values():
+            if os.path.lexists(path):
+                raise ArchiveError(f"'{path}' already exists")
+
+        # Unpack next to the destination, then move into place
+        destinations = {prefix: os.path.dirname(path) for prefix, path in roots.items()}
+        if SYNC_PREFIX not in destinations:
+            # The archive was made with a separate sync folder; merge it back
+            destinations[SYNC_PREFIX] = destinations[PARENT_PREFIX]
+        try:
+            extract_archive(archive_path, destinations, "zip" if archive_path.endswith(".zip") else None, cancelled)
+        except Exception:
+            for path in roots.values():
+                shutil.rmtree(path, ignore_errors=True)
+            raise
+        return archive_path
+
+    def _run(self, projects: List, action: Callable, progress=None, cancelled=None) -> ArchiveResult:
+        result = ArchiveResult()
+        lock = threading.Lock()
+        total = len(projects)
+
+        def run(project):
+            try:
+                _check(cancelled)
+                path = action(project, cancelled)
+            except MaterializeCancelled:
+                # Projects already done stay done (their folders are gone),
+                # so the result is returned for record() instead of raising
+                result.cancelled = True
+                return
+            except Exception as e:
+                with lock:
+                    result.failed.append((project.name, str(e)))
+            else:
+                with lock:
+                    result.done.append((project, path))
+            if progress is not None:
+                with lock:
+                    count = len(result.done) + len(result.failed)
+                progress(count, total)
+
+        max_workers = self.max_workers or self.structure_manager.get_max_workers()
+        if max_workers <= 1 or total <= 1:
+            for project in projects:
+                run(project)
+            return result
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="archive") as pool:
+            for future in [pool.submit(run, project) for project in projects]:
+                future.result()
+        return result
+
+    def archive(self, projects: List, progress=None, cancelled=None) -> ArchiveResult:
+        """Write the archives of several projects in parallel (no registry changes)
+
+        ``progress(done, total)`` is called per project. When ``cancelled()``
+        returns True no further projects are started and the result has
+        ``cancelled`` set; pass it to record() and then clean_up() either way.
+        """
+        return self._run(projects, self.archive_one, progress, cancelled)
+
+    def restore(self, projects: List, progress=None, cancelled=None) -> ArchiveResult:
+        """Restore several projects from their archives in parallel (no registry changes)"""
+        return self._run(projects, self.restore_one, progress, cancelled)
+
+    def record(self, result: ArchiveResult, archived: bool = True):
+        """Store (or, after a restore, clear) the archive paths in one save"""
+        updated = []
+        for project, path in result.done:
+            current = self.project_manager.get_project(project.id)
+            if current is None:
+                continue
+            # A copy, so the cached record only changes once the save succeeds
+            updated.append(Project(
+                id=current.id, name=current.name, description=current.description, status=current.status,
+                start_date=current.start_date, end_date=current.end_date, group_id=current.group_id,
+                archive_path=path if archived else ""
+            ))
+        if updated:
+            self.project_manager.update_projects(updated)
+
+    def clean_up(self, result: ArchiveResult, archived: bool = True, progress=None,
+                 cancelled=None) -> ArchiveResult:
+        """After record(): delete the archived folders, or the restored archives
+
+        Returns a result of its own; its failures are the leftovers.
+        """
+        paths = {project.id: path for project, path in result.done}
+
+        def remove(project, cancelled):
+            if archived:
+                self.remove_originals(project, cancelled)
+            elif os.path.exists(paths[project.id]):
+                os.remove(paths[project.id])
+            return paths[project.id]
+
+        return self._run([project for project, _ in result.done], remove, progress, cancelled)
@@ -0,0 +1,242 @@
+"""
+Bulk project creation from CSV or JSON files
+
+The import runs as a batched pipeline: the structure template and target
+directories are resolved once, every row is validated in a single pass
+against the project name index and one listing of the parent directory,
+project folders are created in parallel, and all new projects are committed
+with a single save.
+
+Headless usage:
+    python -m src.bulk_import projects.csv [--dry-run] [--no-folders]
+"""
+import os
+import sys
+import csv
+import json
+import datetime
+import threading
+from typing import Dict, List, Optional, Tuple
+from .config import STATUS_OPTIONS, STATUS_ACTIVE
+from .models import Project, ProjectManager, StructureManager, folder_name_error
+from .links import LinkMaker
+from .materializer import execute_plan, MaterializeCancelled
+
+# Columns understood in CSV headers / JSON objects
+IMPORT_FIELDS = ["name", "description", "status", "group", "start_date", "end_date"]
+
+class BulkImportResult:
+    """Outcome of a bulk import"""
+
+    def __init__(self):
+        self.created: List[Project] = []
+        self.ready: List[Project] = []  # folders created, not registered yet (see prepare)
+        self.skipped: List[Tuple[str, str]] = []  # (name, reason)
+        self.link_failures: List[Tuple[str, str, str]] = []  # (link path, target path, error)
+
+    def summary(self) -> str:
+        lines = [f"Created {len(self.created)} project(s), skipped {len(self.skipped)}."]
+        for name, reason in self.skipped:
+            lines.append(f"  {name or '<no name>'}: {reason}")
+        if self.link_failures:
+            lines.append(f"{len(self.link_failures)} shortcut(s) were written as text stubs:")
+            for link_path, target_path, error in self.link_failures:
+                lines.append(f"  {link_path} -> {target_path}: {error}")
+        return "\n".join(lines)
+
+
+class BulkImporter:
+    """Creates many projects from a list of rows in one batch"""
+
+    def __init__(self, project_manager: ProjectManager, structure_manager: StructureManager):
+        self.project_manager = project_manager
+        self.structure_manager = structure_manager
+
+    @staticmethod
+    def read_file(path: str) -> List[Dict]:
+        """Read import rows from a .csv or .json file"""
+        if path.lower().endswith(".json"):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if not isinstance(data, list):
+                raise ValueError("JSON import file must contain a list of projects")
+            return [row if isinstance(row, dict) else {"name": str(row)} for row in data]
+
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            return [
+                {(key or "").strip().lower(): (value or "").strip() for key, value in row.items()}
+                for row in csv.DictReader(f)
+            ]
+
+    def _resolve_group(self, value, groups_by_name: Dict[str, int], group_ids: set) -> Optional[int]:
+        """Map a group name or id to a group id (0 for none, None if unknown)"""
+        if value in (None, "", 0, "0", "None"):
+            return 0
+        if isinstance(value, int) or str(value).isdigit():
+            group_id = int(value)
+            return group_id if group_id in group_ids else None
+        return groups_by_name.get(str(value))
+
+    def validate(self, rows: List[Dict]) -> Tuple[List[Project], List[Tuple[str, str]]]:
+        """Validate all rows in one pass
+
+        Returns the projects that can be created (ids not yet assigned) and
+        the rejected rows as (name, reason) pairs.
+        """
+        groups = self.project_manager.load_groups()
+        groups_by_name = {group.name: group.id for group in groups}
+        group_ids = {group.id for group in groups}
+
+        parent_dir = self.structure_manager.get_parent_directory()
+        try:
+            existing_folders = {os.path.normcase(entry) for entry in os.listdir(parent_dir)}
+        except OSError:
+            existing_folders = set()
+
+        valid: List[Project] = []
+        rejected: List[Tuple[str, str]] = []
+        seen = set()
+
+        for row in rows:
+            name = str(row.get("name", "")).strip()
+            if not name:
+                rejected.append((name, "Project name cannot be empty"))
+                continue
+            name_error = folder_name_error(name)
+            if name_error:
+                rejected.append((name, name_error))
+                continue
+            if name in seen:
+                rejected.append((name, "Duplicate name in import file"))
+                continue
+            seen.add(name)
+            if self.project_manager.get_project_by_name(name) is not None:
+                rejected.append((name, "Project already exists"))
+                continue
+            if os.path.normcase(name) in existing_folders:
+                rejected.append((name, "Project folder already exists"))
+                continue
+
+            status = str(row.get("status") or STATUS_ACTIVE).strip()
+            if status not in STATUS_OPTIONS:
+                rejected.append((name, f"Unknown status '{status}'"))
+                continue
+
+            group_value = row.get("group", row.get("group_id"))
+            group_id = self._resolve_group(group_value, groups_by_name, group_ids)
+            if group_id is None:
+                rejected.append((name, f"Unknown group '{group_value}'"))
+                continue
+
+            dates = {}
+            for field in ("start_date", "end_date"):
+                value = str(row.get(field) or "").strip()
+                if value:
+                    try:
+                        datetime.date.fromisoformat(value)
+                    except ValueError:
+                        rejected.append((name, f"{field} must be in YYYY-MM-DD format"))
+                        break
+                dates[field] = value
+            else:
+                valid.append(Project(
+                    id=0,  # Assigned on commit
+                    name=name,
+                    description=str(row.get("description") or "").strip(),
+                    status=status,
+                    start_date=dates["start_date"],
+                    end_date=dates["end_date"],
+                    group_id=group_id
+                ))
+
+        return valid, rejected
+
+    def _materialize(self, projects: List[Project], create_link: LinkMaker, progress=None,
+                     cancelled=None) -> List[Tuple[Project, Optional[Exception]]]:
+        """Create the folders of all projects in parallel
+
+        ``progress(done, total)`` is called per project; once ``cancelled()``
+        returns True the remaining projects get MaterializeCancelled instead
+        of folders.
+        """
+        compiled = self.structure_manager.get_compiled()
+        parent_dir = self.structure_manager.get_parent_directory()
+        sync_dir = self.structure_manager.get_sync_directory()
+        max_workers = self.structure_manager.get_max_workers()
+
+        lock = threading.Lock()
+        finished = [0]
+
+        def materialize(project: Project) -> Optional[Exception]:
+            if cancelled is not None and cancelled():
+                return MaterializeCancelled()
+            project_path = os.path.join(parent_dir, project.name)
+            sync_project_path = os.path.join(sync_dir, project.name) if sync_dir else None
+            try:
+                execute_plan(compiled.build_plan(project_path, sync_project_path), create_link)
+            except Exception as e:
+                return e
+            finally:
+                if progress is not None:
+                    with lock:
+                        finished[0] += 1
+                        count = finished[0]
+                    progress(count, len(projects))
+            return None
+
+        if max_workers <= 1 or len(projects) <= 1:
+            return [(project, materialize(project)) for project in projects]
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bulk-import") as pool:
+            return list(zip(projects, pool.map(materialize, projects)))
+
+    def prepare(self, projects: List[Project], create_folders: bool = True, progress=None,
+                cancelled=None) -> BulkImportResult:
+        """Create the folders of validated projects (safe on a worker thread)
+
+        Projects whose folders exist afterwards are in ``result.ready``; pass
+        the result to commit() on the thread that owns the registry. When
+        ``cancelled()`` returns True the projects not started yet are
+        skipped, and those already created are still ready to commit.
+        """
+        result = BulkImportResult()
+        if not create_folders:
+            result.ready = list(projects)
+            return result
+
+        links = self.structure_manager.link_maker()
+        for project, error in self._materialize(projects, links, progress, cancelled):
+            if error is None:
+                result.ready.append(project)
+            elif isinstance(error, MaterializeCancelled):
+                result.skipped.append((project.name, "Cancelled"))
+            else:
+                result.skipped.append((project.name, f"Failed to create folders: {error}"))
+        result.link_failures = links.failures
+        return result
+
+    def commit(self, result: BulkImportResult) -> BulkImportResult:
+        """Register the prepared projects with a single save"""
+        if result.ready:
+            result.created = self.project_manager.add_projects(result.ready)
+        return result
+
+    def run(self, rows: List[Dict], create_folders: bool = True) -> BulkImportResult:
+        """Validate, materialize and commit all rows"""
+        projects, rejected = self.validate(rows)
+        result = self.prepare(projects, create_folders)
+        result.skipped[:0] = rejected
+        return self.commit(result)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Headless bulk import entry point (same as ``python -m src import``)"""
+    from .cli import main as cli_main
+
+    return cli_main(["import"] + list(sys.argv[1:] if argv is None else argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
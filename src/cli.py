@@ -0,0 +1,444 @@
+"""
+Headless command line interface
+
+Runs without a display server: only the model and config modules are
+imported (never tkinter or the UI modules), so it is cheap enough to call
+from cron jobs and CI agents.
+
+Usage:
+    python -m src list [--status active] [--group NAME] [--json]
+    python -m src count [--status active] [--group NAME]
+    python -m src show ID
+    python -m src create NAME [--description TEXT] [--group NAME] [--no-folders]
+    python -m src update ID [--name NAME] [--status inactive] ...
+    python -m src delete ID
+    python -m src group list|create|update|delete ...
+    python -m src structure show|set-parent PATH|set-sync PATH
+    python -m src import FILE [--dry-run] [--no-folders]
+    python -m src reconcile [--full] [--json]
+    python -m src repair [--group NAME] [--apply] [--json]
+    python -m src archive [--group NAME] [--format zip] [--dry-run]
+    python -m src restore ID [ID ...]
+"""
+import os
+import sys
+import json
+import argparse
+import datetime
+from typing import List, Optional
+from .config import APP_TITLE, STATUS_OPTIONS, STATUS_ACTIVE, STATUS_INACTIVE, STORAGE_BACKEND, ARCHIVE_FORMAT
+from .models import Project, ProjectManager, StructureManager, folder_name_error
+
+
+class CommandError(Exception):
+    """Raised for user errors that should be reported without a traceback"""
+
+
+def _validate_date(value: Optional[str], field: str) -> Optional[str]:
+    if value:
+        try:
+            datetime.date.fromisoformat(value)
+        except ValueError:
+            raise CommandError(f"{field} must be in YYYY-MM-DD format")
+    return value
+
+
+def _resolve_group_id(project_manager: ProjectManager, value: Optional[str]) -> int:
+    """Map a group name or id given on the command line to a group id"""
+    if value in (None, "", "0", "None"):
+        return 0
+    if value.isdigit():
+        if project_manager.get_group_by_id(int(value)) is None:
+            raise CommandError(f"Group with ID {value} not found")
+        return int(value)
+    for group in project_manager.load_groups():
+        if group.name == value:
+            return group.id
+    raise CommandError(f"Group '{value}' not found")
+
+
+def _print_table(rows: List[List], headers: List[str]):
+    widths = [len(h) for h in headers]
+    for row in rows:
+        for i, value in enumerate(row):
+            widths[i] = max(widths[i], len(str(value)))
+    print("  ".join(h.ljust(widths[i]) for i, h in enumerate(headers)).rstrip())
+    print("  ".join("-" * w for w in widths))
+    for row in rows:
+        print("  ".join(str(value).ljust(widths[i]) for i, value in enumerate(row)).rstrip())
+
+
+# ----- project commands -----
+
+def cmd_list(args, pm: ProjectManager, sm: StructureManager):
+    group_id = _resolve_group_id(pm, args.group) if args.group is not None else None
+    # Streamed: only the matching projects are kept in memory
+    projects = sorted(pm.scan_projects(group_id, args.status or None), key=lambda p: p.id, reverse=True)
+
+    if args.json:
+        print(json.dumps([p.to_dict() for p in projects], indent=2, ensure_ascii=False))
+        return
+    group_names = {group.id: group.name for group in pm.load_groups()}
+    _print_table(
+        [[p.id, p.name, group_names.get(p.group_id, "None"), p.status, p.start_date, p.end_date or ""]
+         for p in projects],
+        ["ID", "Name", "Group", "Status", "Start Date", "End Date"]
+    )
+
+
+def cmd_count(args, pm: ProjectManager, sm: StructureManager):
+    group_id = _resolve_group_id(pm, args.group) if args.group is not None else None
+    print(pm.count_projects(group_id, args.status or None))
+
+
+def cmd_show(args, pm: ProjectManager, sm: StructureManager):
+    project = pm.get_project(args.id)
+    if project is None:
+        raise CommandError(f"Project with ID {args.id} not found")
+    print(json.dumps(project.to_dict(), indent=2, ensure_ascii=False))
+
+
+def cmd_create(args, pm: ProjectManager, sm: StructureManager):
+    name = args.name.strip()
+    if not name:
+        raise CommandError("Project name cannot be empty")
+    name_error = folder_name_error(name)
+    if name_error:
+        raise CommandError(name_error)
+    group_id = _resolve_group_id(pm, args.group)
+
+    if not args.no_folders:
+        parent_dir = sm.get_parent_directory()
+        sync_dir = sm.get_sync_directory()
+        project_path = os.path.join(parent_dir, name)
+        sync_project_path = os.path.join(sync_dir, name) if sync_dir else None
+        if os.path.exists(project_path):
+            raise CommandError(f"Project '{name}' already exists.")
+        if pm.get_project_by_name(name) is not None:
+            raise CommandError(f"Project '{name}' already exists")
+        links = sm.create_project_folders(project_path, sync_path=sync_project_path)
+        if links.failures:
+            print(links.summary(), file=sys.stderr)
+
+    project = pm.add_project(name, args.description, args.status, group_id)
+    print(f"Project '{project.name}' created with ID {project.id}")
+
+
+def cmd_update(args, pm: ProjectManager, sm: StructureManager):
+    project = pm.get_project(args.id)
+    if project is None:
+        raise CommandError(f"Project with ID {args.id} not found")
+
+    status = args.status or project.status
+    end_date = project.end_date if args.end_date is None else args.end_date
+    # Same rules as the edit dialog: inactive projects get an end date,
+    # active projects have none
+    if status == STATUS_INACTIVE and not end_date:
+        end_date = datetime.date.today().isoformat()
+    elif status == STATUS_ACTIVE:
+        end_date = ""
+
+    updated = Project(
+        id=project.id,
+        name=project.name if args.name is None else args.name.strip(),
+        description=project.description if args.description is None else args.description,
+        status=status,
+        start_date=_validate_date(args.start_date, "Start Date") or project.start_date,
+        end_date=_validate_date(end_date, "End Date"),
+        group_id=project.group_id if args.group is None else _resolve_group_id(pm, args.group),
+        archive_path=project.archive_path
+    )
+    if not updated.name:
+        raise CommandError("Project name cannot be empty")
+    if updated.name != project.name:
+        name_error = folder_name_error(updated.name)
+        if name_error:
+            raise CommandError(name_error)
+    pm.update_project(updated)
+    print(f"Project {updated.id} updated")
+
+
+def cmd_delete(args, pm: ProjectManager, sm: StructureManager):
+    if pm.get_project(args.id) is None:
+        raise CommandError(f"Project with ID {args.id} not found")
+    pm.delete_project(args.id)
+    print(f"Project {args.id} deleted")
+
+
+# ----- group commands -----
+
+def cmd_group_list(args, pm: ProjectManager, sm: StructureManager):
+    groups = sorted(pm.load_groups(), key=lambda g: g.id, reverse=True)
+    if args.json:
+        print(json.dumps([g.to_dict() for g in groups], indent=2, ensure_ascii=False))
+        return
+    counts = pm.get_group_counts()
+    _print_table([[g.id, g.name, g.description, g.status,
+                   sum(counts.get(g.id, {}).values()), counts.get(g.id, {}).get(STATUS_ACTIVE, 0)]
+                  for g in groups],
+                 ["ID", "Name", "Description", "Status", "Projects", "Active"])
+
+
+def cmd_group_create(args, pm: ProjectManager, sm: StructureManager):
+    if not args.name.strip():
+        raise CommandError("Group name cannot be empty")
+    group = pm.add_group(args.name.strip(), args.description, args.status)
+    print(f"Group '{group.name}' created with ID {group.id}")
+
+
+def cmd_group_update(args, pm: ProjectManager, sm: StructureManager):
+    group = pm.get_group_by_id(args.id)
+    if group is None:
+        raise CommandError(f"Group with ID {args.id} not found")
+    pm.update_group(
+        group.id,
+        group.name if args.name is None else args.name.strip(),
+        group.description if args.description is None else args.description,
+        args.status or group.status
+    )
+    print(f"Group {group.id} updated")
+
+
+def cmd_group_delete(args, pm: ProjectManager, sm: StructureManager):
+    if pm.get_group_by_id(args.id) is None:
+        raise CommandError(f"Group with ID {args.id} not found")
+    pm.delete_group(args.id)
+    print(f"Group {args.id} deleted")
+
+
+# ----- structure commands -----
+
+def cmd_structure_show(args, pm: ProjectManager, sm: StructureManager):
+    print(json.dumps(sm.get_cached_structure(), indent=4, ensure_ascii=False))
+
+
+def cmd_structure_set_parent(args, pm: ProjectManager, sm: StructureManager):
+    sm.set_parent_directory(args.path)
+    print(f"Parent directory set to {sm.get_parent_directory()}")
+
+
+def cmd_structure_set_sync(args, pm: ProjectManager, sm: StructureManager):
+    sm.set_sync_directory(args.path)
+    print(f"Sync directory set to {sm.get_sync_directory()}")
+
+
+# ----- bulk import -----
+
+def cmd_import(args, pm: ProjectManager, sm: StructureManager):
+    from .bulk_import import BulkImporter
+
+    importer = BulkImporter(pm, sm)
+    try:
+        rows = importer.read_file(args.file)
+    except (OSError, ValueError) as e:
+        raise CommandError(str(e))
+    if args.dry_run:
+        valid, rejected = importer.validate(rows)
+        print(f"{len(valid)} project(s) can be created, {len(rejected)} rejected.")
+        for name, reason in rejected:
+            print(f"  {name or '<no name>'}: {reason}")
+        return 0 if not rejected else 2
+    result = importer.run(rows, create_folders=not args.no_folders)
+    print(result.summary())
+    return 0 if not result.skipped else 2
+
+
+# ----- reconciliation -----
+
+def cmd_reconcile(args, pm: ProjectManager, sm: StructureManager):
+    from .reconcile import ReconcileScanner
+
+    report = ReconcileScanner(pm, sm, max_workers=args.workers).scan(incremental=not args.full)
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2, ensure_ascii=False))
+    else:
+        print(report.summary())
+    return 0 if report.clean else 2
+
+
+def cmd_repair(args, pm: ProjectManager, sm: StructureManager):
+    from .reconcile import ReconcileScanner
+
+    group_id = _resolve_group_id(pm, args.group) if args.group is not None else None
+    scanner = ReconcileScanner(pm, sm, max_workers=args.workers)
+    repair = scanner.plan_repair(group_id)
+    if args.json:
+        print(json.dumps(repair.to_dict(), indent=2, ensure_ascii=False))
+    else:
+        print(repair.summary())
+    if args.apply and len(repair):
+        links = scanner.repair(repair)
+        if links.failures:
+            print(links.summary(), file=sys.stderr)
+        if not args.json:
+            print(f"Created {len(repair)} item(s).")
+    return 0
+
+
+# ----- archival -----
+
+def cmd_archive(args, pm: ProjectManager, sm: StructureManager):
+    from .archive import ProjectArchiver
+
+    archiver = ProjectArchiver(pm, sm, fmt=args.format, max_workers=args.workers)
+    projects = archiver.archivable()
+    if args.group is not None:
+        group_id = _resolve_group_id(pm, args.group)
+        projects = [project for project in projects if project.group_id == group_id]
+    if args.dry_run or not projects:
+        for project in projects:
+            print(f"{project.id}  {project.name}  (ended {project.end_date})")
+        print(f"{len(projects)} project(s) to archive to {sm.get_archive_directory()}")
+        return 0
+    result = archiver.archive(projects)
+    archiver.record(result)
+    cleanup = archiver.clean_up(result)
+    print(result.summary())
+    if cleanup.failed:
+        print(cleanup.summary())
+    return 0 if not (result.failed or cleanup.failed) else 2
+
+
+def cmd_restore(args, pm: ProjectManager, sm: StructureManager):
+    from .archive import ProjectArchiver
+
+    projects = []
+    for project_id in args.ids:
+        project = pm.get_project(project_id)
+        if project is None:
+            raise CommandError(f"Project with ID {project_id} not found")
+        if not project.archive_path:
+            raise CommandError(f"Project '{project.name}' is not archived")
+        projects.append(project)
+    archiver = ProjectArchiver(pm, sm, max_workers=args.workers)
+    result = archiver.restore(projects)
+    archiver.record(result, archived=False)
+    cleanup = archiver.clean_up(result, archived=False)
+    print(result.summary())
+    if cleanup.failed:
+        print(cleanup.summary())
+    return 0 if not (result.failed or cleanup.failed) else 2
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src", description=f"{APP_TITLE} (headless)")
+    parser.add_argument("--backend", default=STORAGE_BACKEND, choices=["json", "journal", "sqlite"],
+                        help="storage backend for projects and groups")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.required = True
+
+    p = commands.add_parser("list", help="list projects")
+    p.add_argument("--status", choices=STATUS_OPTIONS)
+    p.add_argument("--group", help="group name or id (0 for no group)")
+    p.add_argument("--json", action="store_true", help="print raw JSON")
+    p.set_defaults(func=cmd_list)
+
+    p = commands.add_parser("count", help="count projects")
+    p.add_argument("--status", choices=STATUS_OPTIONS)
+    p.add_argument("--group", help="group name or id (0 for no group)")
+    p.set_defaults(func=cmd_count)
+
+    p = commands.add_parser("show", help="print one project as JSON")
+    p.add_argument("id", type=int)
+    p.set_defaults(func=cmd_show)
+
+    p = commands.add_parser("create", help="create a project and its folders")
+    p.add_argument("name")
+    p.add_argument("--description", default="")
+    p.add_argument("--status", default=STATUS_ACTIVE, choices=STATUS_OPTIONS)
+    p.add_argument("--group", help="group name or id")
+    p.add_argument("--no-folders", action="store_true", help="only register the project")
+    p.set_defaults(func=cmd_create, needs_structure=True)
+
+    p = commands.add_parser("update", help="update a project")
+    p.add_argument("id", type=int)
+    p.add_argument("--name")
+    p.add_argument("--description")
+    p.add_argument("--status", choices=STATUS_OPTIONS)
+    p.add_argument("--group", help="group name or id (0 for no group)")
+    p.add_argument("--start-date")
+    p.add_argument("--end-date")
+    p.set_defaults(func=cmd_update)
+
+    p = commands.add_parser("delete", help="remove a project from the list")
+    p.add_argument("id", type=int)
+    p.set_defaults(func=cmd_delete)
+
+    group = commands.add_parser("group", help="manage project groups")
+    group_commands = group.add_subparsers(dest="group_command", metavar="action")
+    group_commands.required = True
+    p = group_commands.add_parser("list", help="list groups")
+    p.add_argument("--json", action="store_true", help="print raw JSON")
+    p.set_defaults(func=cmd_group_list)
+    p = group_commands.add_parser("create", help="create a group")
+    p.add_argument("name")
+    p.add_argument("--description", default="")
+    p.add_argument("--status", default=STATUS_ACTIVE, choices=STATUS_OPTIONS)
+    p.set_defaults(func=cmd_group_create)
+    p = group_commands.add_parser("update", help="update a group")
+    p.add_argument("id", type=int)
+    p.add_argument("--name")
+    p.add_argument("--description")
+    p.add_argument("--status", choices=STATUS_OPTIONS)
+    p.set_defaults(func=cmd_group_update)
+    p = group_commands.add_parser("delete", help="delete a group")
+    p.add_argument("id", type=int)
+    p.set_defaults(func=cmd_group_delete)
+
+    structure = commands.add_parser("structure", help="show or configure the folder structure")
+    structure_commands = structure.add_subparsers(dest="structure_command", metavar="action")
+    structure_commands.required = True
+    p = structure_commands.add_parser("show", help="print the structure template")
+    p.set_defaults(func=cmd_structure_show, needs_structure=True)
+    p = structure_commands.add_parser("set-parent", help="set the parent directory")
+    p.add_argument("path")
+    p.set_defaults(func=cmd_structure_set_parent, needs_structure=True)
+    p = structure_commands.add_parser("set-sync", help="set the sync directory")
+    p.add_argument("path")
+    p.set_defaults(func=cmd_structure_set_sync, needs_structure=True)
+
+    p = commands.add_parser("import", help="create projects in bulk from a CSV or JSON file")
+    p.add_argument("file")
+    p.add_argument("--dry-run", action="store_true", help="only validate the file")
+    p.add_argument("--no-folders", action="store_true", help="register projects without creating folders")
+    p.set_defaults(func=cmd_import, needs_structure=True)
+
+    p = commands.add_parser("reconcile", help="report drift between the project list and the folders on disk")
+    p.add_argument("--full", action="store_true", help="ignore cached directory listings")
+    p.add_argument("--workers", type=int, help="parallel project checks (default: max_workers)")
+    p.add_argument("--json", action="store_true", help="print the report as JSON")
+    p.set_defaults(func=cmd_reconcile, needs_structure=True)
+
+    p = commands.add_parser("repair", help="re-apply the folder template to existing projects")
+    p.add_argument("--group", help="only projects of this group (name or id, 0 for no group)")
+    p.add_argument("--apply", action="store_true", help="create the missing items (default: dry run)")
+    p.add_argument("--workers", type=int, help="parallel workers (default: max_workers)")
+    p.add_argument("--json", action="store_true", help="print the plan as JSON")
+    p.set_defaults(func=cmd_repair, needs_structure=True)
+
+    p = commands.add_parser("archive", help="pack the folders of inactive projects into archives")
+    p.add_argument("--group", help="only projects of this group (name or id, 0 for no group)")
+    p.add_argument("--format", default=ARCHIVE_FORMAT, choices=["tar.gz", "tar.xz", "zip"])
+    p.add_argument("--workers", type=int, help="parallel workers (default: max_workers)")
+    p.add_argument("--dry-run", action="store_true", help="only list the projects that would be archived")
+    p.set_defaults(func=cmd_archive, needs_structure=True)
+
+    p = commands.add_parser("restore", help="unpack archived projects back into their folders")
+    p.add_argument("ids", type=int, nargs="+", metavar="id")
+    p.add_argument("--workers", type=int, help="parallel workers (default: max_workers)")
+    p.set_defaults(func=cmd_restore, needs_structure=True)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entry point"""
+    args = build_parser().parse_args(argv)
+    try:
+        project_manager = ProjectManager(args.backend)
+        # The structure file is only required by commands that touch folders
+        structure_manager = StructureManager() if getattr(args, "needs_structure", False) else None
+        return args.func(args, project_manager, structure_manager) or 0
+    except (CommandError, ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
@@ -20,12 +20,71 @@ STRUCTURE_JSON = os.path.join(PROGRAM_ROOT, STRUCTURE_FILENAME)
 PROJECT_LISTS_FILE = os.path.join(PROGRAM_ROOT, "project_lists.json")
 PROJECT_GROUPS_FILE = os.path.join(PROGRAM_ROOT, "project_groups.json")
 
+# Storage backend for projects and groups: "json" rewrites the whole file on
+# every change, "journal" appends one line per change and compacts later,
+# "sqlite" keeps both lists in an indexed SQLite database
+STORAGE_JSON = "json"
+STORAGE_JOURNAL = "journal"
+STORAGE_SQLITE = "sqlite"
+STORAGE_BACKEND = os.environ.get("PFM_STORAGE_BACKEND", STORAGE_JSON)
+JOURNAL_COMPACT_THRESHOLD = 500
+PROJECT_DB_FILE = os.path.join(PROGRAM_ROOT, "project_registry.db")
+
+# Directory listings cached between reconciliation scans (see reconcile.py)
+RECONCILE_CACHE_FILE = os.path.join(PROGRAM_ROOT, "reconcile_cache.json")
+
+# Per-directory size totals cached between folder stats refreshes (see folder_stats.py)
+FOLDER_STATS_CACHE_FILE = os.path.join(PROGRAM_ROOT, "folder_stats_cache.json")
+
+# Durability of JSON writes: "always" fsyncs every write, "batch" fsyncs at
+# most every FSYNC_BATCH_MS milliseconds, "never" leaves it to the OS
+FSYNC_ALWAYS = "always"
+FSYNC_BATCH = "batch"
+FSYNC_NEVER = "never"
+FSYNC_POLICY = os.environ.get("PFM_FSYNC_POLICY", FSYNC_ALWAYS)
+FSYNC_BATCH_MS = int(os.environ.get("PFM_FSYNC_BATCH_MS", "200"))
+
+# Archives of inactive projects (see archive.py): format ("tar.gz", "tar.xz"
+# or "zip"), default folder name under the parent directory (overridden with
+# "archive_directory" in the structure template) and the read/write chunk size
+ARCHIVE_FORMAT = os.environ.get("PFM_ARCHIVE_FORMAT", "tar.gz")
+ARCHIVE_DIRNAME = "_archive"
+ARCHIVE_CHUNK = 1024 * 1024
+
+# Default number of worker threads used to create project folders; can be
+# overridden with "max_workers" in the structure template
+DEFAULT_MAX_WORKERS = 8
+
+# Background jobs (project creation from the GUI): number of jobs that run at
+# the same time and how often the UI polls them for progress
+JOB_WORKERS = 2
+JOB_POLL_MS = 100
+
+# Print a time-to-first-frame report to stderr (same as --profile-startup)
+PROFILE_STARTUP = os.environ.get("PFM_PROFILE_STARTUP", "") not in ("", "0")
+
+# Time manager, storage and panel calls for the debug window (same as
+# --instrument); the window refreshes every INSTRUMENT_REFRESH_MS
+INSTRUMENT = os.environ.get("PFM_INSTRUMENT", "") not in ("", "0")
+INSTRUMENT_REFRESH_MS = 500
+
 # UI Constants
 WINDOW_WIDTH = 1500
 WINDOW_HEIGHT = 700
 MIN_WIDTH = 900
 MIN_HEIGHT = 600
 
+# Minimum number of project rows inserted into the list per page while scrolling
+TREE_PAGE_SIZE = 100
+
+# Change batches larger than this rebuild a panel instead of applying row deltas
+DELTA_REFRESH_LIMIT = 200
+
+# Raw JSON tabs: lists longer than this are serialized on a worker thread and
+# streamed into the text widget JSON_STREAM_CHUNK characters at a time
+JSON_BACKGROUND_THRESHOLD = 2000
+JSON_STREAM_CHUNK = 64 * 1024
+
 # Project status constants
 STATUS_ACTIVE = "active"
 STATUS_INACTIVE = "inactive"
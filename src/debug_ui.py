@@ -0,0 +1,100 @@
+"""
+Instrumentation debug window
+"""
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from .profiling import Instrumentation
+from .config import INSTRUMENT_REFRESH_MS
+
+METRIC_COLUMNS = ("Method", "Calls", "Total ms", "Mean ms", "p50 ms", "p95 ms", "Max ms")
+
+
+class InstrumentationWindow:
+    """Live table of call counts and latencies recorded by the instrumentation
+    
+    Opened from the main window with Ctrl+Shift+D when instrumentation is on.
+    Rows are sorted by total time, so the busiest code path is on top.
+    """
+    
+    def __init__(self, parent: tk.Widget, instrumentation: Instrumentation):
+        self.parent = parent
+        self.instrumentation = instrumentation
+        self._after_id = None
+        self._create_window()
+        self._update()
+    
+    def _create_window(self):
+        self.window = tk.Toplevel(self.parent)
+        self.window.title("Instrumentation")
+        self.window.geometry("900x420")
+        
+        frame = tk.Frame(self.window)
+        frame.pack(fill=tk.BOTH, expand=True, padx=8, pady=(8, 4))
+        self.tree = ttk.Treeview(frame, columns=METRIC_COLUMNS, show="headings")
+        for column in METRIC_COLUMNS:
+            self.tree.heading(column, text=column)
+            self.tree.column(column, width=320 if column == "Method" else 85,
+                             anchor="w" if column == "Method" else "e")
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        btn_frame = tk.Frame(self.window)
+        tk.Button(btn_frame, text="Reset", command=self._on_reset).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame, text="Dump to File...", command=self._on_dump).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame, text="Close", command=self.window.destroy).pack(side=tk.LEFT, padx=5)
+        btn_frame.pack(pady=(4, 8))
+        
+        self.window.bind("<Destroy>", self._on_destroy)
+    
+    def _update(self):
+        """Redraw the table and schedule the next refresh"""
+        metrics = self.instrumentation.snapshot()
+        for iid in self.tree.get_children():
+            if iid not in metrics:
+                self.tree.delete(iid)
+        for index, (name, metric) in enumerate(metrics.items()):
+            values = (
+                name,
+                metric["count"],
+                f"{metric['total_ms']:.1f}",
+                f"{metric['mean_ms']:.3f}",
+                f"{metric['p50_ms']:g}",
+                f"{metric['p95_ms']:g}",
+                f"{metric['max_ms']:.1f}",
+            )
+            if self.tree.exists(name):
+                self.tree.item(name, values=values)
+                self.tree.move(name, "", index)
+            else:
+                self.tree.insert("", index, iid=name, values=values)
+        self._after_id = self.window.after(INSTRUMENT_REFRESH_MS, self._update)
+    
+    def _on_reset(self):
+        self.instrumentation.reset()
+        self.tree.delete(*self.tree.get_children())
+    
+    def _on_dump(self):
+        """Write the current metrics to a JSON file"""
+        path = filedialog.asksaveasfilename(
+            parent=self.window,
+            title="Dump Instrumentation",
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            self.instrumentation.dump(path)
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to write '{path}': {e}", parent=self.window)
+    
+    def _on_destroy(self, event):
+        if event.widget is self.window and self._after_id is not None:
+            self.window.after_cancel(self._after_id)
+            self._after_id = None
+    
+    def show(self):
+        self.window.lift()
+        self.window.focus_set()
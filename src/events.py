@@ -0,0 +1,72 @@
+"""
+Change notifications for the data managers
+
+After every mutation ProjectManager and StructureManager hand their listeners
+a batch of ChangeEvent objects describing which records were added, updated or
+removed, so views can patch just the affected rows instead of rebuilding.
+"""
+import sys
+import traceback
+from typing import Callable, List
+
+EVENT_ADDED = "added"
+EVENT_UPDATED = "updated"
+EVENT_REMOVED = "removed"
+# The whole collection was replaced or re-read; listeners should rebuild
+EVENT_RESET = "reset"
+
+ENTITY_PROJECT = "project"
+ENTITY_GROUP = "group"
+ENTITY_FOLDER = "folder"        # structure template folder, id = relative path
+ENTITY_FILE = "file"            # structure template file, id = file name
+ENTITY_STRUCTURE = "structure"  # template settings (parent/sync directory, ...)
+ENTITY_JOB = "job"              # background job (see jobs.py)
+
+
+class ChangeEvent:
+    """A single added/updated/removed record"""
+
+    __slots__ = ("kind", "entity", "record_id", "record")
+
+    def __init__(self, kind: str, entity: str, record_id=None, record=None):
+        self.kind = kind
+        self.entity = entity
+        self.record_id = record_id
+        # The new record (the removed one for EVENT_REMOVED); shared, do not modify
+        self.record = record
+
+    def __repr__(self):
+        return f"ChangeEvent({self.kind}, {self.entity}, {self.record_id!r})"
+
+
+Listener = Callable[[List[ChangeEvent]], None]
+
+
+class ChangeNotifier:
+    """Mixin that keeps a list of listeners and delivers event batches"""
+
+    def __init__(self):
+        self._listeners: List[Listener] = []
+
+    def subscribe(self, listener: Listener) -> Callable[[], None]:
+        """Register a listener; returns a function that unsubscribes it"""
+        self._listeners.append(listener)
+        return lambda: self.unsubscribe(listener)
+
+    def unsubscribe(self, listener: Listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _emit(self, events: List[ChangeEvent]):
+        """Deliver a batch of events on the calling thread"""
+        if not events:
+            return
+        for listener in list(self._listeners):
+            try:
+                listener(events)
+            except Exception:
+                # The change is already persisted; a broken view must not undo that
+                traceback.print_exc(file=sys.stderr)
+
+    def _emit_one(self, kind: str, entity: str, record_id=None, record=None):
+        self._emit([ChangeEvent(kind, entity, record_id, record)])
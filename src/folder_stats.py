@@ -0,0 +1,221 @@
+"""
+Per-project folder statistics
+
+FolderStatsIndex walks each project's folder under the parent directory and
+its counterpart under the sync directory and totals size, file count and the
+latest modification time. Symlinks are not followed, so shortcuts to auto
+items are not counted twice.
+
+Every directory's own totals (the files directly in it) are cached on disk
+keyed by path and directory mtime. A directory whose mtime is unchanged is
+not listed again, only its subdirectories are visited, so a refresh costs
+one stat per directory. Adding, removing or renaming an entry changes the
+directory's mtime; a file rewritten in place does not, which is what
+``full=True`` is for.
+"""
+import os
+import time
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+from .config import FOLDER_STATS_CACHE_FILE
+from .materializer import MaterializeCancelled
+from .storage import default_writer, read_json_file
+
+CACHE_VERSION = 1
+
+# Directories modified this recently are not cached: a change within the same
+# mtime tick would otherwise go unnoticed on the next refresh
+CACHE_MIN_AGE_NS = 2 * 10**9
+
+
+class FolderStats:
+    """Totals for a folder tree"""
+
+    __slots__ = ("size", "files", "modified")
+
+    def __init__(self, size: int = 0, files: int = 0, modified: float = 0.0):
+        self.size = size
+        self.files = files
+        self.modified = modified  # latest mtime in the tree (epoch seconds)
+
+    def add(self, other: 'FolderStats'):
+        self.size += other.size
+        self.files += other.files
+        self.modified = max(self.modified, other.modified)
+
+    def to_list(self) -> List:
+        return [self.size, self.files, self.modified]
+
+    @classmethod
+    def from_list(cls, values: List) -> 'FolderStats':
+        return cls(*values)
+
+
+def format_size(size: int) -> str:
+    """Human readable size (1024-based)"""
+    value = float(size)
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if value < 1024 or unit == "TB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+
+
+class FolderStatsIndex:
+    """Folder size/activity per project with an mtime-keyed directory cache"""
+
+    def __init__(self, structure_manager, cache_file: str = FOLDER_STATS_CACHE_FILE):
+        self.structure_manager = structure_manager
+        self.cache_file = cache_file
+        self._directories: Dict[str, List] = {}  # path -> [mtime_ns, size, files, modified, [subdirs]]
+        self._fresh: Dict[str, List] = {}
+        self._projects: Dict[str, FolderStats] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+        self.listed = 0
+        self.reused = 0
+
+    def load(self):
+        """Read the cache file once (safe to call from a worker thread)"""
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            try:
+                data = read_json_file(self.cache_file, {})
+            except ValueError:
+                return
+            if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+                return
+            self._directories = data.get("directories", {})
+            self._projects = {
+                name: FolderStats.from_list(values) for name, values in data.get("projects", {}).items()
+            }
+
+    def save(self):
+        """Persist the directories seen by the last collect() and all project totals"""
+        with self._lock:
+            data = {
+                "version": CACHE_VERSION,
+                "directories": dict(self._fresh),
+                "projects": {name: stats.to_list() for name, stats in self._projects.items()},
+            }
+        try:
+            default_writer().write_json(self.cache_file, data, indent=None)
+        except OSError:
+            pass  # the cache only speeds up the next refresh
+
+    def get(self, name: str) -> Optional[FolderStats]:
+        """Last known totals of a project (from this session or the cache file)"""
+        if not self._loaded:
+            self.load()
+        return self._projects.get(name)
+
+    def snapshot(self) -> Dict[str, FolderStats]:
+        self.load()
+        with self._lock:
+            return dict(self._projects)
+
+    def _directory(self, path: str, full: bool) -> FolderStats:
+        """Totals of one directory tree, listing only changed directories"""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return FolderStats()
+        key = os.path.normcase(path)
+        cached = None if full else self._directories.get(key)
+        if cached is not None and cached[0] == mtime:
+            _, size, files, modified, subdirs = cached
+            with self._lock:
+                self.reused += 1
+                self._fresh[key] = cached
+        else:
+            size = files = 0
+            modified = mtime / 1e9
+            subdirs = []
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_symlink():
+                                continue
+                            if entry.is_dir():
+                                subdirs.append(entry.name)
+                                continue
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        size += st.st_size
+                        files += 1
+                        modified = max(modified, st.st_mtime)
+            except OSError:
+                return FolderStats()
+            with self._lock:
+                self.listed += 1
+                if time.time_ns() - mtime > CACHE_MIN_AGE_NS:
+                    self._fresh[key] = [mtime, size, files, modified, subdirs]
+
+        total = FolderStats(size, files, modified)
+        for name in subdirs:
+            total.add(self._directory(os.path.join(path, name), full))
+        return total
+
+    def project_stats(self, name: str, full: bool = False) -> FolderStats:
+        """Walk one project's folder and its sync counterpart"""
+        parent_dir = self.structure_manager.get_parent_directory()
+        sync_dir = self.structure_manager.get_sync_directory()
+        stats = self._directory(os.path.join(parent_dir, name), full)
+        if sync_dir and os.path.normcase(sync_dir) != os.path.normcase(parent_dir):
+            stats.add(self._directory(os.path.join(sync_dir, name), full))
+        with self._lock:
+            self._projects[name] = stats
+        return stats
+
+    def collect(self, names: Iterable[str], full: bool = False, max_workers: Optional[int] = None,
+                progress: Optional[Callable[[int, int], None]] = None,
+                cancelled: Optional[Callable[[], bool]] = None) -> Dict[str, FolderStats]:
+        """Refresh the totals of the given projects and save the cache
+
+        Projects are walked on up to ``max_workers`` threads (default: the
+        template's max_workers). ``progress(done, total)`` is called per
+        project; when ``cancelled()`` returns True no further projects are
+        started and MaterializeCancelled is raised.
+        """
+        self.load()
+        names = list(names)
+        total = len(names)
+        done = [0]
+        counter = threading.Lock()
+        with self._lock:
+            # Directories seen by the previous run are reusable in this one
+            self._directories.update(self._fresh)
+            self._fresh = {}
+            self.listed = self.reused = 0
+
+        def walk(name: str):
+            if cancelled is not None and cancelled():
+                raise MaterializeCancelled()
+            self.project_stats(name, full)
+            if progress is not None:
+                with counter:
+                    done[0] += 1
+                    count = done[0]
+                progress(count, total)
+
+        if max_workers is None:
+            max_workers = self.structure_manager.get_max_workers()
+        if max_workers <= 1 or total <= 1:
+            for name in names:
+                walk(name)
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="folder-stats") as pool:
+                for future in [pool.submit(walk, name) for name in names]:
+                    future.result()
+
+        with self._lock:
+            # Forget projects that are no longer listed
+            wanted = set(names)
+            self._projects = {name: stats for name, stats in self._projects.items() if name in wanted}
+        self.save()
+        return self.snapshot()
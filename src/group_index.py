@@ -0,0 +1,98 @@
+"""
+Group -> projects index
+
+GroupIndex answers "which projects are in group X" and "how many projects of
+each status does group X have" without scanning the project list. It is
+built on first use and then updated from the ProjectManager's change events
+(before any listener sees them), one added/updated/removed project at a time.
+A reset event, or the repository re-reading its file after an outside
+change (its ``generation`` moves), makes the next query rebuild it.
+
+Only in-memory repositories (JsonRepository and JournalRepository) are
+indexed; with SQLite the ProjectManager asks the database instead.
+"""
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+from .events import ChangeEvent, EVENT_REMOVED, EVENT_RESET, ENTITY_PROJECT
+
+
+class GroupIndex:
+    """project ids and status counts per group id (0 = no group)"""
+
+    def __init__(self, repository):
+        self.repository = repository
+        self._entries: Dict[int, Tuple[int, str]] = {}   # project id -> (group id, status)
+        self._members: Dict[int, Set[int]] = {}
+        self._counts: Dict[int, Dict[str, int]] = {}
+        self._built = False
+        self._generation = None
+        self._lock = threading.RLock()
+
+    def _ensure(self):
+        """Build the index, or rebuild it if the repository reloaded its file"""
+        with self._lock:
+            # Re-reads a file changed on disk, which bumps the generation
+            self.repository.sync()
+            if self._built and self.repository.generation == self._generation:
+                return
+            self._entries = {}
+            self._members = {}
+            self._counts = {}
+            for project in self.repository.all():
+                self._add(project.id, project.group_id, project.status)
+            self._generation = self.repository.generation
+            self._built = True
+
+    def _add(self, project_id: int, group_id: int, status: str):
+        self._entries[project_id] = (group_id, status)
+        self._members.setdefault(group_id, set()).add(project_id)
+        counts = self._counts.setdefault(group_id, {})
+        counts[status] = counts.get(status, 0) + 1
+
+    def _remove(self, project_id: int):
+        entry = self._entries.pop(project_id, None)
+        if entry is None:
+            return
+        group_id, status = entry
+        members = self._members.get(group_id)
+        if members is not None:
+            members.discard(project_id)
+            if not members:
+                del self._members[group_id]
+        counts = self._counts.get(group_id)
+        if counts is not None:
+            counts[status] -= 1
+            if not counts[status]:
+                del counts[status]
+            if not counts:
+                del self._counts[group_id]
+
+    def apply(self, events: List[ChangeEvent]):
+        """Follow a batch of change events (ignored until the index is built)"""
+        with self._lock:
+            if not self._built:
+                return
+            for event in events:
+                if event.entity != ENTITY_PROJECT:
+                    continue
+                if event.kind == EVENT_RESET:
+                    self._built = False
+                    return
+                self._remove(event.record_id)
+                if event.kind != EVENT_REMOVED:
+                    project = event.record
+                    self._add(project.id, project.group_id, project.status)
+
+    def project_ids(self, group_id: int) -> Set[int]:
+        """Ids of the projects in a group (a copy)"""
+        self._ensure()
+        with self._lock:
+            return set(self._members.get(group_id, ()))
+
+    def counts(self, group_id: Optional[int] = None):
+        """Status -> count for one group, or group id -> status counts for all"""
+        self._ensure()
+        with self._lock:
+            if group_id is not None:
+                return dict(self._counts.get(group_id, {}))
+            return {group: dict(counts) for group, counts in self._counts.items()}
@@ -4,10 +4,11 @@ Project group management UI components
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import json
-from typing import List, Optional, Callable
+from typing import Dict, List, Optional, Callable
 from .models import ProjectGroup, ProjectManager
-from .ui_utils import DialogManager, ValidationHelper, FormBuilder
-from .config import STATUS_OPTIONS, STATUS_ACTIVE, STATUS_INACTIVE
+from .ui_utils import DialogManager, ValidationHelper, FormBuilder, LazyJsonView
+from .events import ChangeEvent, EVENT_REMOVED, EVENT_RESET, ENTITY_GROUP, ENTITY_PROJECT
+from .config import STATUS_OPTIONS, STATUS_ACTIVE, STATUS_INACTIVE, DELTA_REFRESH_LIMIT
 
 
 class GroupDialog:
@@ -88,12 +89,21 @@ class GroupDialog:
 class GroupListPanel:
     """Panel for managing project group list"""
     
-    def __init__(self, parent: tk.Widget, project_manager: ProjectManager):
+    def __init__(self, parent: tk.Widget, project_manager: ProjectManager, load: bool = True):
         self.parent = parent
         self.project_manager = project_manager
         self.on_group_changed: Optional[Callable] = None
+        # Called with the selected group by "Show Projects"
+        self.on_show_projects: Optional[Callable[[ProjectGroup], None]] = None
+        # group id -> {status: count}, as shown in the Projects/Active columns
+        self._counts: Dict[int, Dict[str, int]] = {}
         self._create_ui()
-        self.refresh()
+        # With load=False the caller fills the panel later with refresh()
+        if load:
+            self.refresh()
+        # Apply manager change events as row deltas while the panel exists
+        unsubscribe = self.project_manager.subscribe(self._on_model_changed)
+        self.frame.bind("<Destroy>", lambda e: unsubscribe() if e.widget is self.frame else None)
     
     def _create_ui(self):
         """Create the UI components"""
@@ -119,7 +129,7 @@ class GroupListPanel:
         # Treeview
         self.tree = ttk.Treeview(
             self.visual_frame,
-            columns=("ID", "Name", "Description", "Status"),
+            columns=("ID", "Name", "Description", "Status", "Projects", "Active"),
             show="headings"
         )
         
@@ -128,11 +138,15 @@ class GroupListPanel:
         self.tree.heading("Name", text="Name") 
         self.tree.heading("Description", text="Description")
         self.tree.heading("Status", text="Status")
+        self.tree.heading("Projects", text="Projects")
+        self.tree.heading("Active", text="Active")
         
         self.tree.column("ID", width=40, anchor="center")
         self.tree.column("Name", width=120, anchor="w")
         self.tree.column("Description", width=180, anchor="w")
         self.tree.column("Status", width=80, anchor="center")
+        self.tree.column("Projects", width=60, anchor="center")
+        self.tree.column("Active", width=60, anchor="center")
         
         self.tree.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
         
@@ -148,7 +162,17 @@ class GroupListPanel:
         tk.Button(btn_frame, text="Add Group", command=self._on_add).pack(side=tk.LEFT, padx=5)
         tk.Button(btn_frame, text="Edit Selected", command=self._on_edit).pack(side=tk.LEFT, padx=5)
         tk.Button(btn_frame, text="Remove Selected", command=self._on_remove).pack(side=tk.LEFT, padx=5)
-        btn_frame.pack(pady=(0, 8))
+        btn_frame.pack(pady=(0, 4))
+        
+        # Actions on the projects of the selected group
+        project_btn_frame = tk.Frame(self.visual_frame)
+        tk.Button(project_btn_frame, text="Show Projects",
+                  command=self._on_show_projects).pack(side=tk.LEFT, padx=5)
+        tk.Button(project_btn_frame, text="Mark Projects Active",
+                  command=lambda: self._on_set_project_status(STATUS_ACTIVE)).pack(side=tk.LEFT, padx=5)
+        tk.Button(project_btn_frame, text="Mark Projects Inactive",
+                  command=lambda: self._on_set_project_status(STATUS_INACTIVE)).pack(side=tk.LEFT, padx=5)
+        project_btn_frame.pack(pady=(0, 8))
         
         self.notebook.add(self.visual_frame, text="Visual Editor")
     
@@ -168,6 +192,11 @@ class GroupListPanel:
         btn_frame.pack(pady=(0, 8))
         
         self.notebook.add(self.json_frame, text="Raw JSON")
+        self._json_view = LazyJsonView(
+            self.notebook, self.json_frame, self.json_text,
+            snapshot=self.project_manager.load_groups,
+            serialize=lambda groups: json.dumps([g.to_dict() for g in groups], indent=2, ensure_ascii=False)
+        )
     
     def _on_add(self):
         """Add new group"""
@@ -179,7 +208,6 @@ class GroupListPanel:
                 self.project_manager.add_group(
                     group.name, group.description, getattr(group, 'status', STATUS_ACTIVE)
                 )
-                self.refresh()
                 if self.on_group_changed:
                     self.on_group_changed()
                 messagebox.showinfo("Success", f"Group '{group.name}' added.")
@@ -206,7 +234,6 @@ class GroupListPanel:
                     updated_group.id, updated_group.name, 
                     updated_group.description, getattr(updated_group, 'status', STATUS_ACTIVE)
                 )
-                self.refresh()
                 if self.on_group_changed:
                     self.on_group_changed()
             except ValueError as e:
@@ -228,10 +255,37 @@ class GroupListPanel:
             f"Are you sure you want to remove group '{group.name}'?"
         ):
             self.project_manager.delete_group(group.id)
-            self.refresh()
             if self.on_group_changed:
                 self.on_group_changed()
     
+    def _on_show_projects(self):
+        """Filter the project list to the selected group"""
+        group = self._get_selected_group()
+        if not group:
+            messagebox.showinfo("Show Projects", "Please select a group.")
+            return
+        if self.on_show_projects:
+            self.on_show_projects(group)
+    
+    def _on_set_project_status(self, status: str):
+        """Set the status of every project in the selected group"""
+        group = self._get_selected_group()
+        if not group:
+            messagebox.showinfo("Set Project Status", "Please select a group.")
+            return
+        
+        counts = self._counts.get(group.id, {})
+        to_change = sum(counts.values()) - counts.get(status, 0)
+        if not to_change:
+            messagebox.showinfo("Set Project Status", f"All projects in '{group.name}' are already {status}.")
+            return
+        
+        if DialogManager.confirm_dialog(
+            self.frame, "Set Project Status",
+            f"Mark {to_change} project(s) in group '{group.name}' as {status}?"
+        ):
+            self.project_manager.set_group_project_status(group.id, status)
+    
     def _on_double_click(self, event):
         """Handle double-click on tree item"""
         self._on_edit()
@@ -247,24 +301,22 @@ class GroupListPanel:
             return None
         
         group_id = int(values[0])
-        groups = self.project_manager.load_groups()
-        
-        for group in groups:
-            if group.id == group_id:
-                return group
-        
-        return None
+        return self.project_manager.get_group_by_id(group_id)
     
     def _save_json(self):
         """Save JSON text"""
+        if self._json_view.loading:
+            messagebox.showinfo("Raw JSON", "The JSON view is still loading.")
+            return
         try:
             json_text = self.json_text.get("1.0", tk.END)
             data = json.loads(json_text)
             groups = [ProjectGroup.from_dict(group_data) for group_data in data]
             self.project_manager.save_groups(groups)
-            self.refresh()
             if self.on_group_changed:
                 self.on_group_changed()
+            # Show the saved data, normalized, instead of the edited text
+            self._json_view.reload()
             messagebox.showinfo("Saved", "Group list saved successfully.")
         except Exception as e:
             messagebox.showerror("Error", f"Invalid JSON: {e}")
@@ -277,34 +329,76 @@ class GroupListPanel:
     def _refresh_tree(self):
         """Refresh tree view"""
         self.tree.delete(*self.tree.get_children())
+        self._counts = self.project_manager.get_group_counts()
         
         # Sort groups by ID descending
         groups = sorted(self.project_manager.load_groups(), 
                        key=lambda g: g.id, reverse=True)
         
         for group in groups:
-            status = getattr(group, 'status', STATUS_ACTIVE)
-            values = (
-                group.id,
-                group.name,
-                group.description,
-                status
-            )
-            
-            if status == STATUS_INACTIVE:
-                self.tree.insert("", tk.END, values=values, tags=("inactive",))
+            self._insert_group(tk.END, group)
+    
+    def _group_values(self, group: ProjectGroup) -> tuple:
+        return (
+            group.id,
+            group.name,
+            group.description,
+            getattr(group, 'status', STATUS_ACTIVE),
+            *self._count_values(group.id)
+        )
+    
+    def _count_values(self, group_id: int) -> tuple:
+        counts = self._counts.get(group_id, {})
+        return (sum(counts.values()), counts.get(STATUS_ACTIVE, 0))
+    
+    def _group_tags(self, group: ProjectGroup) -> tuple:
+        return ("inactive",) if getattr(group, 'status', STATUS_ACTIVE) == STATUS_INACTIVE else ()
+    
+    def _insert_group(self, index, group: ProjectGroup):
+        self.tree.insert("", index, iid=str(group.id), values=self._group_values(group),
+                         tags=self._group_tags(group))
+    
+    def _on_model_changed(self, events: List[ChangeEvent]):
+        """Apply group change events to the tree (rows are keyed by group id)"""
+        if any(e.entity == ENTITY_PROJECT for e in events):
+            self._update_counts()
+        events = [e for e in events if e.entity == ENTITY_GROUP]
+        if not events:
+            return
+        if len(events) > DELTA_REFRESH_LIMIT or any(e.kind == EVENT_RESET for e in events):
+            self.refresh()
+            return
+        
+        for event in events:
+            iid = str(event.record_id)
+            if event.kind == EVENT_REMOVED:
+                if self.tree.exists(iid):
+                    self.tree.delete(iid)
+            elif self.tree.exists(iid):
+                self.tree.item(iid, values=self._group_values(event.record),
+                               tags=self._group_tags(event.record))
             else:
-                self.tree.insert("", tk.END, values=values)
+                # Keep ID descending order
+                children = self.tree.get_children()
+                index = next((i for i, child in enumerate(children) if int(child) < event.record_id),
+                             len(children))
+                self._insert_group(index, event.record)
+        self._refresh_json()
+    
+    def _update_counts(self):
+        """Re-read the per-group counts from the index and redraw the rows that changed"""
+        counts = self.project_manager.get_group_counts()
+        changed = {
+            group_id for group_id in set(counts) | set(self._counts)
+            if counts.get(group_id) != self._counts.get(group_id)
+        }
+        self._counts = counts
+        for group_id in changed:
+            iid = str(group_id)
+            if self.tree.exists(iid):
+                values = self.tree.item(iid, "values")
+                self.tree.item(iid, values=(*values[:4], *self._count_values(group_id)))
     
     def _refresh_json(self):
-        """Refresh JSON view"""
-        try:
-            groups = self.project_manager.load_groups()
-            data = [group.to_dict() for group in groups]
-            json_str = json.dumps(data, indent=2, ensure_ascii=False)
-            
-            self.json_text.delete("1.0", tk.END)
-            self.json_text.insert(tk.END, json_str)
-        except Exception:
-            self.json_text.delete("1.0", tk.END)
-            self.json_text.insert(tk.END, "[]")
+        """Refresh JSON view (rendered when the Raw JSON tab is shown)"""
+        self._json_view.invalidate()
@@ -0,0 +1,80 @@
+"""
+Background job list UI components
+"""
+import tkinter as tk
+from tkinter import ttk, messagebox
+from typing import List
+from .events import ChangeEvent, EVENT_REMOVED
+from .jobs import Job, JobQueue, JOB_FAILED, JOB_CANCELLED
+
+
+class JobListPanel:
+    """Panel listing queued, running and finished background jobs"""
+    
+    def __init__(self, parent: tk.Widget, job_queue: JobQueue):
+        self.parent = parent
+        self.job_queue = job_queue
+        self._create_ui()
+        unsubscribe = self.job_queue.subscribe(self._on_jobs_changed)
+        self.frame.bind("<Destroy>", lambda e: unsubscribe() if e.widget is self.frame else None)
+    
+    def _create_ui(self):
+        """Create the UI components"""
+        self.frame = tk.LabelFrame(self.parent, text="Jobs", padx=5, pady=5)
+        self.frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.tree = ttk.Treeview(
+            self.frame,
+            columns=("Job", "Status", "Progress"),
+            show="headings",
+            height=4
+        )
+        self.tree.heading("Job", text="Job")
+        self.tree.heading("Status", text="Status")
+        self.tree.heading("Progress", text="Progress")
+        
+        self.tree.column("Job", width=300, anchor="w")
+        self.tree.column("Status", width=80, anchor="center")
+        self.tree.column("Progress", width=120, anchor="center")
+        
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        # Styling for failed and cancelled jobs
+        self.tree.tag_configure(JOB_FAILED, foreground="#cc0000")
+        self.tree.tag_configure(JOB_CANCELLED, foreground="#888888")
+        
+        btn_frame = tk.Frame(self.frame)
+        tk.Button(btn_frame, text="Cancel Selected", command=self._on_cancel).pack(fill=tk.X, pady=(0, 5))
+        tk.Button(btn_frame, text="Clear Finished", command=self.job_queue.clear_finished).pack(fill=tk.X)
+        btn_frame.pack(side=tk.LEFT, padx=(8, 0), anchor="n")
+    
+    def _job_values(self, job: Job) -> tuple:
+        status = job.status
+        if job.error is not None:
+            status = f"{status}: {job.error}"
+        return (job.title, status, job.progress_text())
+    
+    def _on_jobs_changed(self, events: List[ChangeEvent]):
+        """Apply job change events to the tree (rows are keyed by job id)"""
+        for event in events:
+            iid = str(event.record_id)
+            if event.kind == EVENT_REMOVED:
+                if self.tree.exists(iid):
+                    self.tree.delete(iid)
+                continue
+            job = event.record
+            tags = (job.status,) if job.status in (JOB_FAILED, JOB_CANCELLED) else ()
+            if self.tree.exists(iid):
+                self.tree.item(iid, values=self._job_values(job), tags=tags)
+            else:
+                self.tree.insert("", tk.END, iid=iid, values=self._job_values(job), tags=tags)
+    
+    def _on_cancel(self):
+        """Cancel the selected job"""
+        selected = self.tree.focus()
+        if not selected:
+            messagebox.showinfo("Cancel Job", "Please select a job to cancel.")
+            return
+        for job in self.job_queue.jobs:
+            if str(job.id) == selected and not job.finished:
+                job.cancel()
@@ -0,0 +1,160 @@
+"""
+Background job queue for long-running filesystem work
+
+Jobs run on a small worker pool so slow shares never block the Tk main loop.
+Workers only touch the job object; the Tk thread polls the queue with
+``after`` and delivers progress updates and completion callbacks there, so
+callbacks may safely use widgets and the managers.
+"""
+import sys
+import queue
+import threading
+import traceback
+from typing import Callable, List, Optional
+from .config import JOB_WORKERS, JOB_POLL_MS
+from .events import ChangeEvent, ChangeNotifier, EVENT_ADDED, EVENT_UPDATED, EVENT_REMOVED, ENTITY_JOB
+from .materializer import MaterializeCancelled
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_STATES = (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+
+class Job:
+    """A unit of background work with progress and cancellation"""
+
+    def __init__(self, job_id: int, title: str, func: Callable[['Job'], object],
+                 on_done: Optional[Callable[['Job'], None]] = None):
+        self.id = job_id
+        self.title = title
+        self.func = func
+        self.on_done = on_done
+        self.status = JOB_QUEUED
+        self.done = 0
+        self.total = 0
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self._cancel = threading.Event()
+
+    def report(self, done: int, total: int):
+        """Record progress (called from the worker thread)"""
+        self.done = done
+        self.total = total
+
+    def cancel(self):
+        """Ask the job to stop; queued jobs never start"""
+        self._cancel.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def progress_text(self) -> str:
+        if self.total:
+            return f"{self.done}/{self.total} ({self.done * 100 // self.total}%)"
+        return ""
+
+
+class JobQueue(ChangeNotifier):
+    """Runs jobs on worker threads and reports back on the Tk thread
+
+    Listeners receive ENTITY_JOB change events (added when a job is queued,
+    updated on status or progress changes, removed by clear_finished).
+    """
+
+    def __init__(self, root, max_workers: int = JOB_WORKERS):
+        super().__init__()
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.root = root
+        self.jobs: List[Job] = []
+        self._next_id = 1
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._finished: "queue.Queue" = queue.Queue()  # (job, final status)
+        self._seen = {}  # job id -> (status, done) last reported to listeners
+        self._polling = False
+
+    def submit(self, title: str, func: Callable[[Job], object],
+               on_done: Optional[Callable[[Job], None]] = None) -> Job:
+        """Queue func(job) for a worker; on_done(job) runs on the Tk thread"""
+        job = Job(self._next_id, title, func, on_done)
+        self._next_id += 1
+        self.jobs.append(job)
+        self._seen[job.id] = (job.status, job.done)
+        self._executor.submit(self._run, job)
+        self._emit_one(EVENT_ADDED, ENTITY_JOB, job.id, job)
+        self._schedule_poll()
+        return job
+
+    def active(self) -> List[Job]:
+        return [job for job in self.jobs if not job.finished]
+
+    def clear_finished(self):
+        """Forget finished jobs"""
+        finished = [job for job in self.jobs if job.finished]
+        self.jobs = [job for job in self.jobs if not job.finished]
+        for job in finished:
+            self._seen.pop(job.id, None)
+        self._emit([ChangeEvent(EVENT_REMOVED, ENTITY_JOB, job.id, job) for job in finished])
+
+    def shutdown(self):
+        """Cancel everything and stop the workers"""
+        for job in self.jobs:
+            job.cancel()
+        self._executor.shutdown(wait=False)
+
+    def _run(self, job: Job):
+        """Worker thread: run one job; the outcome is picked up by _poll"""
+        try:
+            if job.is_cancelled():
+                raise MaterializeCancelled()
+            job.status = JOB_RUNNING
+            job.result = job.func(job)
+            outcome = JOB_DONE
+        except MaterializeCancelled:
+            outcome = JOB_CANCELLED
+        except Exception as e:
+            job.error = e
+            outcome = JOB_FAILED
+        self._finished.put((job, outcome))
+
+    def _schedule_poll(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(JOB_POLL_MS, self._poll)
+
+    def _poll(self):
+        """Tk thread: publish progress and complete finished jobs"""
+        self._polling = False
+        completed = []
+        while True:
+            try:
+                job, status = self._finished.get_nowait()
+            except queue.Empty:
+                break
+            job.status = status
+            completed.append(job)
+
+        events = []
+        for job in self.jobs:
+            state = (job.status, job.done)
+            if self._seen.get(job.id) != state:
+                self._seen[job.id] = state
+                events.append(ChangeEvent(EVENT_UPDATED, ENTITY_JOB, job.id, job))
+        self._emit(events)
+
+        for job in completed:
+            if job.on_done is not None:
+                try:
+                    job.on_done(job)
+                except Exception:
+                    traceback.print_exc(file=sys.stderr)
+
+        if self.active():
+            self._schedule_poll()
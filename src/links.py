@@ -0,0 +1,215 @@
+"""
+Shortcut creation for auto items
+
+Auto folders and files live in the sync tree and get a shortcut in the
+project folder. How that shortcut is made is a LinkStrategy:
+
+- ``symlink``: absolute symbolic link
+- ``relative-symlink``: symbolic link relative to the link's folder, so the
+  parent and sync trees can be moved together
+- ``hardlink``: hard link (files only; folders fall back to a text stub)
+- ``lnk``: Windows .lnk shortcut (needs pywin32)
+- ``stub``: a "<name>_link.txt" file naming the target
+
+The strategy is chosen once per parent/sync directory pair, either from
+"link_strategy" in the structure template or, for "auto", by probing which
+kind of link the file systems accept (for folder targets too when the
+template has auto folders). A LinkMaker then creates all links of
+a run with that strategy and collects failures (the item gets a text stub
+instead) so they can be reported at the end.
+"""
+import os
+import sys
+import shutil
+import tempfile
+import threading
+from typing import List, Optional, Tuple
+
+# Files written instead of a real link (see reconcile.py)
+LNK_SUFFIX = ".lnk"
+STUB_SUFFIX = "_link.txt"
+
+LINK_STRATEGY_AUTO = "auto"
+
+
+class LinkStrategy:
+    """Creates one shortcut; raises OSError (or any Exception) on failure"""
+
+    name = ""
+
+    def create(self, link_path: str, target_path: str, is_dir: bool):
+        raise NotImplementedError
+
+
+class SymlinkStrategy(LinkStrategy):
+    name = "symlink"
+
+    def create(self, link_path: str, target_path: str, is_dir: bool):
+        os.symlink(target_path, link_path, target_is_directory=is_dir)
+
+
+class RelativeSymlinkStrategy(LinkStrategy):
+    name = "relative-symlink"
+
+    def create(self, link_path: str, target_path: str, is_dir: bool):
+        target = os.path.relpath(target_path, os.path.dirname(link_path))
+        os.symlink(target, link_path, target_is_directory=is_dir)
+
+
+class HardlinkStrategy(LinkStrategy):
+    name = "hardlink"
+
+    def create(self, link_path: str, target_path: str, is_dir: bool):
+        if is_dir:
+            raise OSError("folders cannot be hard-linked")
+        os.link(target_path, link_path)
+
+
+class WindowsShortcutStrategy(LinkStrategy):
+    """Windows .lnk files through WScript.Shell (one COM object per thread)"""
+
+    name = "lnk"
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _shell(self):
+        shell = getattr(self._local, "shell", None)
+        if shell is None:
+            import win32com.client
+            shell = self._local.shell = win32com.client.Dispatch("WScript.Shell")
+        return shell
+
+    def create(self, link_path: str, target_path: str, is_dir: bool):
+        shortcut = self._shell().CreateShortcut(link_path + LNK_SUFFIX)
+        shortcut.TargetPath = target_path
+        # Working directory is the target's folder for better behavior
+        shortcut.WorkingDirectory = os.path.dirname(target_path)
+        shortcut.Save()
+
+
+class TextStubStrategy(LinkStrategy):
+    name = "stub"
+
+    def create(self, link_path: str, target_path: str, is_dir: bool, error: Optional[str] = None):
+        with open(link_path + STUB_SUFFIX, "w", encoding="utf-8") as f:
+            f.write(f"Link to: {target_path}\n")
+            if error:
+                f.write(f"Error creating shortcut: {error}\n")
+
+
+STRATEGIES = {
+    cls.name: cls
+    for cls in (SymlinkStrategy, RelativeSymlinkStrategy, HardlinkStrategy, WindowsShortcutStrategy, TextStubStrategy)
+}
+
+
+def candidate_strategies() -> List[str]:
+    """Strategies tried by "auto", best first"""
+    if sys.platform.startswith("win"):
+        return ["lnk", "symlink", "stub"]
+    return ["symlink", "hardlink", "stub"]
+
+
+def _probe_dir(root: Optional[str]) -> str:
+    """Where to probe for links under ``root``
+
+    The root itself when it exists (its file system decides which links
+    work); otherwise the temp directory, so nothing is written into
+    whatever ancestor of a not-yet-created root happens to exist.
+    """
+    if root and os.path.isdir(root):
+        return root
+    return tempfile.gettempdir()
+
+
+def _probe(strategy: LinkStrategy, link_dir: str, target_dir: str, directories: bool = True) -> bool:
+    """Try the strategy between scratch folders in the two trees
+
+    A file target is always linked; with ``directories`` a folder target
+    must work as well.
+    """
+    link_scratch = target_scratch = None
+    try:
+        link_scratch = tempfile.mkdtemp(prefix=".pfm-link-probe-", dir=link_dir)
+        target_scratch = tempfile.mkdtemp(prefix=".pfm-link-probe-", dir=target_dir)
+        target = os.path.join(target_scratch, "target")
+        with open(target, "w", encoding="utf-8"):
+            pass
+        strategy.create(os.path.join(link_scratch, "link"), target, False)
+        if directories:
+            target_folder = os.path.join(target_scratch, "folder")
+            os.mkdir(target_folder)
+            strategy.create(os.path.join(link_scratch, "folder-link"), target_folder, True)
+        return True
+    except Exception:
+        return False
+    finally:
+        for scratch in (link_scratch, target_scratch):
+            if scratch is not None:
+                shutil.rmtree(scratch, ignore_errors=True)
+
+
+def choose_strategy(name: str, link_root: str, target_root: Optional[str] = None,
+                    directories: bool = True) -> LinkStrategy:
+    """Return the configured strategy, or probe for the best one with "auto"
+
+    ``link_root`` is where links are created (the parent directory) and
+    ``target_root`` where their targets live (the sync directory). With
+    ``directories`` (the template has auto folders) "auto" only picks a
+    strategy that can link folders, so "hardlink" is skipped.
+    """
+    if name != LINK_STRATEGY_AUTO:
+        if name not in STRATEGIES:
+            raise ValueError(f"Unknown link strategy '{name}'")
+        return STRATEGIES[name]()
+    link_dir = _probe_dir(link_root)
+    target_dir = _probe_dir(target_root or link_root)
+    for candidate in candidate_strategies():
+        strategy = STRATEGIES[candidate]()
+        if candidate == TextStubStrategy.name or _probe(strategy, link_dir, target_dir, directories):
+            return strategy
+    return TextStubStrategy()
+
+
+class LinkMaker:
+    """Creates the links of one run and collects the failures
+
+    Called as ``maker(link_path, target_path, is_dir)`` (the create_link
+    callback of execute_plan). A failed link is replaced by a text stub and
+    recorded in ``failures`` instead of raising, so one bad link does not
+    abort the rest of the folder tree.
+    """
+
+    def __init__(self, strategy: LinkStrategy):
+        self.strategy = strategy
+        self.created = 0
+        self.failures: List[Tuple[str, str, str]] = []  # (link path, target path, error)
+        self._stub = TextStubStrategy()
+        self._lock = threading.Lock()
+
+    def __call__(self, link_path: str, target_path: str, is_dir: Optional[bool] = None):
+        if is_dir is None:
+            is_dir = os.path.isdir(target_path)
+        try:
+            self.strategy.create(link_path, target_path, is_dir)
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+            with self._lock:
+                self.failures.append((link_path, target_path, error))
+            if not isinstance(self.strategy, TextStubStrategy):
+                try:
+                    self._stub.create(link_path, target_path, is_dir, error)
+                except OSError:
+                    pass
+            return
+        with self._lock:
+            self.created += 1
+
+    def summary(self) -> str:
+        lines = [
+            f"{self.created} shortcut(s) created with '{self.strategy.name}', {len(self.failures)} failed."
+        ]
+        for link_path, target_path, error in self.failures:
+            lines.append(f"  {link_path} -> {target_path}: {error}")
+        return "\n".join(lines)
@@ -1,21 +1,42 @@
 """
 Main application window and coordinator
+
+Startup paints the window first: the panels are created empty, the project,
+group and structure files are parsed on a background thread and the panels
+are filled once that finishes. The structure editor and its dialogs are only
+imported when opened. Run with --profile-startup (or PFM_PROFILE_STARTUP=1)
+to print the time to the first frame, and with --instrument (or
+PFM_INSTRUMENT=1) to time manager, storage and panel calls; Ctrl+Shift+D then
+opens the instrumentation window.
 """
+import time
+_LAUNCHED = time.perf_counter()  # before the GUI imports, for the startup report
+
 import tkinter as tk
 from tkinter import messagebox
 import os
 import sys
+import threading
 from .config import *
-from .models import ProjectManager, StructureManager
+from .models import ProjectManager, StructureManager, folder_name_error
+from .jobs import JobQueue, JOB_DONE, JOB_FAILED
 from .project_ui import ProjectListPanel
-from .structure_ui import StructurePanel, ParentDirectoryPanel, SyncDirectoryPanel
+from .profiling import StartupTimer, instrumentation, instrument_class
 from .ui_utils import ValidationHelper
 
+# Panel methods timed when instrumentation is on (tree and JSON rendering)
+PANEL_METHODS = ("refresh", "_refresh_tree", "_refresh_json", "_apply_filter", "_materialize_rows",
+                 "_on_model_changed", "_on_structure_changed")
+
 
 class MainApplication:
     """Main application class"""
     
-    def __init__(self):
+    def __init__(self, profile_startup: bool = PROFILE_STARTUP, instrument: bool = INSTRUMENT):
+        self.timer = StartupTimer(profile_startup, start=_LAUNCHED)
+        self.timer.mark("imports")
+        self.instrument = instrument
+        self.debug_window = None
         self.root = None
         self.project_manager = None
         self.structure_manager = None
@@ -23,6 +44,8 @@ class MainApplication:
         self.structure_panel = None
         self.parent_dir_panel = None
         self.sync_dir_panel = None
+        self.job_queue = None
+        self.job_panel = None
         
     def run(self):
         """Run the application"""
@@ -30,7 +53,11 @@ class MainApplication:
             self._initialize()
             self._create_ui()
             self._setup_event_handlers()
+            self.timer.mark("widgets created")
+            self.root.bind("<Map>", self._on_first_map, add="+")
+            self._load_data_in_background()
             self.root.mainloop()
+            self.job_queue.shutdown()
         except Exception as e:
             if self.root:
                 self.root.withdraw()
@@ -38,6 +65,9 @@ class MainApplication:
     
     def _initialize(self):
         """Initialize managers and main window"""
+        if self.instrument:
+            self._enable_instrumentation()
+        
         # Initialize managers
         self.project_manager = ProjectManager()
         self.structure_manager = StructureManager()
@@ -49,6 +79,12 @@ class MainApplication:
         self.root.minsize(MIN_WIDTH, MIN_HEIGHT)
         self.root.resizable(True, True)
         
+        # Folder creation runs on background workers
+        self.job_queue = JobQueue(self.root)
+        
+        if self.instrument:
+            self.root.bind("<Control-Shift-D>", lambda e: self._show_debug_window())
+        
         # Center window
         self._center_window()
         
@@ -57,6 +93,65 @@ class MainApplication:
         self.root.grid_columnconfigure(0, weight=1)
         self.root.grid_columnconfigure(1, weight=0)
     
+    def _enable_instrumentation(self):
+        """Time every manager and storage call (panels are added as they are imported)"""
+        from .storage import AtomicWriter, JsonRepository, JournalRepository, SQLiteRepository
+        instrumentation().enabled = True
+        for cls in (ProjectManager, StructureManager, JsonRepository, JournalRepository,
+                    SQLiteRepository, AtomicWriter):
+            instrument_class(cls)
+        instrument_class(ProjectListPanel, PANEL_METHODS)
+    
+    def _show_debug_window(self):
+        """Open (or raise) the instrumentation window"""
+        from .debug_ui import InstrumentationWindow
+        if self.debug_window is None or not self.debug_window.window.winfo_exists():
+            self.debug_window = InstrumentationWindow(self.root, instrumentation())
+        self.debug_window.show()
+    
+    def _on_first_map(self, event):
+        """The main window is shown; note when its first frame is drawn"""
+        if event.widget is not self.root:
+            return
+        self.root.unbind("<Map>")
+        self.timer.mark("window mapped")
+        self.root.after_idle(lambda: self._startup_step("first frame"))
+    
+    def _startup_step(self, label: str):
+        """Mark a startup checkpoint; report once the window is drawn and filled"""
+        self.timer.mark(label)
+        if self.timer.elapsed_ms("first frame") is not None and self.timer.elapsed_ms("panels filled") is not None:
+            self.timer.report()
+    
+    def _load_data_in_background(self):
+        """Parse the project, group and structure files off the Tk thread"""
+        result = {}
+        
+        def work():
+            try:
+                self.project_manager.preload()
+                self.structure_manager.get_compiled()
+                self.project_panel.stats_index.load()
+            except Exception as e:
+                result["error"] = e
+        
+        worker = threading.Thread(target=work, name="startup-load", daemon=True)
+        worker.start()
+        self._wait_for_data(worker, result)
+    
+    def _wait_for_data(self, worker: threading.Thread, result: dict):
+        """Poll the loader thread and fill the panels once it is done"""
+        if worker.is_alive():
+            self.root.after(20, self._wait_for_data, worker, result)
+            return
+        self.timer.mark("data loaded")
+        if "error" in result:
+            messagebox.showerror("Error", f"Failed to load data: {result['error']}")
+            return
+        self.project_panel.refresh()
+        self.group_panel.refresh()
+        self._startup_step("panels filled")
+    
     def _center_window(self):
         """Center the main window on screen"""
         self.root.update_idletasks()
@@ -78,6 +173,7 @@ class MainApplication:
         container.grid_rowconfigure(0, weight=0)  # Config button row
         container.grid_rowconfigure(1, weight=0)  # Project creation row
         container.grid_rowconfigure(2, weight=1)  # Main panels row
+        container.grid_rowconfigure(3, weight=0)  # Background jobs row
         
         # Config button section
         self._create_config_button_section(container)
@@ -90,6 +186,9 @@ class MainApplication:
         
         # Right panel (group list)
         self._create_right_panel_in_container(container)
+        
+        # Background jobs (spans both columns)
+        self._create_job_panel_in_container(container)
     
     def _create_config_button_section(self, container):
         """Create config button section"""
@@ -105,13 +204,122 @@ class MainApplication:
             padx=15,
             pady=3
         ).pack(side=tk.LEFT)
+        
+        tk.Button(
+            config_frame, 
+            text="Re-apply Template...", 
+            command=self._reapply_template,
+            font=("Arial", 9),
+            relief="groove",
+            padx=15,
+            pady=3
+        ).pack(side=tk.LEFT, padx=(5, 0))
+        
+        tk.Button(
+            config_frame, 
+            text="Archive Inactive...", 
+            command=self._archive_inactive,
+            font=("Arial", 9),
+            relief="groove",
+            padx=15,
+            pady=3
+        ).pack(side=tk.LEFT, padx=(5, 0))
     
     def _show_structure_config(self):
         """Show Structure Config popup dialog"""
-        from .structure_ui import StructureConfigDialog
+        from .structure_ui import StructureConfigDialog, StructurePanel
+        instrument_class(StructurePanel, PANEL_METHODS)
         dialog = StructureConfigDialog(self.root, self.structure_manager)
         dialog.show()
     
+    def _reapply_template(self):
+        """Create template items missing from existing project folders"""
+        from .reconcile import ReconcileScanner
+        from .structure_ui import TemplateRepairDialog
+        
+        scanner = ReconcileScanner(self.project_manager, self.structure_manager)
+        try:
+            plan = TemplateRepairDialog(self.root, scanner).show()
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
+        if plan is None:
+            return
+        
+        def repair(job):
+            return scanner.repair(plan, progress=job.report, cancelled=job.is_cancelled)
+        
+        def on_done(job):
+            if job.status == JOB_DONE:
+                self.notice_var.set("Template Re-applied!")
+                self._report_link_failures(job.result)
+            elif job.status == JOB_FAILED:
+                messagebox.showerror("Error", f"Failed to re-apply the template: {job.error}")
+        
+        self.job_queue.submit(f"Re-apply template ({len(plan)} items)", repair, on_done)
+    
+    def _archive_inactive(self):
+        """Pack the folders of inactive projects into archives"""
+        from .archive import ProjectArchiver
+        
+        archiver = ProjectArchiver(self.project_manager, self.structure_manager)
+        projects = archiver.archivable()
+        if not projects:
+            messagebox.showinfo("Archive Inactive", "No inactive projects with folders to archive.")
+            return
+        archive_dir = self.structure_manager.get_archive_directory()
+        if not messagebox.askyesno(
+            "Archive Inactive",
+            f"Archive the folders of {len(projects)} inactive project(s) to\n{archive_dir}?\n\n"
+            "Each archive is verified before the original folders are removed."
+        ):
+            return
+        
+        def archive(job):
+            return archiver.archive(projects, progress=job.report, cancelled=job.is_cancelled)
+        
+        def on_archived(job):
+            if job.status == JOB_FAILED:
+                messagebox.showerror("Error", f"Failed to archive projects: {job.error}")
+                return
+            if job.status != JOB_DONE:
+                return
+            # Registry changes happen here, on the Tk thread, and before any
+            # folder is deleted
+            result = job.result
+            archiver.record(result)
+            if not result.done:
+                messagebox.showwarning("Archive Inactive", result.summary())
+                return
+            
+            def clean_up(cleanup_job):
+                return archiver.clean_up(result, progress=cleanup_job.report)
+            
+            def on_cleaned(cleanup_job):
+                self.notice_var.set(f"{len(result.done)} Project(s) Archived!")
+                problems = []
+                if result.failed or result.cancelled:
+                    problems.append(result.summary())
+                if cleanup_job.status == JOB_DONE and cleanup_job.result.failed:
+                    problems.append("Left on disk:\n" + cleanup_job.result.summary())
+                elif cleanup_job.status == JOB_FAILED:
+                    problems.append(f"Failed to remove the archived folders: {cleanup_job.error}")
+                if problems:
+                    messagebox.showwarning("Archive Inactive", "\n\n".join(problems))
+            
+            self.job_queue.submit(f"Remove {len(result.done)} archived project folder(s)", clean_up, on_cleaned)
+        
+        self.job_queue.submit(f"Archive {len(projects)} inactive project(s)", archive, on_archived)
+    
+    def _report_link_failures(self, links):
+        """Show the shortcuts of a run that had to be written as text stubs"""
+        if links is None or not links.failures:
+            return
+        lines = links.summary().split("\n")
+        if len(lines) > 21:
+            lines = lines[:21] + [f"  ... and {len(lines) - 21} more"]
+        messagebox.showwarning("Shortcuts", "\n".join(lines))
+    
     def _create_project_creation_section_in_container(self, container):
         """Create project creation controls in container"""
         # Project creation section (left side, in column 0)
@@ -124,7 +332,8 @@ class MainApplication:
         self.project_name_var = tk.StringVar()
         tk.Entry(project_frame, textvariable=self.project_name_var, width=25).pack(side=tk.LEFT, padx=(0, 5))
         
-        tk.Button(project_frame, text="Create Project", command=self._create_project).pack(side=tk.LEFT, padx=(0, 10))
+        tk.Button(project_frame, text="Create Project", command=self._create_project).pack(side=tk.LEFT, padx=(0, 5))
+        tk.Button(project_frame, text="Bulk Import...", command=self._bulk_import).pack(side=tk.LEFT, padx=(0, 10))
         
         # Status/notice label for project
         self.notice_var = tk.StringVar(value=" ")
@@ -159,9 +368,12 @@ class MainApplication:
         self.left_frame = tk.Frame(container)
         self.left_frame.grid(row=2, column=0, sticky="nsew", padx=(0, 5))
         
-        # Project list panel
+        # Project list panel (folder sizes are walked by a background job)
+        from .folder_stats import FolderStatsIndex
         self.project_panel = ProjectListPanel(
-            self.left_frame, self.project_manager
+            self.left_frame, self.project_manager,
+            stats_index=FolderStatsIndex(self.structure_manager), job_queue=self.job_queue,
+            load=False
         )
     
     def _create_right_panel_in_container(self, container):
@@ -171,10 +383,18 @@ class MainApplication:
         
         # Group list panel
         from .group_ui import GroupListPanel
+        instrument_class(GroupListPanel, PANEL_METHODS)
         self.group_panel = GroupListPanel(
-            self.right_frame, self.project_manager
+            self.right_frame, self.project_manager, load=False
         )
     
+    def _create_job_panel_in_container(self, container):
+        """Create the background job list below the main panels"""
+        from .job_ui import JobListPanel
+        job_frame = tk.Frame(container)
+        job_frame.grid(row=3, column=0, columnspan=2, sticky="ew", pady=(10, 0))
+        self.job_panel = JobListPanel(job_frame, self.job_queue)
+    
     def _setup_event_handlers(self):
         """Setup event handlers"""
         # Connect project panel changes to refresh other panels
@@ -184,6 +404,8 @@ class MainApplication:
         # Connect group panel changes  
         if hasattr(self, 'group_panel') and self.group_panel:
             self.group_panel.on_group_changed = self._on_group_changed
+            if self.project_panel:
+                self.group_panel.on_show_projects = self.project_panel.set_group_filter
     
     def _create_project(self):
         """Create a new project"""
@@ -191,7 +413,8 @@ class MainApplication:
         self.notice_var.set("")
 
         # Validate project name
-        name_error = ValidationHelper.validate_required_field(project_name, "Project name")
+        name_error = (ValidationHelper.validate_required_field(project_name, "Project name")
+                      or folder_name_error(project_name))
         if name_error:
             messagebox.showerror("Error", name_error)
             return
@@ -202,28 +425,106 @@ class MainApplication:
         project_path = os.path.join(parent_dir, project_name)
         sync_project_path = os.path.join(sync_dir, project_name) if sync_dir else None
 
-        # Check if project already exists
-        if os.path.exists(project_path):
+        # Check if project already exists (on disk, in the list or in the queue)
+        if os.path.exists(project_path) or self.project_manager.get_project_by_name(project_name):
             messagebox.showerror("Error", f"Project '{project_name}' already exists.")
             return
+        job_title = f"Create project '{project_name}'"
+        if any(job.title == job_title for job in self.job_queue.active()):
+            messagebox.showerror("Error", f"Project '{project_name}' is already being created.")
+            return
 
         try:
-            # Create project folders
-            structure = self.structure_manager.load_structure()
-            self.structure_manager.create_project_folders(project_path, structure, sync_project_path)
-
-            # Add to project list
-            project = self.project_manager.add_project(project_name)
+            # Compile the template on the Tk thread; workers only read it
+            self.structure_manager.get_compiled()
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
 
-            # Refresh UI
-            self.project_panel.refresh()
+        def create_folders(job):
+            return self.structure_manager.create_project_folders(
+                project_path, sync_path=sync_project_path,
+                progress=job.report, cancelled=job.is_cancelled
+            )
 
-            # Show success message
-            self.notice_var.set(f"Project '{project_name}' Created!")
-            self.project_name_var.set("")  # Clear input
+        def on_done(job):
+            # Runs on the Tk thread once the folders exist
+            if job.status == JOB_DONE:
+                try:
+                    # Add to project list (the panels pick up the change event)
+                    self.project_manager.add_project(project_name)
+                    self.notice_var.set(f"Project '{project_name}' Created!")
+                except ValueError as e:
+                    messagebox.showerror("Error", str(e))
+                self._report_link_failures(job.result)
+            elif job.status == JOB_FAILED:
+                messagebox.showerror("Error", f"Failed to create project '{project_name}': {job.error}")
+            else:
+                self.notice_var.set(f"Project '{project_name}' Cancelled")
 
+        self.job_queue.submit(job_title, create_folders, on_done)
+        self.notice_var.set(f"Project '{project_name}' Queued")
+        self.project_name_var.set("")  # Clear input
+    
+    def _bulk_import(self):
+        """Create projects in bulk from a CSV or JSON file"""
+        from tkinter import filedialog
+        from .bulk_import import BulkImporter
+        from .project_ui import BulkImportDialog
+        
+        path = filedialog.askopenfilename(
+            title="Select projects to import",
+            filetypes=[("CSV or JSON", "*.csv *.json"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        
+        self.notice_var.set("")
+        try:
+            importer = BulkImporter(self.project_manager, self.structure_manager)
+            dialog = BulkImportDialog(self.root, importer, path)
+            create_folders = dialog.show()
         except Exception as e:
-            messagebox.showerror("Error", str(e))
+            messagebox.showerror("Error", f"Failed to read import file: {e}")
+            return
+        
+        if create_folders is None:
+            return
+        projects, rejected = dialog.valid, dialog.rejected
+        if create_folders:
+            try:
+                # Compile the template on the Tk thread; workers only read it
+                self.structure_manager.get_compiled()
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+                return
+        
+        def prepare(job):
+            return importer.prepare(
+                projects, create_folders, progress=job.report, cancelled=job.is_cancelled
+            )
+        
+        def on_done(job):
+            # Runs on the Tk thread; projects are registered here in one save
+            if job.status == JOB_FAILED:
+                messagebox.showerror("Error", f"Import failed: {job.error}")
+                return
+            if job.status != JOB_DONE:
+                self.notice_var.set("Import Cancelled")
+                return
+            result = job.result
+            result.skipped[:0] = rejected
+            try:
+                importer.commit(result)
+            except ValueError as e:
+                messagebox.showerror("Error", f"Import failed: {e}")
+                return
+            self.notice_var.set(f"{len(result.created)} Projects Imported!")
+            if result.skipped or result.link_failures:
+                messagebox.showwarning("Bulk Import", result.summary())
+        
+        self.job_queue.submit(f"Import {len(projects)} project(s)", prepare, on_done)
+        self.notice_var.set("Import Queued")
     
     def _create_group(self):
         """Create a new project group"""
@@ -245,15 +546,6 @@ class MainApplication:
             # Show success message
             self.group_notice_var.set(f"Group '{group_name}' Created!")
             self.group_name_var.set("")  # Clear input
-            
-            # Refresh group panel to show the new group
-            if hasattr(self, 'group_panel') and self.group_panel:
-                self.group_panel.refresh()
-            
-            # Refresh project panel if needed (for group dropdowns)
-            if hasattr(self, 'project_panel') and self.project_panel:
-                self.project_panel.refresh()
-                
         except ValueError as e:
             messagebox.showerror("Error", str(e))
         except Exception as e:
@@ -266,14 +558,15 @@ class MainApplication:
     
     def _on_group_changed(self):
         """Handle group list changes"""
-        # Refresh project panel to update group names in dropdowns
-        if hasattr(self, 'project_panel') and self.project_panel:
-            self.project_panel.refresh()
+        # Group names in the project panel follow the manager's change events
+        pass
 
 
 def main():
     """Main entry point"""
-    app = MainApplication()
+    profile_startup = PROFILE_STARTUP or "--profile-startup" in sys.argv[1:]
+    instrument = INSTRUMENT or "--instrument" in sys.argv[1:]
+    app = MainApplication(profile_startup, instrument)
     app.run()
 
 
@@ -0,0 +1,364 @@
+"""
+Folder-tree materialization engine
+
+A structure template is first flattened into a plan of directory, file and
+link steps. Each step is assigned a level so that everything it depends on
+(its parent directory and, for links, the link target) lives in an earlier
+level. Levels are executed in order; the steps within one level are
+independent and run concurrently on a bounded thread pool, which overlaps the
+round trips of network file systems. Link steps of a level are handed to
+the pool in batches of LINK_BATCH_SIZE.
+"""
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+STEP_DIR = "dir"
+STEP_FILE = "file"
+STEP_LINK = "link"
+
+LINK_BATCH_SIZE = 64
+
+# create_link(link path, target path, target is a directory (None if unknown))
+CreateLink = Callable[[str, str, Optional[bool]], None]
+
+
+class MaterializeCancelled(Exception):
+    """Raised by execute_plan when the caller asked to stop"""
+
+
+class PlanStep:
+    """A single filesystem operation in a materialization plan"""
+
+    __slots__ = ("kind", "path", "target", "level", "target_is_dir")
+
+    def __init__(self, kind: str, path: str, target: Optional[str] = None, level: int = 0,
+                 target_is_dir: Optional[bool] = None):
+        self.kind = kind
+        self.path = path
+        self.target = target
+        self.level = level
+        # Known for targets planned in the same plan, None otherwise
+        self.target_is_dir = target_is_dir
+
+    def __repr__(self):
+        if self.target:
+            return f"PlanStep({self.kind}, {self.path!r} -> {self.target!r})"
+        return f"PlanStep({self.kind}, {self.path!r})"
+
+
+class FolderPlan:
+    """Dependency-ordered steps grouped into levels"""
+
+    def __init__(self):
+        self.levels: List[List[PlanStep]] = []
+        self._dir_levels: Dict[str, int] = {}
+        self._file_levels: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return sum(len(level) for level in self.levels)
+
+    def steps(self) -> List[PlanStep]:
+        """Return all steps in execution order"""
+        return [step for level in self.levels for step in level]
+
+    def _add(self, step: PlanStep) -> PlanStep:
+        while len(self.levels) <= step.level:
+            self.levels.append([])
+        self.levels[step.level].append(step)
+        return step
+
+    def _level_of(self, path: str) -> int:
+        return self._dir_levels.get(os.path.normpath(path), -1)
+
+    def add_dir(self, path: str) -> Optional[PlanStep]:
+        """Add a directory below an already planned (or existing) directory"""
+        key = os.path.normpath(path)
+        if key in self._dir_levels:
+            return None
+        level = self._level_of(os.path.dirname(key)) + 1
+        self._dir_levels[key] = level
+        return self._add(PlanStep(STEP_DIR, path, level=level))
+
+    def add_file(self, path: str) -> PlanStep:
+        """Add an empty file"""
+        level = self._level_of(os.path.dirname(path)) + 1
+        self._file_levels[os.path.normpath(path)] = level
+        return self._add(PlanStep(STEP_FILE, path, level=level))
+
+    def add_link(self, path: str, target: str) -> PlanStep:
+        """Add a shortcut at ``path`` pointing to ``target``"""
+        key = os.path.normpath(target)
+        if key in self._dir_levels:
+            target_is_dir = True
+        elif key in self._file_levels:
+            target_is_dir = False
+        else:
+            target_is_dir = None
+        target_level = max(self._level_of(target), self._file_levels.get(key, -1))
+        level = max(self._level_of(os.path.dirname(path)), target_level) + 1
+        return self._add(PlanStep(STEP_LINK, path, target, level=level, target_is_dir=target_is_dir))
+
+
+def _is_auto(item: Dict) -> bool:
+    return item.get("attribute", "manual") == "auto"
+
+
+def has_auto_items(structure: Dict) -> bool:
+    """Check if structure contains any auto items (folders or files)"""
+    if any(_is_auto(item) for item in structure.get("files", [])):
+        return True
+
+    def check_folders(folders):
+        for folder in folders:
+            if _is_auto(folder):
+                return True
+            if "folders" in folder and check_folders(folder["folders"]):
+                return True
+        return False
+
+    return check_folders(structure.get("folders", []))
+
+
+def has_auto_folders(structure: Dict) -> bool:
+    """Check if structure contains auto folders (which need folder links)"""
+    def check_folders(folders):
+        return any(_is_auto(folder) or check_folders(folder.get("folders", [])) for folder in folders)
+
+    return check_folders(structure.get("folders", []))
+
+
+# Roots that template entries are relative to
+ROOT_PARENT = 0
+ROOT_SYNC = 1
+
+
+class CompiledStructure:
+    """Pre-walked form of a structure template
+
+    Compiling walks the nested folder dicts once and keeps:
+
+    - ``has_auto_items``: whether any folder or file is marked "auto"
+    - ``folders`` / ``files``: flattened (relative path, node) lists
+    - ``folder_locations`` / ``file_locations``: name -> location index of
+      the first node with that name (see ``resolve_location``)
+    - the plan entries needed to materialize a project, so building a plan
+      for a new project is a flat loop instead of a recursive walk
+    """
+
+    def __init__(self, structure: Dict):
+        self.structure = structure
+        self.has_auto_items = has_auto_items(structure)
+        self.folders: List[Tuple[str, Dict]] = []
+        self.files: List[Tuple[str, Dict]] = []
+        self.folder_locations: Dict[str, Tuple[int, ...]] = {}
+        self.file_locations: Dict[str, int] = {}
+        # (kind, root, relative path, link target root, link target path)
+        self._legacy_entries: List[Tuple] = []
+        self._sync_entries: List[Tuple] = []
+        self._compile()
+
+    def _compile(self):
+        def walk(folders: List[Dict], rel: str, location: Tuple[int, ...], in_auto: bool, auto_rel: str):
+            for index, item in enumerate(folders):
+                name = item["name"]
+                path = os.path.join(rel, name) if rel else name
+                here = location + (index,)
+                self.folders.append((path, item))
+                self.folder_locations.setdefault(name, here)
+                self._legacy_entries.append((STEP_DIR, ROOT_PARENT, path, None, None))
+
+                if in_auto:
+                    # Everything below an auto folder lives in the sync tree
+                    sync_rel = os.path.join(auto_rel, name)
+                    self._sync_entries.append((STEP_DIR, ROOT_SYNC, sync_rel, None, None))
+                    walk(item.get("folders", []), path, here, True, sync_rel)
+                elif _is_auto(item):
+                    self._sync_entries.append((STEP_DIR, ROOT_SYNC, name, None, None))
+                    self._sync_entries.append((STEP_LINK, ROOT_PARENT, path, ROOT_SYNC, name))
+                    walk(item.get("folders", []), path, here, True, name)
+                else:
+                    self._sync_entries.append((STEP_DIR, ROOT_PARENT, path, None, None))
+                    walk(item.get("folders", []), path, here, False, "")
+
+        walk(self.structure.get("folders", []), "", (), False, "")
+
+        for index, item in enumerate(self.structure.get("files", [])):
+            name = item["name"]
+            self.files.append((name, item))
+            self.file_locations.setdefault(name, index)
+            self._legacy_entries.append((STEP_FILE, ROOT_PARENT, name, None, None))
+            if _is_auto(item):
+                self._sync_entries.append((STEP_FILE, ROOT_SYNC, name, None, None))
+                self._sync_entries.append((STEP_LINK, ROOT_PARENT, name, ROOT_SYNC, name))
+            else:
+                self._sync_entries.append((STEP_FILE, ROOT_PARENT, name, None, None))
+
+    def uses_sync(self, parent_path: str, sync_path: Optional[str]) -> bool:
+        """Whether auto items of a project go to a separate sync tree"""
+        if not sync_path or os.path.normpath(sync_path) == os.path.normpath(parent_path):
+            return False
+        return self.has_auto_items
+
+    def entries(self, use_sync: bool) -> List[Tuple]:
+        """Plan entries relative to the project roots
+
+        Each entry is (kind, root, relative path, link target root, link
+        target path) with roots ROOT_PARENT / ROOT_SYNC; the project root
+        directories themselves are not included.
+        """
+        return self._sync_entries if use_sync else self._legacy_entries
+
+    def build_plan(self, parent_path: str, sync_path: Optional[str] = None) -> FolderPlan:
+        """Build the materialization plan for one project
+
+        Manual items are created under ``parent_path``. When a distinct
+        ``sync_path`` is given and the template has auto items, auto folders
+        and files are created under ``sync_path`` with a shortcut in their
+        place under ``parent_path``. Everything below an auto folder already
+        lives in the sync tree and is created there directly.
+        """
+        plan = FolderPlan()
+        use_sync = self.uses_sync(parent_path, sync_path)
+
+        plan.add_dir(parent_path)
+        if use_sync:
+            plan.add_dir(sync_path)
+        roots = (parent_path, sync_path)
+
+        for kind, root, rel, target_root, target_rel in self.entries(use_sync):
+            path = os.path.join(roots[root], rel)
+            if kind == STEP_DIR:
+                plan.add_dir(path)
+            elif kind == STEP_FILE:
+                plan.add_file(path)
+            else:
+                plan.add_link(path, os.path.join(roots[target_root], target_rel))
+        return plan
+
+
+def resolve_location(structure: Dict, location) -> Tuple[List[Dict], int]:
+    """Return (containing list, index) for a location from CompiledStructure
+
+    Folder locations are tuples of indices into nested "folders" lists, file
+    locations are indices into the top-level "files" list.
+    """
+    if isinstance(location, int):
+        return structure["files"], location
+    container = structure["folders"]
+    for index in location[:-1]:
+        container = container[index]["folders"]
+    return container, location[-1]
+
+
+def build_plan(structure: Dict, parent_path: str, sync_path: Optional[str] = None) -> FolderPlan:
+    """Flatten a structure template into a materialization plan"""
+    return CompiledStructure(structure).build_plan(parent_path, sync_path)
+
+
+def run_step(step: PlanStep, create_link: CreateLink):
+    """Execute a single plan step"""
+    if step.kind == STEP_DIR:
+        os.makedirs(step.path, exist_ok=True)
+    elif step.kind == STEP_FILE:
+        with open(step.path, "w", encoding="utf-8"):
+            pass
+    elif step.kind == STEP_LINK:
+        create_link(step.path, step.target, step.target_is_dir)
+
+
+def execute_plan(plan: FolderPlan, create_link: CreateLink, max_workers: int = 1,
+                 progress: Optional[Callable[[int, int], None]] = None,
+                 cancelled: Optional[Callable[[], bool]] = None):
+    """Execute a plan level by level
+
+    Steps within a level run concurrently on up to ``max_workers`` threads;
+    ``max_workers <= 1`` runs everything serially on the calling thread. The
+    first error of a level is raised once that level has finished.
+
+    ``progress(done, total)`` is called after every step. When ``cancelled()``
+    returns True, no further steps are started and MaterializeCancelled is
+    raised; steps already executed are not undone.
+    """
+    total = len(plan)
+    done = [0]
+    lock = threading.Lock()
+
+    def run(step: PlanStep):
+        if cancelled is not None and cancelled():
+            raise MaterializeCancelled()
+        run_step(step, create_link)
+        if progress is not None:
+            with lock:
+                done[0] += 1
+                count = done[0]
+            progress(count, total)
+
+    def run_batch(steps: List[PlanStep]):
+        for step in steps:
+            run(step)
+
+    if max_workers <= 1:
+        run_batch(plan.steps())
+        return
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="materialize") as pool:
+        for level in plan.levels:
+            if len(level) == 1:
+                run(level[0])
+                continue
+            links = [step for step in level if step.kind == STEP_LINK]
+            futures = [pool.submit(run, step) for step in level if step.kind != STEP_LINK]
+            futures += [
+                pool.submit(run_batch, links[start:start + LINK_BATCH_SIZE])
+                for start in range(0, len(links), LINK_BATCH_SIZE)
+            ]
+            errors = [f.exception() for f in futures if f.exception() is not None]
+            if errors:
+                raise errors[0]
+
+
+async def execute_plan_async(plan: FolderPlan, create_link: CreateLink, concurrency: int = 8,
+                             executor=None, progress: Optional[Callable[[int, int], None]] = None,
+                             cancelled: Optional[Callable[[], bool]] = None):
+    """Asyncio variant of execute_plan
+
+    Every step is a blocking filesystem call handed to ``executor`` (a
+    private thread pool of ``concurrency`` threads by default); an
+    asyncio.Semaphore keeps at most ``concurrency`` of them in flight. Levels
+    still run in order. On high-latency shares this overlaps the round trips
+    of all steps in a level while the event loop stays free for other work.
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    own_executor = executor is None
+    if own_executor:
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="materialize-async")
+
+    total = len(plan)
+    done = 0
+
+    async def run(step: PlanStep):
+        nonlocal done
+        async with semaphore:
+            if cancelled is not None and cancelled():
+                raise MaterializeCancelled()
+            await loop.run_in_executor(executor, run_step, step, create_link)
+        done += 1
+        if progress is not None:
+            progress(done, total)
+
+    try:
+        for level in plan.levels:
+            results = await asyncio.gather(*(run(step) for step in level), return_exceptions=True)
+            errors = [result for result in results if isinstance(result, BaseException)]
+            if errors:
+                raise errors[0]
+    finally:
+        if own_executor:
+            executor.shutdown(wait=False)
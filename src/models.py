@@ -3,17 +3,41 @@ Project data model and business logic
 """
 import os
 import json
+import copy
 import datetime
-from typing import List, Dict, Optional
-from .config import STRUCTURE_JSON, PROJECT_LISTS_FILE, STATUS_ACTIVE, PROGRAM_ROOT, PROJECT_GROUPS_FILE
+from typing import Iterator, List, Dict, Optional, Set
+from .config import (
+    STRUCTURE_JSON, PROJECT_LISTS_FILE, STATUS_ACTIVE, STATUS_INACTIVE, PROGRAM_ROOT, PROJECT_GROUPS_FILE,
+    STORAGE_BACKEND, STORAGE_JSON, STORAGE_JOURNAL, STORAGE_SQLITE, JOURNAL_COMPACT_THRESHOLD,
+    PROJECT_DB_FILE, DEFAULT_MAX_WORKERS, ARCHIVE_DIRNAME
+)
+from .materializer import CompiledStructure, execute_plan, execute_plan_async, has_auto_items, has_auto_folders
+from .links import LinkMaker, LinkStrategy, LINK_STRATEGY_AUTO, choose_strategy
+from .events import (
+    ChangeEvent, ChangeNotifier, EVENT_ADDED, EVENT_UPDATED, EVENT_REMOVED, EVENT_RESET,
+    ENTITY_PROJECT, ENTITY_GROUP, ENTITY_FOLDER, ENTITY_FILE, ENTITY_STRUCTURE
+)
+from .group_index import GroupIndex
+from .storage import (
+    JsonRepository, JournalRepository, SQLiteRepository, open_sqlite, migrate_json_to_sqlite,
+    default_writer
+)
 import sys
 import shutil
 import tempfile
+import threading
+
+
+def _shared(value):
+    """Intern repeated strings (status, dates) so records loaded from disk share them"""
+    return sys.intern(value) if isinstance(value, str) else value
 
 
 class ProjectGroup:
     """Represents a project group"""
     
+    __slots__ = ("id", "name", "description", "status")
+    
     def __init__(self, id: int, name: str, description: str = "", status: str = STATUS_ACTIVE):
         self.id = id
         self.name = name
@@ -34,15 +58,42 @@ class ProjectGroup:
             id=data.get("id", 0),
             name=data.get("name", ""),
             description=data.get("description", ""),
-            status=data.get("status", STATUS_ACTIVE)
+            status=_shared(data.get("status", STATUS_ACTIVE))
         )
 
 
+# Project names become folder names under the parent directory; these are
+# refused so a name cannot point outside it or create a folder Windows rejects
+RESERVED_NAME_CHARS = set('<>:"/\\|?*')
+RESERVED_NAMES = {"CON", "PRN", "AUX", "NUL"} | {f"{prefix}{n}" for prefix in ("COM", "LPT") for n in range(1, 10)}
+
+
+def folder_name_error(name: str) -> Optional[str]:
+    """Reason a project name cannot be used as a folder name, or None"""
+    if name in (".", "..") or ".." in name.replace("\\", "/").split("/"):
+        return "Project name cannot contain '..'"
+    bad = sorted({char for char in name if char in RESERVED_NAME_CHARS or ord(char) < 32})
+    if bad:
+        return f"Project name cannot contain {', '.join(repr(char) for char in bad)}"
+    if name.split(".")[0].upper() in RESERVED_NAMES:
+        return f"'{name}' is a reserved name on Windows"
+    if name.endswith((".", " ")):
+        return "Project name cannot end with a dot or space"
+    return None
+
+
 class Project:
-    """Represents a project with metadata"""
+    """Represents a project with metadata
+    
+    Slotted: with 100k projects in memory a per-instance __dict__ would
+    roughly double the footprint (see benchmarks/memory_footprint.py).
+    """
+    
+    __slots__ = ("id", "name", "description", "status", "start_date", "end_date", "group_id", "archive_path")
     
     def __init__(self, id: int, name: str, description: str = "", 
-                 status: str = STATUS_ACTIVE, start_date: str = "", end_date: str = "", group_id: int = 0):
+                 status: str = STATUS_ACTIVE, start_date: str = "", end_date: str = "", group_id: int = 0,
+                 archive_path: str = ""):
         self.id = id
         self.name = name
         self.description = description
@@ -50,6 +101,8 @@ class Project:
         self.start_date = start_date or datetime.date.today().isoformat()
         self.end_date = end_date
         self.group_id = group_id
+        # Set while the project's folders are packed away (see archive.py)
+        self.archive_path = archive_path
     
     def to_dict(self) -> Dict:
         return {
@@ -59,7 +112,8 @@ class Project:
             "status": self.status,
             "start_date": self.start_date,
             "end_date": self.end_date,
-            "group_id": self.group_id
+            "group_id": self.group_id,
+            "archive_path": self.archive_path
         }
     
     @classmethod
@@ -68,18 +122,96 @@ class Project:
             id=data.get("id", 0),
             name=data.get("name", ""),
             description=data.get("description", ""),
-            status=data.get("status", STATUS_ACTIVE),
-            start_date=data.get("start_date", ""),
-            end_date=data.get("end_date", ""),
-            group_id=data.get("group_id", 0)
+            status=_shared(data.get("status", STATUS_ACTIVE)),
+            start_date=_shared(data.get("start_date", "")),
+            end_date=_shared(data.get("end_date", "")),
+            group_id=data.get("group_id", 0),
+            archive_path=data.get("archive_path") or ""
         )
 
 
-class ProjectManager:
-    """Manages project data and operations"""
+# SQLite table layouts (column name, SQL type) for the sqlite backend
+PROJECT_COLUMNS = [
+    ("id", "INTEGER PRIMARY KEY"),
+    ("name", "TEXT NOT NULL"),
+    ("description", "TEXT"),
+    ("status", "TEXT"),
+    ("start_date", "TEXT"),
+    ("end_date", "TEXT"),
+    ("group_id", "INTEGER"),
+    ("archive_path", "TEXT"),
+]
+GROUP_COLUMNS = [
+    ("id", "INTEGER PRIMARY KEY"),
+    ("name", "TEXT NOT NULL"),
+    ("description", "TEXT"),
+    ("status", "TEXT"),
+]
+
+
+class ProjectManager(ChangeNotifier):
+    """Manages project data and operations
     
-    def __init__(self):
+    Every mutation is reported to subscribers as a batch of ChangeEvents
+    (see events.py).
+    """
+    
+    def __init__(self, backend: str = STORAGE_BACKEND):
+        super().__init__()
+        self.backend = backend
         self._ensure_project_lists_file()
+        if backend == STORAGE_SQLITE:
+            self._open_database()
+        else:
+            self._projects = self._create_repository(PROJECT_LISTS_FILE, Project.from_dict)
+            self._groups = self._create_repository(PROJECT_GROUPS_FILE, ProjectGroup.from_dict)
+        # SQLite answers group queries itself and sees other processes' writes
+        self._group_index = GroupIndex(self._projects) if self.backend != STORAGE_SQLITE else None
+    
+    def _emit(self, events: List[ChangeEvent]):
+        """Update the group index before any listener sees the change"""
+        if self._group_index is not None:
+            self._group_index.apply(events)
+        super()._emit(events)
+    
+    def _open_database(self, db_path: Optional[str] = None):
+        """Open the SQLite registry, migrating the JSON files on first use"""
+        # Paths are looked up at call time so tools and benchmarks can point
+        # the module at another registry
+        db_path = db_path or PROJECT_DB_FILE
+        is_new = not os.path.exists(db_path)
+        self._connection = open_sqlite(db_path)
+        lock = threading.Lock()
+        self._projects = SQLiteRepository(
+            self._connection, lock, "projects", PROJECT_COLUMNS, Project.from_dict,
+            indexes=("name", "group_id", "status")
+        )
+        self._groups = SQLiteRepository(
+            self._connection, lock, "groups", GROUP_COLUMNS, ProjectGroup.from_dict,
+            indexes=("name", "status")
+        )
+        if is_new:
+            self.migrate_from_json()
+    
+    def migrate_from_json(self, projects_file: Optional[str] = None,
+                          groups_file: Optional[str] = None) -> Dict[str, int]:
+        """One-shot import of the JSON project and group files into SQLite"""
+        if self.backend != STORAGE_SQLITE:
+            raise ValueError("Migration requires the sqlite storage backend")
+        projects_file = projects_file or PROJECT_LISTS_FILE
+        groups_file = groups_file or PROJECT_GROUPS_FILE
+        return {
+            "projects": migrate_json_to_sqlite(projects_file, self._projects, Project.from_dict),
+            "groups": migrate_json_to_sqlite(groups_file, self._groups, ProjectGroup.from_dict),
+        }
+    
+    def _create_repository(self, path: str, from_dict):
+        """Create the repository for the configured storage backend"""
+        if self.backend == STORAGE_JOURNAL:
+            return JournalRepository(path, from_dict, compact_threshold=JOURNAL_COMPACT_THRESHOLD)
+        if self.backend == STORAGE_JSON:
+            return JsonRepository(path, from_dict)
+        raise ValueError(f"Unknown storage backend '{self.backend}'")
     
     def _ensure_project_lists_file(self):
         """Ensure project lists file exists, copy from bundle if needed"""
@@ -96,138 +228,244 @@ class ProjectManager:
             except Exception:
                 pass
     
+    def preload(self):
+        """Read projects and groups into memory (safe to call from a worker thread)"""
+        self._projects.count()
+        self._groups.count()
+    
     def load_projects(self) -> List[Project]:
-        """Load all projects from file"""
-        if os.path.exists(PROJECT_LISTS_FILE):
-            try:
-                with open(PROJECT_LISTS_FILE, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    return [Project.from_dict(proj_data) for proj_data in data]
-            except Exception:
-                pass
-        return []
+        """Load all projects (served from the in-memory repository)"""
+        return self._projects.all()
+    
+    def scan_projects(self, group_id: Optional[int] = None, status: Optional[str] = None) -> Iterator[Project]:
+        """Yield the projects of a group and/or status one at a time
+        
+        Until the list has been loaded (load_projects, preload or any change)
+        the file is streamed instead, so one-off queries never hold the whole
+        list in memory.
+        """
+        return self._projects.scan(self._project_filter(group_id, status))
+    
+    def count_projects(self, group_id: Optional[int] = None, status: Optional[str] = None) -> int:
+        """Count the projects of a group and/or status (streams like scan_projects)"""
+        return self._projects.count(self._project_filter(group_id, status))
+    
+    @staticmethod
+    def _project_filter(group_id: Optional[int], status: Optional[str]) -> Dict:
+        where = {}
+        if group_id is not None:
+            where["group_id"] = group_id
+        if status is not None:
+            where["status"] = status
+        return where
     
     def save_projects(self, projects: List[Project]):
-        """Save projects to file"""
-        data = [proj.to_dict() for proj in projects]
-        with open(PROJECT_LISTS_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        """Save projects to file, replacing the whole list"""
+        self._projects.replace_all(projects)
+        self._emit_one(EVENT_RESET, ENTITY_PROJECT)
+    
+    def get_project(self, project_id: int) -> Optional[Project]:
+        """Get a project by its ID"""
+        return self._projects.get(project_id)
     
-    def get_next_id(self, projects: List[Project]) -> int:
+    def get_next_id(self, projects: Optional[List[Project]] = None) -> int:
         """Get next available project ID"""
+        if projects is None:
+            return self._projects.next_id()
         if not projects:
             return 1
         return max(proj.id for proj in projects) + 1
     
     def add_project(self, name: str, description: str = "", status: str = STATUS_ACTIVE, group_id: int = 0) -> Project:
         """Add a new project"""
-        projects = self.load_projects()
-        
         # Check for duplicate names
-        if any(proj.name == name for proj in projects):
+        if self._projects.find_by_name(name) is not None:
             raise ValueError(f"Project '{name}' already exists")
         
         new_project = Project(
-            id=self.get_next_id(projects),
+            id=self._projects.next_id(),
             name=name,
             description=description,
             status=status,
             group_id=group_id
         )
         
-        projects.append(new_project)
-        self.save_projects(projects)
+        self._projects.add(new_project)
+        self._emit_one(EVENT_ADDED, ENTITY_PROJECT, new_project.id, new_project)
         return new_project
     
+    def get_project_by_name(self, name: str) -> Optional[Project]:
+        """Get a project by its name"""
+        return self._projects.find_by_name(name)
+    
+    def add_projects(self, projects: List[Project]) -> List[Project]:
+        """Add several projects with a single save
+        
+        IDs are assigned in order; the whole batch is rejected if any name is
+        already taken or repeated within the batch.
+        """
+        seen = set()
+        for project in projects:
+            if project.name in seen or self._projects.find_by_name(project.name) is not None:
+                raise ValueError(f"Project '{project.name}' already exists")
+            seen.add(project.name)
+        
+        next_id = self._projects.next_id()
+        for offset, project in enumerate(projects):
+            project.id = next_id + offset
+        
+        self._projects.add_many(projects)
+        self._emit([ChangeEvent(EVENT_ADDED, ENTITY_PROJECT, p.id, p) for p in projects])
+        return projects
+    
     def update_project(self, project: Project):
         """Update an existing project"""
-        projects = self.load_projects()
-        for i, proj in enumerate(projects):
-            if proj.id == project.id:
-                projects[i] = project
-                self.save_projects(projects)
-                return
-        raise ValueError(f"Project with ID {project.id} not found")
+        if not self._projects.update(project):
+            raise ValueError(f"Project with ID {project.id} not found")
+        self._emit_one(EVENT_UPDATED, ENTITY_PROJECT, project.id, project)
+    
+    def update_projects(self, projects: List[Project]):
+        """Update several existing projects with a single save"""
+        updated = self._projects.update_many(projects)
+        self._emit([ChangeEvent(EVENT_UPDATED, ENTITY_PROJECT, p.id, p) for p in updated])
+        if len(updated) != len(projects):
+            known = {project.id for project in updated}
+            missing = [str(project.id) for project in projects if project.id not in known]
+            raise ValueError(f"Project(s) with ID {', '.join(missing)} not found")
     
     def delete_project(self, project_id: int):
         """Delete a project"""
-        projects = self.load_projects()
-        projects = [proj for proj in projects if proj.id != project_id]
-        self.save_projects(projects)
+        removed = self._projects.remove(project_id)
+        if removed is not None:
+            self._emit_one(EVENT_REMOVED, ENTITY_PROJECT, project_id, removed)
+    
+    def reload(self):
+        """Discard the in-memory state and re-read projects and groups from disk"""
+        self._projects.reload()
+        self._groups.reload()
+        self._emit([ChangeEvent(EVENT_RESET, ENTITY_GROUP), ChangeEvent(EVENT_RESET, ENTITY_PROJECT)])
+    
+    def flush(self):
+        """Fold any pending journal entries into the JSON files"""
+        for repository in (self._projects, self._groups):
+            if isinstance(repository, JournalRepository):
+                repository.compact()
     
     def load_groups(self) -> List[ProjectGroup]:
-        """Load all project groups from file"""
-        if os.path.exists(PROJECT_GROUPS_FILE):
-            try:
-                with open(PROJECT_GROUPS_FILE, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    return [ProjectGroup.from_dict(group_data) for group_data in data]
-            except Exception:
-                pass
-        return []
+        """Load all project groups (served from the in-memory repository)"""
+        return self._groups.all()
     
     def save_groups(self, groups: List[ProjectGroup]):
-        """Save project groups to file"""
-        data = [group.to_dict() for group in groups]
-        with open(PROJECT_GROUPS_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        """Save project groups to file, replacing the whole list"""
+        self._groups.replace_all(groups)
+        self._emit_one(EVENT_RESET, ENTITY_GROUP)
     
-    def get_next_group_id(self, groups: List[ProjectGroup]) -> int:
+    def get_next_group_id(self, groups: Optional[List[ProjectGroup]] = None) -> int:
         """Get next available group ID"""
+        if groups is None:
+            return self._groups.next_id()
         if not groups:
             return 1
         return max(group.id for group in groups) + 1
     
     def add_group(self, name: str, description: str = "", status: str = STATUS_ACTIVE) -> ProjectGroup:
         """Add a new project group"""
-        groups = self.load_groups()
-        
         # Check for duplicate names
-        if any(group.name == name for group in groups):
+        if self._groups.find_by_name(name) is not None:
             raise ValueError(f"Group '{name}' already exists")
         
         new_group = ProjectGroup(
-            id=self.get_next_group_id(groups),
+            id=self._groups.next_id(),
             name=name,
             description=description,
             status=status
         )
         
-        groups.append(new_group)
-        self.save_groups(groups)
+        self._groups.add(new_group)
+        self._emit_one(EVENT_ADDED, ENTITY_GROUP, new_group.id, new_group)
         return new_group
     
     def update_group(self, group_id: int, name: str, description: str, status: str):
         """Update an existing project group"""
-        groups = self.load_groups()
-        for group in groups:
-            if group.id == group_id:
-                group.name = name
-                group.description = description
-                group.status = status
-                break
-        self.save_groups(groups)
+        if self._groups.get(group_id) is None:
+            return
+        group = ProjectGroup(id=group_id, name=name, description=description, status=status)
+        self._groups.update(group)
+        self._emit_one(EVENT_UPDATED, ENTITY_GROUP, group_id, group)
     
     def delete_group(self, group_id: int):
         """Delete a project group"""
-        groups = self.load_groups()
-        groups = [g for g in groups if g.id != group_id]
-        self.save_groups(groups)
+        removed = self._groups.remove(group_id)
+        if removed is not None:
+            self._emit_one(EVENT_REMOVED, ENTITY_GROUP, group_id, removed)
     
     def get_group_by_id(self, group_id: int) -> Optional[ProjectGroup]:
         """Get a group by its ID"""
-        groups = self.load_groups()
-        for group in groups:
-            if group.id == group_id:
-                return group
-        return None
+        return self._groups.get(group_id)
+    
+    def get_group_project_ids(self, group_id: int) -> Set[int]:
+        """IDs of the projects in a group (0 for ungrouped), from the group index"""
+        if self._group_index is None:
+            return self._projects.ids({"group_id": group_id})
+        return self._group_index.project_ids(group_id)
+    
+    def get_projects_in_group(self, group_id: int) -> List[Project]:
+        """Projects of a group, ordered by ID"""
+        if self._group_index is None:
+            return list(self._projects.scan({"group_id": group_id}))
+        projects = (self._projects.get(project_id) for project_id in sorted(self.get_group_project_ids(group_id)))
+        return [project for project in projects if project is not None]
+    
+    def get_group_counts(self, group_id: Optional[int] = None) -> Dict:
+        """Project counts by status for a group, or {group id: counts} for all groups"""
+        if self._group_index is not None:
+            return self._group_index.counts(group_id)
+        where = {"group_id": group_id} if group_id is not None else None
+        counts = {}
+        for (group, status), count in self._projects.count_by(("group_id", "status"), where).items():
+            counts.setdefault(group, {})[status] = count
+        if group_id is not None:
+            return counts.get(group_id, {})
+        return counts
+    
+    def set_group_project_status(self, group_id: int, status: str) -> List[Project]:
+        """Set the status of every project in a group with a single save
+        
+        Same date rules as editing one project: projects made inactive get
+        today as end date (unless they have one), active projects have none.
+        Returns the projects that changed.
+        """
+        today = datetime.date.today().isoformat()
+        changed = []
+        for project in self.get_projects_in_group(group_id):
+            if project.status == status:
+                continue
+            end_date = (project.end_date or today) if status == STATUS_INACTIVE else ""
+            changed.append(Project(
+                id=project.id, name=project.name, description=project.description, status=status,
+                start_date=project.start_date, end_date=end_date, group_id=project.group_id,
+                archive_path=project.archive_path
+            ))
+        if changed:
+            self.update_projects(changed)
+        return changed
 
 
-class StructureManager:
-    """Manages folder structure templates"""
+class StructureManager(ChangeNotifier):
+    """Manages folder structure templates
+    
+    Saving the template notifies subscribers with one ChangeEvent per added,
+    updated or removed folder/file (see events.py).
+    """
     
     def __init__(self):
+        super().__init__()
         self._ensure_structure_file()
+        self._structure: Optional[Dict] = None
+        self._structure_signature = None
+        self._compiled: Optional[CompiledStructure] = None
+        self._link_strategies: Dict[tuple, LinkStrategy] = {}
+        self._link_lock = threading.Lock()
     
     def _ensure_structure_file(self):
         """Ensure structure file exists, copy from bundle if needed"""
@@ -259,154 +497,190 @@ class StructureManager:
                 return
             raise ValueError(f"Structure file '{STRUCTURE_JSON}' is empty")
     
+    def _file_signature(self):
+        st = os.stat(STRUCTURE_JSON)
+        return (st.st_mtime_ns, st.st_size)
+    
+    def get_cached_structure(self) -> Dict:
+        """Get the parsed structure template without copying it
+        
+        The template is parsed once and re-read only when the file's mtime or
+        size changes. The returned dict is shared and must not be modified;
+        use load_structure() for a private copy to edit.
+        """
+        signature = self._file_signature()
+        if self._structure is None or signature != self._structure_signature:
+            with open(STRUCTURE_JSON, encoding="utf-8") as f:
+                self._structure = json.load(f)
+            self._structure_signature = signature
+            self._compiled = None
+        return self._structure
+    
+    def get_compiled(self) -> CompiledStructure:
+        """Get the compiled (pre-walked) form of the current template"""
+        structure = self.get_cached_structure()
+        if self._compiled is None:
+            self._compiled = CompiledStructure(structure)
+        return self._compiled
+    
     def load_structure(self) -> Dict:
-        """Load folder structure template"""
-        with open(STRUCTURE_JSON, encoding="utf-8") as f:
-            return json.load(f)
+        """Load folder structure template (a private copy that may be edited)"""
+        return copy.deepcopy(self.get_cached_structure())
     
     def save_structure(self, structure: Dict):
         """Save folder structure template"""
-        with open(STRUCTURE_JSON, "w", encoding="utf-8") as f:
-            json.dump(structure, f, indent=4, ensure_ascii=False)
+        default_writer().write_json(STRUCTURE_JSON, structure, indent=4)
+        previous = None
+        if self._listeners and self._structure is not None:
+            previous = self._compiled or CompiledStructure(self._structure)
+        self._structure = copy.deepcopy(structure)
+        self._structure_signature = self._file_signature()
+        self._compiled = None
+        if self._listeners:
+            self._emit(self._structure_events(previous, self.get_compiled()))
     
-    def create_project_folders(self, parent_path: str, structure: Dict, sync_path: str = None):
-        """Create project folder structure with sync/manual/auto logic"""
+    @staticmethod
+    def _structure_events(old: Optional[CompiledStructure], new: CompiledStructure) -> List[ChangeEvent]:
+        """Diff two compiled templates into folder/file change events
         
-        if not sync_path or os.path.normpath(sync_path) == os.path.normpath(parent_path):
-            # Legacy behavior: create everything in parent_path
-            os.makedirs(parent_path, exist_ok=True)
-            self._create_items(parent_path, structure.get("folders", []))
-            for file_item in structure.get("files", []):
-                file_path = os.path.join(parent_path, file_item["name"])
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write("")
-            return
-
-        # Check if there are any auto items
-        has_auto_items = self._has_auto_items(structure)
+        Folders are keyed by their relative path and files by name, so a
+        rename shows up as a removal plus an addition. Added items are listed
+        in preorder, parents before their children.
+        """
+        if old is None:
+            return [ChangeEvent(EVENT_RESET, ENTITY_STRUCTURE)]
         
-        # Always create parent directory
-        os.makedirs(parent_path, exist_ok=True)
+        def fields(node: Dict) -> Dict:
+            return {key: value for key, value in node.items() if key != "folders"}
         
-        # Only create sync directory if there are auto items
-        if has_auto_items:
-            os.makedirs(sync_path, exist_ok=True)
+        events = []
+        for entity, old_items, new_items in ((ENTITY_FOLDER, old.folders, new.folders),
+                                             (ENTITY_FILE, old.files, new.files)):
+            before, after = dict(old_items), dict(new_items)
+            if len(before) != len(old_items) or len(after) != len(new_items):
+                # Duplicate names under one parent cannot be keyed; rebuild instead
+                return [ChangeEvent(EVENT_RESET, ENTITY_STRUCTURE)]
+            for path, node in old_items:
+                if path not in after:
+                    events.append(ChangeEvent(EVENT_REMOVED, entity, path, node))
+            for path, node in new_items:
+                if path not in before:
+                    events.append(ChangeEvent(EVENT_ADDED, entity, path, node))
+                elif fields(node) != fields(before[path]):
+                    events.append(ChangeEvent(EVENT_UPDATED, entity, path, node))
         
-        # Place auto items in sync_path, manual items in parent_path
-        self._create_items_sync(parent_path, sync_path if has_auto_items else None, structure.get("folders", []))
-        self._create_files_sync(parent_path, sync_path if has_auto_items else None, structure.get("files", []))
-
-    def _has_auto_items(self, structure: Dict) -> bool:
-        """Check if structure contains any auto items (folders or files)"""
-        # Check files
-        for file_item in structure.get("files", []):
-            if file_item.get("attribute", "manual") == "auto":
-                return True
+        old_settings = {k: v for k, v in old.structure.items() if k not in ("folders", "files")}
+        new_settings = {k: v for k, v in new.structure.items() if k not in ("folders", "files")}
+        if old_settings != new_settings:
+            events.append(ChangeEvent(EVENT_UPDATED, ENTITY_STRUCTURE, None, new_settings))
+        return events
+    
+    def get_max_workers(self, structure: Optional[Dict] = None) -> int:
+        """Get the number of worker threads used to create project folders"""
+        if structure is None:
+            try:
+                structure = self.get_cached_structure()
+            except Exception:
+                return DEFAULT_MAX_WORKERS
+        try:
+            return max(1, int(structure.get("max_workers", DEFAULT_MAX_WORKERS)))
+        except (TypeError, ValueError):
+            return DEFAULT_MAX_WORKERS
+    
+    def create_project_folders(self, parent_path: str, structure: Optional[Dict] = None, sync_path: str = None,
+                               max_workers: Optional[int] = None, progress=None, cancelled=None):
+        """Create project folder structure with sync/manual/auto logic
         
-        # Check folders recursively
-        def check_folders(folders):
-            for folder in folders:
-                if folder.get("attribute", "manual") == "auto":
-                    return True
-                if "folders" in folder and check_folders(folder["folders"]):
-                    return True
-            return False
+        The template (the cached one unless ``structure`` is given) is
+        flattened into a dependency-ordered plan whose levels are created
+        concurrently (see materializer.py). ``progress`` and ``cancelled`` are
+        passed through to execute_plan. Returns the run's LinkMaker (see
+        execute_plan).
+        """
+        if structure is None:
+            compiled = self.get_compiled()
+        else:
+            compiled = CompiledStructure(structure)
+        plan = compiled.build_plan(parent_path, sync_path)
+        if max_workers is None:
+            max_workers = self.get_max_workers(compiled.structure)
+        return self.execute_plan(plan, max_workers, progress=progress, cancelled=cancelled,
+                                 links=self.link_maker(compiled.structure))
+    
+    def execute_plan(self, plan, max_workers: Optional[int] = None, progress=None, cancelled=None,
+                     links: Optional[LinkMaker] = None) -> LinkMaker:
+        """Execute a materialization plan with this manager's link strategy
         
-        return check_folders(structure.get("folders", []))
+        Returns the LinkMaker; shortcuts that could not be created are listed
+        in its ``failures`` (a text stub was written in their place).
+        """
+        if max_workers is None:
+            max_workers = self.get_max_workers()
+        if links is None:
+            links = self.link_maker()
+        execute_plan(plan, links, max_workers, progress=progress, cancelled=cancelled)
+        return links
 
-    def _create_items_sync(self, parent_path, sync_path, items):
-        for item in items:
-            sync_mode = item.get("attribute", "manual")
-            folder_name = item["name"]
-            if sync_mode == "auto" and sync_path:
-                # Create folder in sync directory
-                sync_folder = os.path.join(sync_path, folder_name)
-                os.makedirs(sync_folder, exist_ok=True)
-                # Create shortcut/symlink in parent directory
-                link_path = os.path.join(parent_path, folder_name)
-                self._create_shortcut(link_path, sync_folder)
-                # Recurse into subfolders (create subfolders in sync directory)
-                if "folders" in item:
-                    self._create_items_sync(sync_folder, sync_folder, item["folders"])
-            else:
-                # Create folder in parent directory (for manual items or when no sync_path)
-                manual_folder = os.path.join(parent_path, folder_name)
-                os.makedirs(manual_folder, exist_ok=True)
-                # Recurse into subfolders (keep using sync_path for potential auto subfolders)
-                if "folders" in item:
-                    self._create_items_sync(manual_folder, sync_path, item["folders"])
+    async def create_project_folders_async(self, parent_path: str, structure: Optional[Dict] = None,
+                                           sync_path: str = None, concurrency: Optional[int] = None,
+                                           progress=None, cancelled=None):
+        """Asyncio variant of create_project_folders
+        
+        Steps are run through an executor with at most ``concurrency``
+        (default: the template's max_workers) in flight; see
+        materializer.execute_plan_async.
+        """
+        if structure is None:
+            compiled = self.get_compiled()
+        else:
+            compiled = CompiledStructure(structure)
+        plan = compiled.build_plan(parent_path, sync_path)
+        if concurrency is None:
+            concurrency = self.get_max_workers(compiled.structure)
+        links = self.link_maker(compiled.structure)
+        await execute_plan_async(plan, links, concurrency, progress=progress, cancelled=cancelled)
+        return links
 
-    def _create_files_sync(self, parent_path, sync_path, files):
-        for file_item in files:
-            sync_mode = file_item.get("attribute", "manual")
-            file_name = file_item["name"]
-            if sync_mode == "auto" and sync_path:
-                # Create file in sync directory
-                sync_file = os.path.join(sync_path, file_name)
-                with open(sync_file, "w", encoding="utf-8") as f:
-                    f.write("")
-                # Create shortcut/symlink in parent directory
-                link_path = os.path.join(parent_path, file_name)
-                self._create_shortcut(link_path, sync_file)
-            else:
-                # Create file in parent directory (for manual items or when no sync_path)
-                manual_file = os.path.join(parent_path, file_name)
-                with open(manual_file, "w", encoding="utf-8") as f:
-                    f.write("")
+    def _has_auto_items(self, structure: Optional[Dict] = None) -> bool:
+        """Check if structure contains any auto items (folders or files)"""
+        if structure is None:
+            return self.get_compiled().has_auto_items
+        return has_auto_items(structure)
 
-    def _create_shortcut(self, link_path, target_path):
-        """Create a shortcut (.lnk on Windows, symlink on other platforms)"""
-        import sys
-        import os
-        is_windows = sys.platform.startswith("win")
-        try:
-            if is_windows:
-                # Use pywin32 to create Windows .lnk shortcut (works for both files and folders)
-                try:
-                    import win32com.client
-                    shell = win32com.client.Dispatch("WScript.Shell")
-                    shortcut = shell.CreateShortcut(link_path + ".lnk")
-                    shortcut.TargetPath = target_path
-                    # Set working directory to parent directory of target for better behavior
-                    shortcut.WorkingDirectory = os.path.dirname(target_path)
-                    shortcut.Save()
-                except Exception:
-                    # Fallback: create symlink (may work without admin on newer Windows)
-                    if os.path.isdir(target_path):
-                        os.symlink(target_path, link_path, target_is_directory=True)
-                    else:
-                        os.symlink(target_path, link_path)
-            else:
-                # Create symlink on non-Windows platforms
-                if os.path.isdir(target_path):
-                    os.symlink(target_path, link_path, target_is_directory=True)
-                else:
-                    os.symlink(target_path, link_path)
-        except Exception as e:
-            # Fallback: Create a text file indicating the link
+    def get_link_strategy(self, structure: Optional[Dict] = None) -> str:
+        """Get the configured link strategy name ("auto" probes the file systems)"""
+        if structure is None:
             try:
-                with open(link_path + "_link.txt", "w") as f:
-                    f.write(f"Link to: {target_path}\n")
-                    f.write(f"Error creating shortcut: {str(e)}\n")
-                    if is_windows:
-                        f.write("Try installing pywin32: pip install pywin32\n")
-                    else:
-                        f.write("Check file permissions and try again.\n")
-            except:
-                pass
+                structure = self.get_cached_structure()
+            except Exception:
+                return LINK_STRATEGY_AUTO
+        return structure.get("link_strategy", LINK_STRATEGY_AUTO)
     
-    def _create_items(self, base_path: str, items: List[Dict]):
-        """Recursively create folder items"""
-        for item in items:
-            folder_path = os.path.join(base_path, item["name"])
-            os.makedirs(folder_path, exist_ok=True)
-            if "folders" in item:
-                self._create_items(folder_path, item["folders"])
+    def link_maker(self, structure: Optional[Dict] = None) -> LinkMaker:
+        """Create the shortcut maker for one materialization run
+        
+        The strategy is chosen (probed, for "auto") once per parent/sync
+        directory pair (and whether folders must be linkable) and reused for
+        later runs.
+        """
+        name = self.get_link_strategy(structure)
+        try:
+            directories = has_auto_folders(structure if structure is not None else self.get_cached_structure())
+        except Exception:
+            directories = True
+        parent_dir = self.get_parent_directory()
+        sync_dir = self.get_sync_directory()
+        key = (name, parent_dir, sync_dir, directories)
+        with self._link_lock:
+            strategy = self._link_strategies.get(key)
+            if strategy is None:
+                strategy = self._link_strategies[key] = choose_strategy(name, parent_dir, sync_dir, directories)
+        return LinkMaker(strategy)
     
     def get_parent_directory(self) -> str:
         """Get configured parent directory"""
         try:
-            structure = self.load_structure()
+            structure = self.get_cached_structure()
             path = structure.get("parent_directory", PROGRAM_ROOT).strip() or PROGRAM_ROOT
             return os.path.normpath(path)
         except Exception:
@@ -414,14 +688,14 @@ class StructureManager:
     
     def set_parent_directory(self, path: str):
         """Set parent directory"""
-        structure = self.load_structure()
+        structure = dict(self.get_cached_structure())
         structure["parent_directory"] = os.path.normpath(path)
         self.save_structure(structure)
     
     def get_sync_directory(self) -> str:
         """Get configured sync directory"""
         try:
-            structure = self.load_structure()
+            structure = self.get_cached_structure()
             sync_dir = structure.get("sync_directory", "").strip()
             path = sync_dir if sync_dir else PROGRAM_ROOT
             return os.path.normpath(path)
@@ -430,6 +704,17 @@ class StructureManager:
     
     def set_sync_directory(self, path: str):
         """Set sync directory"""
-        structure = self.load_structure()
+        structure = dict(self.get_cached_structure())
         structure["sync_directory"] = os.path.normpath(path)
         self.save_structure(structure)
+    
+    def get_archive_directory(self) -> str:
+        """Get the folder archived projects are written to (see archive.py)"""
+        try:
+            structure = self.get_cached_structure()
+            path = structure.get("archive_directory", "").strip()
+        except Exception:
+            path = ""
+        if not path:
+            path = os.path.join(self.get_parent_directory(), ARCHIVE_DIRNAME)
+        return os.path.normpath(path)
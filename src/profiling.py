@@ -0,0 +1,181 @@
+"""
+Startup timing and hot-path instrumentation
+
+StartupTimer records named checkpoints relative to process start (as far as
+Python can tell: the first import of src.main) and prints them as a small
+table. Enabled with ``--profile-startup`` or PFM_PROFILE_STARTUP=1.
+
+Instrumentation counts calls and keeps a latency histogram per method.
+instrument_class() wraps the methods of a class once; nothing is wrapped (and
+nothing costs anything) unless instrumentation is switched on with
+``--instrument`` or PFM_INSTRUMENT=1. The main window shows the numbers in a
+debug window (Ctrl+Shift+D) that can also dump them to a JSON file.
+"""
+import sys
+import time
+import types
+import functools
+import threading
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple
+from .storage import default_writer
+
+# Upper bounds (ms) of the latency histogram buckets; the last one is open
+HISTOGRAM_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class StartupTimer:
+    """Named checkpoints from launch to the first frame and loaded data"""
+
+    def __init__(self, enabled: bool, start: Optional[float] = None):
+        self.enabled = enabled
+        self.start = time.perf_counter() if start is None else start
+        self.marks: List[Tuple[str, float]] = []
+
+    def mark(self, label: str):
+        if self.enabled:
+            self.marks.append((label, time.perf_counter()))
+
+    def elapsed_ms(self, label: str) -> Optional[float]:
+        for name, at in self.marks:
+            if name == label:
+                return (at - self.start) * 1000
+        return None
+
+    def report(self, stream: TextIO = None):
+        """Print checkpoint times (total and since the previous checkpoint)"""
+        if not self.enabled or not self.marks:
+            return
+        stream = stream or sys.stderr
+        width = max(len(label) for label, _ in self.marks)
+        print("Startup timing (ms):", file=stream)
+        previous = self.start
+        for label, at in self.marks:
+            print(f"  {label.ljust(width)}  {(at - self.start) * 1000:8.1f}  (+{(at - previous) * 1000:.1f})",
+                  file=stream)
+            previous = at
+        stream.flush()
+
+
+class Metric:
+    """Call count, total/min/max time and a latency histogram of one method"""
+
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+
+    def add(self, seconds: float):
+        ms = seconds * 1000
+        self.count += 1
+        self.total += ms
+        self.min = min(self.min, ms)
+        self.max = max(self.max, ms)
+        for i, bound in enumerate(HISTOGRAM_BOUNDS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bucket bound below which ``fraction`` of the calls fall (ms)"""
+        if not self.count:
+            return 0.0
+        wanted = fraction * self.count
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if seen >= wanted:
+                return HISTOGRAM_BOUNDS_MS[i] if i < len(HISTOGRAM_BOUNDS_MS) else self.max
+        return self.max
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "total_ms": self.total,
+            "mean_ms": self.total / self.count if self.count else 0.0,
+            "min_ms": self.min if self.count else 0.0,
+            "max_ms": self.max,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "histogram": {
+                **{f"<={bound}": count for bound, count in zip(HISTOGRAM_BOUNDS_MS, self.buckets)},
+                f">{HISTOGRAM_BOUNDS_MS[-1]}": self.buckets[-1],
+            },
+        }
+
+
+class Instrumentation:
+    """Per-name metrics, shared by all threads"""
+
+    def __init__(self):
+        self.enabled = False
+        self.started = time.time()
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Metric()
+            metric.add(seconds)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Name -> metric dict, busiest (largest total time) first"""
+        with self._lock:
+            items = [(name, metric.to_dict()) for name, metric in self._metrics.items()]
+        return dict(sorted(items, key=lambda item: item[1]["total_ms"], reverse=True))
+
+    def reset(self):
+        with self._lock:
+            self._metrics.clear()
+            self.started = time.time()
+
+    def dump(self, path: str):
+        """Write the snapshot as JSON"""
+        data = {"started": self.started, "dumped": time.time(), "metrics": self.snapshot()}
+        default_writer().write_json(path, data)
+
+
+_instrumentation = Instrumentation()
+
+
+def instrumentation() -> Instrumentation:
+    """Return the process-wide instrumentation"""
+    return _instrumentation
+
+
+def _timed(name: str, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _instrumentation.record(name, time.perf_counter() - start)
+
+    wrapper.__instrumented__ = True
+    return wrapper
+
+
+def instrument_class(cls, names: Optional[Iterable[str]] = None):
+    """Time the methods of ``cls`` (all non-dunder methods when ``names`` is None)
+
+    Does nothing unless instrumentation is enabled; safe to call twice.
+    Methods are recorded as "Class.method" and include the time of nested
+    instrumented calls.
+    """
+    if not _instrumentation.enabled:
+        return
+    if names is None:
+        names = [name for name in vars(cls) if not name.startswith("__")]
+    for name in names:
+        func = vars(cls).get(name)
+        # Plain functions only: properties, static and class methods are left alone
+        if not isinstance(func, types.FunctionType) or getattr(func, "__instrumented__", False):
+            continue
+        setattr(cls, name, _timed(f"{cls.__name__}.{name}", func))
@@ -4,11 +4,35 @@ Project management UI components
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import json
-from typing import List, Optional, Callable
-from .models import Project, ProjectManager, ProjectGroup
-from .ui_utils import DialogManager, ValidationHelper, FormBuilder
-from .config import STATUS_OPTIONS, STATUS_ACTIVE, STATUS_INACTIVE
+from typing import Dict, List, Optional, Callable
+from .models import Project, ProjectManager, ProjectGroup, folder_name_error
+from .bulk_import import BulkImporter
+from .search import ProjectSearchIndex
+from .folder_stats import FolderStatsIndex, format_size
+from .jobs import JobQueue, JOB_DONE, JOB_FAILED
+from .ui_utils import DialogManager, ValidationHelper, FormBuilder, LazyJsonView
+from .events import (
+    ChangeEvent, EVENT_REMOVED, EVENT_RESET, ENTITY_PROJECT, ENTITY_GROUP
+)
+from .config import STATUS_OPTIONS, STATUS_ACTIVE, STATUS_INACTIVE, TREE_PAGE_SIZE, DELTA_REFRESH_LIMIT
 import datetime
+from bisect import bisect_left
+
+COLUMNS = ("ID", "Name", "Description", "Group", "Status", "Start Date", "End Date",
+           "Size", "Files", "Modified")
+STATS_COLUMNS = ("Size", "Files", "Modified")
+
+
+class _Descending:
+    """Sort key wrapper with the order inverted, so descending rows can be bisected"""
+    
+    __slots__ = ("key",)
+    
+    def __init__(self, key):
+        self.key = key
+    
+    def __lt__(self, other: '_Descending') -> bool:
+        return other.key < self.key
 
 
 class ProjectDialog:
@@ -106,6 +130,9 @@ class ProjectDialog:
         name_error = ValidationHelper.validate_required_field(
             self.name_var.get(), "Project name"
         )
+        if not name_error and (not self.project or self.name_var.get().strip() != self.project.name):
+            # The name is also the project's folder name
+            name_error = folder_name_error(self.name_var.get().strip())
         if name_error:
             messagebox.showerror("Error", name_error, parent=self.dialog)
             return
@@ -140,7 +167,8 @@ class ProjectDialog:
                 status=self.status_var.get(),
                 start_date=self.start_date_var.get().strip(),
                 end_date=self.end_date_var.get().strip(),
-                group_id=selected_group_id
+                group_id=selected_group_id,
+                archive_path=self.project.archive_path
             )
         else:
             self.result = Project(
@@ -165,15 +193,120 @@ class ProjectDialog:
         return self.result
 
 
+class BulkImportDialog:
+    """Dialog that validates an import file and previews its projects
+    
+    The import itself runs as a background job started by the caller with
+    the projects in ``valid``; show() only returns the chosen options.
+    """
+    
+    def __init__(self, parent: tk.Widget, importer: BulkImporter, path: str):
+        self.parent = parent
+        self.importer = importer
+        self.path = path
+        # create_folders choice once confirmed, None if cancelled
+        self.result: Optional[bool] = None
+        self.rows = importer.read_file(path)
+        self.valid, self.rejected = importer.validate(self.rows)
+        self._create_dialog()
+    
+    def _create_dialog(self):
+        self.dialog = DialogManager.create_modal_dialog(self.parent, "Bulk Import Projects")
+        
+        tk.Label(
+            self.dialog, text=f"File: {self.path}", anchor="w"
+        ).pack(fill=tk.X, padx=10, pady=(10, 2))
+        tk.Label(
+            self.dialog,
+            text=f"{len(self.valid)} project(s) ready to import, {len(self.rejected)} rejected.",
+            anchor="w"
+        ).pack(fill=tk.X, padx=10, pady=2)
+        
+        # Preview of accepted and rejected rows
+        self.preview = scrolledtext.ScrolledText(self.dialog, wrap=tk.WORD, width=70, height=15)
+        for project in self.valid:
+            self.preview.insert(tk.END, f"+ {project.name}\n")
+        for name, reason in self.rejected:
+            self.preview.insert(tk.END, f"- {name or '<no name>'}: {reason}\n")
+        self.preview.config(state="disabled")
+        self.preview.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        self.create_folders_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(
+            self.dialog, text="Create project folders", variable=self.create_folders_var
+        ).pack(anchor="w", padx=10)
+        
+        btn_frame = tk.Frame(self.dialog)
+        self.import_button = tk.Button(btn_frame, text="Import", command=self._on_import)
+        self.import_button.pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame, text="Cancel", command=self._on_cancel).pack(side=tk.LEFT, padx=5)
+        btn_frame.pack(pady=8)
+        
+        if not self.valid:
+            self.import_button.config(state="disabled")
+        
+        DialogManager.auto_size_and_center(self.dialog, self.parent)
+    
+    def _on_import(self):
+        """Confirm the import of the already validated rows"""
+        self.result = self.create_folders_var.get()
+        self.dialog.destroy()
+    
+    def _on_cancel(self):
+        """Cancel dialog"""
+        self.dialog.destroy()
+    
+    def show(self) -> Optional[bool]:
+        """Show dialog and return whether to create folders, None if cancelled"""
+        self.dialog.wait_window()
+        return self.result
+
+
 class ProjectListPanel:
     """Panel for managing project list"""
     
-    def __init__(self, parent: tk.Widget, project_manager: ProjectManager):
+    def __init__(self, parent: tk.Widget, project_manager: ProjectManager,
+                 stats_index: Optional[FolderStatsIndex] = None, job_queue: Optional[JobQueue] = None,
+                 load: bool = True):
         self.parent = parent
         self.project_manager = project_manager
         self.on_project_changed: Optional[Callable] = None
+        # Folder size columns; totals are refreshed by a background job
+        self.stats_index = stats_index
+        self.job_queue = job_queue
+        self._stats_job = None
+        # Row model behind the virtualized tree: all projects in sort order and
+        # the subset matching the search bar, each with a parallel list of sort
+        # keys so rows are found and placed by bisection
+        self._all_rows: List[Project] = []
+        self._rows: List[Project] = []
+        self._all_keys: List = []
+        self._keys: List = []
+        # Sort key of every row as it was placed; records updated in place are
+        # still found under their old key
+        self._row_keys: Dict[int, object] = {}
+        self._group_names = {}
+        self._materialized = 0
+        self._paging_scheduled = False
+        self._sort_column = "ID"
+        self._sort_reverse = True
+        # Group the list is limited to (see set_group_filter), None for all
+        self._group_filter: Optional[int] = None
+        # Subscribed before the panel so searches see each change first
+        self._search_index = ProjectSearchIndex(project_manager)
         self._create_ui()
-        self.refresh()
+        # With load=False the caller fills the panel later with refresh()
+        if load:
+            self.refresh()
+        # Apply manager change events as row deltas while the panel exists
+        unsubscribe = self.project_manager.subscribe(self._on_model_changed)
+        self.frame.bind("<Destroy>", lambda e: self._detach(unsubscribe) if e.widget is self.frame else None)
+    
+    def _detach(self, unsubscribe: Callable):
+        unsubscribe()
+        self._search_index.close()
+        if self._stats_job is not None:
+            self._stats_job.cancel()
     
     def _create_ui(self):
         """Create the UI components"""
@@ -196,31 +329,47 @@ class ProjectListPanel:
         """Create visual editor tab"""
         self.visual_frame = tk.Frame(self.notebook)
         
-        # Treeview
+        # Search bar: filters rows by name, description, group and status
+        search_frame = tk.Frame(self.visual_frame)
+        tk.Label(search_frame, text="Search:").pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        tk.Entry(search_frame, textvariable=self.search_var, width=30).pack(
+            side=tk.LEFT, fill=tk.X, expand=True, padx=5
+        )
+        tk.Button(search_frame, text="Clear", command=lambda: self.search_var.set("")).pack(side=tk.LEFT)
+        self.match_var = tk.StringVar(value="")
+        tk.Label(search_frame, textvariable=self.match_var, fg="#666666").pack(side=tk.LEFT, padx=(8, 0))
+        # Shown while the list is limited to one group
+        self.group_filter_frame = tk.Frame(search_frame)
+        self.group_filter_var = tk.StringVar(value="")
+        tk.Label(self.group_filter_frame, textvariable=self.group_filter_var, fg="#0055aa").pack(side=tk.LEFT)
+        tk.Button(self.group_filter_frame, text="All Groups",
+                  command=lambda: self.set_group_filter(None)).pack(side=tk.LEFT, padx=(5, 0))
+        search_frame.pack(fill=tk.X, padx=8, pady=(8, 0))
+        
+        # Treeview with scrollbar; rows are materialized a page at a time
+        tree_frame = tk.Frame(self.visual_frame)
         self.tree = ttk.Treeview(
-            self.visual_frame,
-            columns=("ID", "Name", "Description", "Group", "Status", "Start Date", "End Date"),
+            tree_frame,
+            columns=COLUMNS,
             show="headings"
         )
-        
-        # Configure columns
-        self.tree.heading("ID", text="ID")
-        self.tree.heading("Name", text="Name") 
-        self.tree.heading("Description", text="Description")
-        self.tree.heading("Group", text="Group")
-        self.tree.heading("Status", text="Status")
-        self.tree.heading("Start Date", text="Start Date")
-        self.tree.heading("End Date", text="End Date")
-        
-        self.tree.column("ID", width=40, anchor="center")
-        self.tree.column("Name", width=120, anchor="w")
-        self.tree.column("Description", width=180, anchor="w")
-        self.tree.column("Group", width=100, anchor="w")
-        self.tree.column("Status", width=60, anchor="center")
-        self.tree.column("Start Date", width=80, anchor="center")
-        self.tree.column("End Date", width=80, anchor="center")
-        
-        self.tree.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
+        self.scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._on_tree_scroll)
+        
+        # Configure columns (click a heading to sort by it)
+        widths = {"ID": 40, "Name": 120, "Description": 180, "Group": 100,
+                  "Status": 60, "Start Date": 80, "End Date": 80,
+                  "Size": 70, "Files": 55, "Modified": 110}
+        anchors = {"ID": "center", "Status": "center", "Start Date": "center", "End Date": "center",
+                   "Size": "e", "Files": "e", "Modified": "center"}
+        for column in COLUMNS:
+            self.tree.heading(column, text=column, command=lambda c=column: self._sort_by(c))
+            self.tree.column(column, width=widths[column], anchor=anchors.get(column, "w"))
+        
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        tree_frame.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
         
         # Configure styling for inactive projects
         self.tree.tag_configure("inactive", foreground="#888888", 
@@ -228,12 +377,15 @@ class ProjectListPanel:
         
         # Bind double-click
         self.tree.bind("<Double-1>", self._on_double_click)
+        self.search_var.trace_add("write", lambda *args: self._apply_filter())
         
         # Button frame
         btn_frame = tk.Frame(self.visual_frame)
         tk.Button(btn_frame, text="Add Project", command=self._on_add).pack(side=tk.LEFT, padx=5)
         tk.Button(btn_frame, text="Edit Selected", command=self._on_edit).pack(side=tk.LEFT, padx=5)
         tk.Button(btn_frame, text="Remove Selected", command=self._on_remove).pack(side=tk.LEFT, padx=5)
+        if self.stats_index is not None and self.job_queue is not None:
+            tk.Button(btn_frame, text="Refresh Sizes", command=self._refresh_stats).pack(side=tk.LEFT, padx=5)
         btn_frame.pack(pady=(0, 8))
         
         self.notebook.add(self.visual_frame, text="Visual Editor")
@@ -254,6 +406,11 @@ class ProjectListPanel:
         btn_frame.pack(pady=(0, 8))
         
         self.notebook.add(self.json_frame, text="Raw JSON")
+        self._json_view = LazyJsonView(
+            self.notebook, self.json_frame, self.json_text,
+            snapshot=self.project_manager.load_projects,
+            serialize=lambda projects: json.dumps([p.to_dict() for p in projects], indent=2, ensure_ascii=False)
+        )
     
     def _on_add(self):
         """Add new project"""
@@ -265,7 +422,6 @@ class ProjectListPanel:
                 self.project_manager.add_project(
                     project.name, project.description, project.status, project.group_id
                 )
-                self.refresh()
                 if self.on_project_changed:
                     self.on_project_changed()
                 messagebox.showinfo("Success", f"Project '{project.name}' added.")
@@ -289,7 +445,6 @@ class ProjectListPanel:
         if updated_project:
             try:
                 self.project_manager.update_project(updated_project)
-                self.refresh()
                 if self.on_project_changed:
                     self.on_project_changed()
             except ValueError as e:
@@ -311,7 +466,6 @@ class ProjectListPanel:
             f"Are you sure you want to remove project '{project.name}'?"
         ):
             self.project_manager.delete_project(project.id)
-            self.refresh()
             if self.on_project_changed:
                 self.on_project_changed()
     
@@ -330,24 +484,22 @@ class ProjectListPanel:
             return None
         
         project_id = int(values[0])
-        projects = self.project_manager.load_projects()
-        
-        for project in projects:
-            if project.id == project_id:
-                return project
-        
-        return None
+        return self.project_manager.get_project(project_id)
     
     def _save_json(self):
         """Save JSON text"""
+        if self._json_view.loading:
+            messagebox.showinfo("Raw JSON", "The JSON view is still loading.")
+            return
         try:
             json_text = self.json_text.get("1.0", tk.END)
             data = json.loads(json_text)
             projects = [Project.from_dict(proj_data) for proj_data in data]
             self.project_manager.save_projects(projects)
-            self.refresh()
             if self.on_project_changed:
                 self.on_project_changed()
+            # Show the saved data, normalized, instead of the edited text
+            self._json_view.reload()
             messagebox.showinfo("Saved", "Project list saved successfully.")
         except Exception as e:
             messagebox.showerror("Error", f"Invalid JSON: {e}")
@@ -356,47 +508,256 @@ class ProjectListPanel:
         """Refresh both visual and JSON views"""
         self._refresh_tree()
         self._refresh_json()
+        if self._stats_job is None and self.stats_index is not None and self.job_queue is not None:
+            # First fill: walk the project folders in the background
+            self.frame.after_idle(self._refresh_stats)
     
     def _refresh_tree(self):
-        """Refresh tree view"""
-        self.tree.delete(*self.tree.get_children())
+        """Refresh tree view
         
+        Only the in-memory row model is rebuilt here; tree rows are created
+        lazily, one page at a time, as the user scrolls (see _materialize_rows).
+        """
         # Load groups for group name lookup
-        groups = self.project_manager.load_groups()
-        group_dict = {group.id: group.name for group in groups}
+        self._group_names = {group.id: group.name for group in self.project_manager.load_groups()}
+        self._all_rows = list(self.project_manager.load_projects())
+        self._sort_rows()
+        self._apply_filter()
+    
+    def set_group_filter(self, group: Optional[ProjectGroup]):
+        """Limit the list to the projects of group (None shows all groups)"""
+        if group is None:
+            self._group_filter = None
+            self.group_filter_frame.pack_forget()
+        else:
+            self._group_filter = group.id
+            self.group_filter_var.set(f"Group: {group.name}")
+            self.group_filter_frame.pack(side=tk.RIGHT)
+        self._apply_filter()
+    
+    def _apply_filter(self):
+        """Show the projects matching the search bar and group filter (all when neither is set)"""
+        matches = self._search_index.search(self.search_var.get())
+        if self._group_filter is not None:
+            # Group membership comes from the manager's group index, not a scan
+            members = self.project_manager.get_group_project_ids(self._group_filter)
+            matches = members if matches is None else matches & members
+        if matches is None:
+            self._rows = list(self._all_rows)
+            self._keys = list(self._all_keys)
+        else:
+            self._rows = [project for project in self._all_rows if project.id in matches]
+            self._keys = [self._row_keys[project.id] for project in self._rows]
+        self._rematerialize()
+        self._update_match_count()
+    
+    def _update_match_count(self):
+        if self.search_var.get().strip() or self._group_filter is not None:
+            self.match_var.set(f"{len(self._rows)} of {len(self._all_rows)}")
+        else:
+            self.match_var.set("")
+    
+    def _group_name(self, project: Project) -> str:
+        """Get group name or "None" if no group assigned"""
+        if project.group_id == 0:
+            return "None"
+        return self._group_names.get(project.group_id, "None")
+    
+    def _folder_stats(self, project: Project):
+        return self.stats_index.get(project.name) if self.stats_index is not None else None
+    
+    def _row_values(self, project: Project) -> tuple:
+        stats = self._folder_stats(project)
+        if stats is None:
+            stats_values = ("", "", "")
+        else:
+            modified = datetime.datetime.fromtimestamp(stats.modified).strftime("%Y-%m-%d %H:%M")
+            stats_values = (format_size(stats.size), stats.files, modified)
+        return (
+            project.id,
+            project.name,
+            project.description,
+            self._group_name(project),
+            project.status,
+            project.start_date,
+            project.end_date or ""  # Show empty string if no end date
+        ) + stats_values
+    
+    def _sort_key(self, column: str):
+        if column == "ID":
+            return lambda p: p.id
+        if column in STATS_COLUMNS:
+            # Projects without totals sort below the smallest folder
+            attribute = {"Size": "size", "Files": "files", "Modified": "modified"}[column]
+            
+            def stats_key(p):
+                stats = self._folder_stats(p)
+                return getattr(stats, attribute) if stats is not None else -1
+            return stats_key
+        if column == "Group":
+            return lambda p: self._group_name(p).lower()
+        attribute = {"Name": "name", "Description": "description", "Status": "status",
+                     "Start Date": "start_date", "End Date": "end_date"}[column]
+        return lambda p: (getattr(p, attribute) or "").lower()
+    
+    def _row_key(self, key: Callable, project: Project):
+        """Sort key of a row; the id breaks ties so every key is unique"""
+        value = (key(project), project.id)
+        return _Descending(value) if self._sort_reverse else value
+    
+    def _sort_rows(self):
+        """Sort the row model (not the widget) by the current sort column"""
+        key = self._sort_key(self._sort_column)
+        self._row_keys = {project.id: self._row_key(key, project) for project in self._all_rows}
+        self._all_rows.sort(key=lambda project: self._row_keys[project.id])
+        self._all_keys = [self._row_keys[project.id] for project in self._all_rows]
+    
+    def _sort_by(self, column: str):
+        """Heading click: sort by column, toggling direction on repeated clicks"""
+        if self._sort_column == column:
+            self._sort_reverse = not self._sort_reverse
+        else:
+            self._sort_column = column
+            self._sort_reverse = False
+        self._sort_rows()
+        self._apply_filter()
+    
+    def _rematerialize(self):
+        """Drop all tree rows and materialize the first page of the model"""
+        self.tree.delete(*self.tree.get_children())
+        self._materialized = 0
+        self._materialize_rows()
+        self.tree.yview_moveto(0)
+    
+    def _page_size(self) -> int:
+        """Rows per page: what fits in the viewport plus a buffer"""
+        row_height = 20
+        visible = max(self.tree.winfo_height() // row_height, 1)
+        return max(visible * 2, TREE_PAGE_SIZE)
+    
+    def _materialize_rows(self):
+        """Insert the next page of rows from the model into the tree"""
+        self._paging_scheduled = False
+        end = min(self._materialized + self._page_size(), len(self._rows))
+        for project in self._rows[self._materialized:end]:
+            tags = ("inactive",) if project.status == STATUS_INACTIVE else ()
+            self.tree.insert("", tk.END, iid=str(project.id), values=self._row_values(project), tags=tags)
+        self._materialized = end
+    
+    def _on_tree_scroll(self, first: str, last: str):
+        """Scrollbar callback: page in more rows when nearing the end"""
+        self.scrollbar.set(first, last)
+        if (float(last) >= 0.9 and self._materialized < len(self._rows)
+                and not self._paging_scheduled):
+            self._paging_scheduled = True
+            self.tree.after_idle(self._materialize_rows)
+    
+    def _on_model_changed(self, events: List[ChangeEvent]):
+        """Apply project/group change events to the row model and the tree"""
+        if len(events) > DELTA_REFRESH_LIMIT or any(e.kind == EVENT_RESET for e in events):
+            self.refresh()
+            return
         
-        # Sort projects by ID descending
-        projects = sorted(self.project_manager.load_projects(), 
-                         key=lambda p: p.id, reverse=True)
+        for event in events:
+            if event.entity == ENTITY_PROJECT:
+                self._apply_project_change(event)
+            elif event.entity == ENTITY_GROUP:
+                self._apply_group_change(event)
+        self._update_match_count()
+        self._refresh_json()
+    
+    def _model_index(self, rows: List[Project], keys: List, project_id: int) -> Optional[int]:
+        """Position of a project in a sorted row list, by bisecting its keys"""
+        key = self._row_keys.get(project_id)
+        if key is None:
+            return None
+        index = bisect_left(keys, key)
+        if index < len(rows) and rows[index].id == project_id:
+            return index
+        return None
+    
+    def _apply_project_change(self, event: ChangeEvent):
+        iid = str(event.record_id)
+        
+        # Drop the old row (if any) from the models and the tree
+        for rows, keys in ((self._all_rows, self._all_keys), (self._rows, self._keys)):
+            index = self._model_index(rows, keys, event.record_id)
+            if index is not None:
+                del rows[index]
+                del keys[index]
+        self._row_keys.pop(event.record_id, None)
+        if self.tree.exists(iid):
+            self.tree.delete(iid)
+            self._materialized -= 1
+        if event.kind == EVENT_REMOVED:
+            return
         
-        for project in projects:
-            # Get group name or "None" if no group assigned
-            group_name = group_dict.get(project.group_id, "None") if project.group_id != 0 else "None"
-            
-            values = (
-                project.id,
-                project.name,
-                project.description,
-                group_name,
-                project.status,
-                project.start_date,
-                project.end_date or ""  # Show empty string if no end date
-            )
-            
-            if project.status == STATUS_INACTIVE:
-                self.tree.insert("", tk.END, values=values, tags=("inactive",))
+        project = event.record
+        key = self._row_key(self._sort_key(self._sort_column), project)
+        self._row_keys[project.id] = key
+        index = bisect_left(self._all_keys, key)
+        self._all_rows.insert(index, project)
+        self._all_keys.insert(index, key)
+        query = self.search_var.get()
+        if query.strip() and not self._search_index.matches(project.id, query):
+            return
+        if self._group_filter is not None and project.group_id != self._group_filter:
+            return
+        
+        # Re-insert added/updated rows at their sorted position; rows beyond
+        # the materialized page are left for _materialize_rows
+        all_materialized = self._materialized >= len(self._rows)
+        index = bisect_left(self._keys, key)
+        self._rows.insert(index, project)
+        self._keys.insert(index, key)
+        if index < self._materialized or all_materialized:
+            tags = ("inactive",) if project.status == STATUS_INACTIVE else ()
+            self.tree.insert("", index, iid=iid, values=self._row_values(project), tags=tags)
+            self._materialized += 1
+    
+    def _apply_group_change(self, event: ChangeEvent):
+        if event.kind == EVENT_REMOVED:
+            self._group_names.pop(event.record_id, None)
+        else:
+            self._group_names[event.record_id] = event.record.name
+        if event.record_id == self._group_filter:
+            if event.kind == EVENT_REMOVED:
+                self.set_group_filter(None)
             else:
-                self.tree.insert("", tk.END, values=values)
+                self.group_filter_var.set(f"Group: {event.record.name}")
+        
+        if self._sort_column == "Group" or self.search_var.get().strip():
+            # Order or search matches may have changed
+            self._sort_rows()
+            self._apply_filter()
+            return
+        for project in self._rows[:self._materialized]:
+            if project.group_id == event.record_id:
+                self.tree.item(str(project.id), values=self._row_values(project))
+    
+    def _refresh_stats(self):
+        """Recompute folder sizes in the background (one job at a time)"""
+        if self._stats_job is not None and not self._stats_job.finished:
+            return
+        names = [project.name for project in self._all_rows]
+        self._stats_job = self.job_queue.submit(
+            "Folder sizes",
+            lambda job: self.stats_index.collect(names, progress=job.report, cancelled=job.is_cancelled),
+            self._on_stats_done
+        )
+    
+    def _on_stats_done(self, job):
+        if job.status == JOB_FAILED:
+            messagebox.showerror("Error", f"Failed to read folder sizes: {job.error}")
+        if job.status != JOB_DONE or not self.frame.winfo_exists():
+            return
+        if self._sort_column in STATS_COLUMNS:
+            self._sort_rows()
+            self._apply_filter()
+            return
+        for project in self._rows[:self._materialized]:
+            self.tree.item(str(project.id), values=self._row_values(project))
     
     def _refresh_json(self):
-        """Refresh JSON view"""
-        try:
-            projects = self.project_manager.load_projects()
-            data = [proj.to_dict() for proj in projects]
-            json_str = json.dumps(data, indent=2, ensure_ascii=False)
-            
-            self.json_text.delete("1.0", tk.END)
-            self.json_text.insert(tk.END, json_str)
-        except Exception:
-            self.json_text.delete("1.0", tk.END)
-            self.json_text.insert(tk.END, "[]")
+        """Refresh JSON view (rendered when the Raw JSON tab is shown)"""
+        self._json_view.invalidate()
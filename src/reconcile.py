@@ -0,0 +1,419 @@
+"""
+Registry/disk reconciliation
+
+The scanner compares the project registry with the parent and sync
+directories and reports:
+
+- missing projects: registered, but no folder under the parent directory
+  (archived projects, see archive.py, are expected to have none)
+- orphaned folders: folders under the parent or sync root that no project uses
+- broken links: shortcuts to auto items whose target is gone (or that could
+  only be written as a "_link.txt" stub)
+- template drift: folders, files or shortcuts of the current template that a
+  project folder lacks
+
+plan_repair() turns the drift into a plan that creates only the missing
+items (a dry run), repair() executes it, so template changes can be applied
+to existing projects.
+
+Each directory is listed at most once per scan with os.scandir and projects
+are checked in parallel. Listings are cached on disk keyed by the directory's
+mtime, so an unchanged directory costs a single stat on the next scan.
+
+Headless usage:
+    python -m src reconcile [--full] [--json]
+    python -m src repair [--group NAME] [--apply]
+"""
+import os
+import time
+import threading
+from typing import Dict, List, Optional, Tuple
+from .config import RECONCILE_CACHE_FILE
+from .links import LinkMaker, LNK_SUFFIX, STUB_SUFFIX
+from .materializer import CompiledStructure, FolderPlan, PlanStep, STEP_DIR, STEP_FILE
+from .storage import default_writer, read_json_file
+
+KIND_DIR = "d"
+KIND_FILE = "f"
+KIND_LINK = "l"
+
+# Directories modified this recently are not cached: a change within the same
+# mtime tick would otherwise go unnoticed on the next scan
+CACHE_MIN_AGE_NS = 2 * 10**9
+
+CACHE_VERSION = 1
+
+
+class DirectoryLister:
+    """Lists each directory once per scan, reusing cached listings by mtime"""
+
+    def __init__(self, cache: Optional[Dict[str, List]] = None):
+        self._cache = cache or {}                 # path -> [mtime_ns, {name: kind}]
+        self._fresh: Dict[str, List] = {}         # entries to persist after this scan
+        self._listings: Dict[str, Optional[Dict[str, str]]] = {}
+        self._reading: Dict[str, threading.Event] = {}   # set once the first read is done
+        self._lock = threading.Lock()
+        self.listed = 0
+        self.reused = 0
+
+    def list(self, path: str) -> Optional[Dict[str, str]]:
+        """Return {name: kind} for path, or None if it is not a directory
+
+        Concurrent callers for the same directory wait for the first one's
+        read instead of listing it again.
+        """
+        key = os.path.normcase(path)
+        with self._lock:
+            if key in self._listings:
+                return self._listings[key]
+            reading = self._reading.get(key)
+            if reading is None:
+                reading = self._reading[key] = threading.Event()
+                first = True
+            else:
+                first = False
+        if not first:
+            reading.wait()
+            with self._lock:
+                return self._listings.get(key)
+
+        listing = None
+        try:
+            listing = self._read(path, key)
+        finally:
+            with self._lock:
+                self._listings[key] = listing
+                del self._reading[key]
+            reading.set()
+        return listing
+
+    def _read(self, path: str, key: str) -> Optional[Dict[str, str]]:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            with self._lock:
+                self.reused += 1
+                self._fresh[key] = cached
+            return cached[1]
+
+        entries = {}
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_symlink():
+                            kind = KIND_LINK
+                        elif entry.is_dir():
+                            kind = KIND_DIR
+                        else:
+                            kind = KIND_FILE
+                    except OSError:
+                        kind = KIND_FILE
+                    entries[entry.name] = kind
+        except OSError:
+            return None
+        with self._lock:
+            self.listed += 1
+            if time.time_ns() - mtime > CACHE_MIN_AGE_NS:
+                self._fresh[key] = [mtime, entries]
+        return entries
+
+    def cache(self) -> Dict[str, List]:
+        """Listings seen in this scan, to be persisted for the next one"""
+        with self._lock:
+            return dict(self._fresh)
+
+
+class ReconcileReport:
+    """Outcome of a reconciliation scan"""
+
+    def __init__(self):
+        self.missing: List[str] = []                       # project names
+        self.orphaned: List[str] = []                      # folder paths
+        self.broken_links: List[Tuple[str, str, str]] = []  # (project, path, reason)
+        self.drifted: Dict[str, List[str]] = {}            # project -> missing items
+        self.checked = 0
+        self.listed = 0
+        self.reused = 0
+        self.seconds = 0.0
+
+    @property
+    def clean(self) -> bool:
+        return not (self.missing or self.orphaned or self.broken_links or self.drifted)
+
+    def to_dict(self) -> Dict:
+        return {
+            "missing": self.missing,
+            "orphaned": self.orphaned,
+            "broken_links": [
+                {"project": project, "path": path, "reason": reason}
+                for project, path, reason in self.broken_links
+            ],
+            "drifted": self.drifted,
+            "stats": {
+                "projects_checked": self.checked,
+                "directories_listed": self.listed,
+                "directories_cached": self.reused,
+                "seconds": round(self.seconds, 3),
+            },
+        }
+
+    def summary(self) -> str:
+        lines = [
+            f"Checked {self.checked} project folder(s) in {self.seconds:.2f}s "
+            f"({self.listed} directories listed, {self.reused} unchanged)."
+        ]
+        if self.clean:
+            lines.append("Registry and disk are in sync.")
+        for name in self.missing:
+            lines.append(f"  missing:   {name}")
+        for path in self.orphaned:
+            lines.append(f"  orphaned:  {path}")
+        for project, path, reason in self.broken_links:
+            lines.append(f"  broken:    {project}: {path} ({reason})")
+        for project, items in self.drifted.items():
+            lines.append(f"  drifted:   {project}: missing {', '.join(items)}")
+        return "\n".join(lines)
+
+
+class RepairPlan:
+    """Template items missing from existing project folders
+
+    ``plan`` creates the items of all projects at once (levels still respect
+    each project's dependencies), ``items`` lists them per project.
+    """
+
+    def __init__(self, group_id: Optional[int] = None):
+        self.group_id = group_id
+        self.plan = FolderPlan()
+        self.items: Dict[str, List[PlanStep]] = {}
+        self.skipped: List[str] = []    # projects without a folder
+        self.checked = 0
+
+    def __len__(self) -> int:
+        return len(self.plan)
+
+    def add(self, project: str, kind: str, path: str, target: Optional[str] = None):
+        if kind == STEP_DIR:
+            step = self.plan.add_dir(path)
+        elif kind == STEP_FILE:
+            step = self.plan.add_file(path)
+        else:
+            step = self.plan.add_link(path, target)
+        if step is not None:
+            self.items.setdefault(project, []).append(step)
+
+    def to_dict(self) -> Dict:
+        return {
+            "group_id": self.group_id,
+            "projects_checked": self.checked,
+            "skipped": self.skipped,
+            "items": {
+                project: [
+                    {"kind": step.kind, "path": step.path, "target": step.target} for step in steps
+                ]
+                for project, steps in self.items.items()
+            },
+        }
+
+    def summary(self) -> str:
+        lines = [
+            f"{len(self)} item(s) missing in {len(self.items)} of {self.checked} project folder(s)."
+        ]
+        for project, steps in self.items.items():
+            lines.append(f"  {project}:")
+            for step in steps:
+                target = f" -> {step.target}" if step.target else ""
+                lines.append(f"    + {step.kind:<4} {step.path}{target}")
+        for name in self.skipped:
+            lines.append(f"  skipped:   {name} (no project folder)")
+        return "\n".join(lines)
+
+
+class ReconcileScanner:
+    """Cross-references the project registry with the folders on disk"""
+
+    def __init__(self, project_manager, structure_manager, cache_file: str = RECONCILE_CACHE_FILE,
+                 max_workers: Optional[int] = None):
+        self.project_manager = project_manager
+        self.structure_manager = structure_manager
+        self.cache_file = cache_file
+        self.max_workers = max_workers
+
+    def _load_cache(self) -> Dict[str, List]:
+        try:
+            data = read_json_file(self.cache_file, {})
+        except ValueError:
+            return {}
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return {}
+        return data.get("directories", {})
+
+    def _save_cache(self, directories: Dict[str, List]):
+        try:
+            default_writer().write_json(
+                self.cache_file, {"version": CACHE_VERSION, "directories": directories}, indent=None
+            )
+        except OSError:
+            pass  # the cache only speeds up the next scan
+
+    def scan(self, incremental: bool = True) -> ReconcileReport:
+        """Scan the parent and sync roots; ``incremental=False`` ignores the cache"""
+        start = time.perf_counter()
+        report = ReconcileReport()
+        compiled = self.structure_manager.get_compiled()
+        parent_dir = self.structure_manager.get_parent_directory()
+        sync_dir = self.structure_manager.get_sync_directory()
+        use_sync = os.path.normcase(sync_dir) != os.path.normcase(parent_dir)
+
+        lister = DirectoryLister(self._load_cache() if incremental else None)
+        parent_entries = lister.list(parent_dir) or {}
+        sync_entries = (lister.list(sync_dir) or {}) if use_sync else {}
+
+        projects = self.project_manager.load_projects()
+        registered = {os.path.normcase(project.name) for project in projects}
+        parent_names = {os.path.normcase(name): kind for name, kind in parent_entries.items()}
+        archive_dir = os.path.normcase(self.structure_manager.get_archive_directory())
+
+        for root, entries in ((parent_dir, parent_entries), (sync_dir, sync_entries)):
+            for name in sorted(entries):
+                path = os.path.join(root, name)
+                if (entries[name] == KIND_DIR and not name.startswith(".")
+                        and os.path.normcase(name) not in registered and os.path.normcase(path) != archive_dir):
+                    report.orphaned.append(path)
+
+        present = []
+        for project in projects:
+            if project.archive_path:
+                continue
+            if parent_names.get(os.path.normcase(project.name)) in (KIND_DIR, KIND_LINK):
+                present.append(project)
+            else:
+                report.missing.append(project.name)
+
+        results = self._compare_projects(present, compiled, lister, parent_dir, sync_dir if use_sync else None)
+        for name, (missing_items, broken) in results:
+            if missing_items:
+                report.drifted[name] = [label for label, _, _, _ in missing_items]
+            report.broken_links.extend((name, path, reason) for path, reason in broken)
+
+        report.checked = len(present)
+        report.listed = lister.listed
+        report.reused = lister.reused
+        self._save_cache(lister.cache())
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def plan_repair(self, group_id: Optional[int] = None) -> RepairPlan:
+        """Dry run: plan the template items missing from existing project folders
+
+        ``group_id`` limits the plan to one group (0 for ungrouped projects).
+        Projects without a folder (or archived) are skipped; nothing existing
+        is replaced.
+        """
+        repair = RepairPlan(group_id)
+        compiled = self.structure_manager.get_compiled()
+        parent_dir = self.structure_manager.get_parent_directory()
+        sync_dir = self.structure_manager.get_sync_directory()
+        use_sync = os.path.normcase(sync_dir) != os.path.normcase(parent_dir)
+
+        lister = DirectoryLister(self._load_cache())
+        parent_names = {os.path.normcase(name): kind for name, kind in (lister.list(parent_dir) or {}).items()}
+
+        present = []
+        for project in self.project_manager.load_projects():
+            if group_id is not None and project.group_id != group_id:
+                continue
+            if project.archive_path:
+                repair.skipped.append(project.name)
+                continue
+            if parent_names.get(os.path.normcase(project.name)) in (KIND_DIR, KIND_LINK):
+                present.append(project)
+            else:
+                repair.skipped.append(project.name)
+
+        results = self._compare_projects(present, compiled, lister, parent_dir, sync_dir if use_sync else None)
+        for name, (missing_items, _) in results:
+            for _, kind, path, target in missing_items:
+                repair.add(name, kind, path, target)
+        repair.checked = len(present)
+        self._save_cache(lister.cache())
+        return repair
+
+    def repair(self, repair: RepairPlan, progress=None, cancelled=None) -> LinkMaker:
+        """Create the items of a plan from plan_repair()
+
+        Levels run concurrently like new project folders; ``progress`` and
+        ``cancelled`` are passed through to execute_plan. Returns the
+        LinkMaker with any shortcuts that could not be created.
+        """
+        return self.structure_manager.execute_plan(
+            repair.plan, self.max_workers, progress=progress, cancelled=cancelled
+        )
+
+    def _compare_projects(self, projects: List, compiled: CompiledStructure, lister: DirectoryLister,
+                          parent_dir: str, sync_dir: Optional[str]) -> List[Tuple]:
+        """Run _compare_project for every project, in parallel when allowed"""
+        def compare(project):
+            return project.name, self._compare_project(project.name, compiled, lister, parent_dir, sync_dir)
+
+        max_workers = self.max_workers or self.structure_manager.get_max_workers()
+        if max_workers <= 1 or len(projects) <= 1:
+            return [compare(project) for project in projects]
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="reconcile") as pool:
+            return list(pool.map(compare, projects))
+
+    def _compare_project(self, name: str, compiled: CompiledStructure, lister: DirectoryLister,
+                         parent_dir: str, sync_dir: Optional[str]):
+        """Compare one project's folders with the template
+
+        Works on the compiled template's relative entries rather than a full
+        plan. Returns (missing, broken) where missing holds (label, step kind,
+        path, link target) per absent item and broken (link path, reason).
+        """
+        project_path = os.path.join(parent_dir, name)
+        sync_path = os.path.join(sync_dir, name) if sync_dir else None
+        use_sync = compiled.uses_sync(project_path, sync_path)
+        roots = (project_path, sync_path)
+        labels = ("", "[sync] " + name + os.sep)
+
+        missing: List[Tuple] = []
+        broken: List[Tuple[str, str]] = []
+        if use_sync and (lister.list(sync_dir) or {}).get(name) is None:
+            missing.append(("[sync] " + name, STEP_DIR, sync_path, None))
+
+        for kind, root, rel, target_root, target_rel in compiled.entries(use_sync):
+            folder, base = os.path.split(rel)
+            directory = os.path.join(roots[root], folder) if folder else roots[root]
+            listing = lister.list(directory) or {}
+            found = listing.get(base)
+
+            if kind == STEP_DIR:
+                ok = found == KIND_DIR or (found == KIND_LINK and os.path.isdir(os.path.join(directory, base)))
+            elif kind == STEP_FILE:
+                ok = found is not None
+            elif found == KIND_LINK:
+                ok = True
+                path = os.path.join(directory, base)
+                if not os.path.exists(path):
+                    broken.append((path, "target missing"))
+            elif base + LNK_SUFFIX in listing:
+                ok = True
+                if not os.path.exists(os.path.join(roots[target_root], target_rel)):
+                    broken.append((os.path.join(directory, base + LNK_SUFFIX), "target missing"))
+            elif base + STUB_SUFFIX in listing:
+                ok = True
+                broken.append((os.path.join(directory, base + STUB_SUFFIX), "shortcut could not be created"))
+            else:
+                # A real folder/file in place of the shortcut still holds the data
+                ok = found is not None
+            if not ok:
+                target = os.path.join(roots[target_root], target_rel) if target_root is not None else None
+                missing.append((labels[root] + rel, kind, os.path.join(directory, base), target))
+        return missing, broken
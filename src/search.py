@@ -0,0 +1,211 @@
+"""
+In-memory full-text search over projects
+
+ProjectSearchIndex keeps an inverted index from lower-cased word tokens of a
+project's name, description and status (and of its group's name) to project
+ids. Every query word is matched as a token prefix and all words must match.
+The index is built on the first search and then follows the ProjectManager's
+change events, so it is updated per added/updated/removed record instead of
+being rebuilt.
+"""
+import re
+from bisect import bisect_left
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+from .events import (
+    ChangeEvent, EVENT_ADDED, EVENT_UPDATED, EVENT_REMOVED, EVENT_RESET, ENTITY_PROJECT, ENTITY_GROUP
+)
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Prefixes up to this length get their own posting lists; longer query words
+# are resolved through a range scan of the sorted vocabulary
+SHORT_PREFIX = 2
+
+
+def tokenize(*texts: str) -> FrozenSet[str]:
+    """Lower-cased word tokens of the given texts"""
+    tokens = set()
+    for text in texts:
+        if text:
+            tokens.update(_TOKEN_RE.findall(text.lower()))
+    return frozenset(tokens)
+
+
+class _TokenIndex:
+    """Token -> ids postings with a sorted vocabulary for prefix lookups"""
+
+    def __init__(self):
+        self.tokens: Dict[int, FrozenSet[str]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._short: Dict[str, Set[int]] = {}
+        self._vocab: List[str] = []
+
+    def build(self, items: Iterable):
+        """Bulk-load (id, tokens) pairs into an empty index"""
+        postings = self._postings
+        for record_id, tokens in items:
+            self.tokens[record_id] = tokens
+            for token in tokens:
+                ids = postings.get(token)
+                if ids is None:
+                    postings[token] = {record_id}
+                else:
+                    ids.add(record_id)
+        self._vocab = sorted(postings)
+        # Short-prefix postings are filled per distinct token, not per occurrence
+        for token, ids in postings.items():
+            for length in range(1, min(len(token), SHORT_PREFIX) + 1):
+                prefix_ids = self._short.get(token[:length])
+                if prefix_ids is None:
+                    self._short[token[:length]] = set(ids)
+                else:
+                    prefix_ids |= ids
+
+    def add(self, record_id: int, tokens: FrozenSet[str]):
+        self.tokens[record_id] = tokens
+        for token in tokens:
+            ids = self._postings.get(token)
+            if ids is None:
+                ids = self._postings[token] = set()
+                position = bisect_left(self._vocab, token)
+                self._vocab.insert(position, token)
+            ids.add(record_id)
+            for length in range(1, min(len(token), SHORT_PREFIX) + 1):
+                self._short.setdefault(token[:length], set()).add(record_id)
+
+    def remove(self, record_id: int):
+        tokens = self.tokens.pop(record_id, None)
+        if not tokens:
+            return
+        # A short prefix may be shared by several tokens of the same record
+        prefixes = set()
+        for token in tokens:
+            ids = self._postings[token]
+            ids.discard(record_id)
+            if not ids:
+                del self._postings[token]
+                del self._vocab[bisect_left(self._vocab, token)]
+        for token in tokens:
+            for length in range(1, min(len(token), SHORT_PREFIX) + 1):
+                prefixes.add(token[:length])
+        for prefix in prefixes:
+            ids = self._short[prefix]
+            ids.discard(record_id)
+            if not ids:
+                del self._short[prefix]
+
+    def match(self, prefix: str) -> Set[int]:
+        """Ids with at least one token starting with prefix (do not modify)"""
+        if len(prefix) <= SHORT_PREFIX:
+            return self._short.get(prefix, set())
+        position = bisect_left(self._vocab, prefix)
+        matched: Set[int] = set()
+        vocab = self._vocab
+        while position < len(vocab) and vocab[position].startswith(prefix):
+            matched |= self._postings[vocab[position]]
+            position += 1
+        return matched
+
+    def has_prefix(self, record_id: int, prefix: str) -> bool:
+        return any(token.startswith(prefix) for token in self.tokens.get(record_id, ()))
+
+
+class ProjectSearchIndex:
+    """Prefix/token search over project name, description, status and group name"""
+
+    def __init__(self, project_manager):
+        self.project_manager = project_manager
+        self._projects = _TokenIndex()
+        self._groups = _TokenIndex()
+        self._group_of: Dict[int, int] = {}
+        self._members: Dict[int, Set[int]] = {}
+        self._ready = False
+        self._unsubscribe = project_manager.subscribe(self.apply)
+
+    def close(self):
+        """Stop following the project manager"""
+        self._unsubscribe()
+
+    def invalidate(self):
+        """Drop the index; it is rebuilt on the next search"""
+        self._ready = False
+
+    def _ensure_built(self):
+        if not self._ready:
+            self.rebuild()
+
+    def rebuild(self):
+        """Re-index every project and group"""
+        projects = self.project_manager.load_projects()
+        self._groups = _TokenIndex()
+        self._groups.build((group.id, tokenize(group.name)) for group in self.project_manager.load_groups())
+        self._projects = _TokenIndex()
+        self._projects.build((p.id, tokenize(p.name, p.description, p.status)) for p in projects)
+        self._group_of = {p.id: p.group_id for p in projects}
+        self._members = {}
+        for project in projects:
+            self._members.setdefault(project.group_id, set()).add(project.id)
+        self._ready = True
+
+    def _add_project(self, project):
+        self._projects.add(project.id, tokenize(project.name, project.description, project.status))
+        self._group_of[project.id] = project.group_id
+        self._members.setdefault(project.group_id, set()).add(project.id)
+
+    def _remove_project(self, project_id: int):
+        self._projects.remove(project_id)
+        group_id = self._group_of.pop(project_id, None)
+        if group_id is not None:
+            self._members[group_id].discard(project_id)
+
+    def apply(self, events: Iterable[ChangeEvent]):
+        """Update the index from a batch of ProjectManager change events"""
+        if not self._ready:
+            return  # built from scratch on the next search
+        for event in events:
+            if event.kind == EVENT_RESET:
+                self.invalidate()
+                return
+            if event.entity == ENTITY_PROJECT:
+                self._remove_project(event.record_id)
+                if event.kind in (EVENT_ADDED, EVENT_UPDATED):
+                    self._add_project(event.record)
+            elif event.entity == ENTITY_GROUP:
+                self._groups.remove(event.record_id)
+                if event.kind != EVENT_REMOVED:
+                    self._groups.add(event.record_id, tokenize(event.record.name))
+
+    def _match_word(self, word: str) -> Set[int]:
+        matched = self._projects.match(word)
+        group_ids = self._groups.match(word)
+        if not group_ids:
+            return matched
+        matched = set(matched)
+        for group_id in group_ids:
+            matched |= self._members.get(group_id, set())
+        return matched
+
+    def search(self, query: str) -> Optional[Set[int]]:
+        """Ids of projects matching every word of query (None for an empty query)"""
+        words = _TOKEN_RE.findall(query.lower())
+        if not words:
+            return None
+        self._ensure_built()
+        result: Optional[Set[int]] = None
+        # Longer words are usually more selective; start with them
+        for word in sorted(set(words), key=len, reverse=True):
+            matched = self._match_word(word)
+            result = set(matched) if result is None else result & matched
+            if not result:
+                break
+        return result
+
+    def matches(self, project_id: int, query: str) -> bool:
+        """Check a single project against query without a full search"""
+        self._ensure_built()
+        group_id = self._group_of.get(project_id)
+        for word in _TOKEN_RE.findall(query.lower()):
+            if not (self._projects.has_prefix(project_id, word)
+                    or self._groups.has_prefix(group_id, word)):
+                return False
+        return True
@@ -0,0 +1,892 @@
+"""
+Record storage backends for projects and groups
+"""
+import os
+import sys
+import json
+import atexit
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from .config import FSYNC_POLICY, FSYNC_ALWAYS, FSYNC_BATCH, FSYNC_NEVER, FSYNC_BATCH_MS
+
+
+class AtomicWriter:
+    """Crash-safe file writer with a configurable fsync policy
+
+    Whole-file writes go to a temporary file in the same directory which is
+    then renamed over the target, so readers never observe a truncated file.
+    The fsync policy trades durability for throughput:
+
+    - ``always``: fsync the data and the directory on every write
+    - ``batch``: fsync written files at most every ``batch_ms`` milliseconds
+    - ``never``: leave flushing to the operating system
+    """
+
+    def __init__(self, policy: str = FSYNC_POLICY, batch_ms: int = FSYNC_BATCH_MS):
+        if policy not in (FSYNC_ALWAYS, FSYNC_BATCH, FSYNC_NEVER):
+            raise ValueError(f"Unknown fsync policy '{policy}'")
+        self.policy = policy
+        self.batch_ms = batch_ms
+        self._pending: Set[str] = set()
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def write_text(self, path: str, text: str):
+        """Atomically replace ``path`` with ``text``"""
+        import shutil
+        import tempfile
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(
+            dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                if self.policy == FSYNC_ALWAYS:
+                    os.fsync(f.fileno())
+            if os.path.exists(path):
+                shutil.copymode(path, tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._synced(path)
+
+    def write_json(self, path: str, data, indent: int = 2):
+        """Atomically replace ``path`` with ``data`` serialised as JSON"""
+        self.write_text(path, json.dumps(data, indent=indent, ensure_ascii=False))
+
+    def write_records(self, path: str, records, indent: int = 2):
+        """Atomically replace ``path`` with a JSON array of ``record.to_dict()``"""
+        self.write_text(path, encode_records(records, indent))
+
+    def append_text(self, path: str, text: str):
+        """Append ``text`` to ``path`` (used for journals)"""
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            if self.policy == FSYNC_ALWAYS:
+                os.fsync(f.fileno())
+        if self.policy == FSYNC_BATCH:
+            self._schedule(path)
+
+    def _synced(self, path: str):
+        """Make a completed rename durable according to the policy"""
+        if self.policy == FSYNC_ALWAYS:
+            _fsync_directory(os.path.dirname(os.path.abspath(path)))
+        elif self.policy == FSYNC_BATCH:
+            self._schedule(path)
+
+    def _schedule(self, path: str):
+        with self._lock:
+            self._pending.add(path)
+            if self._timer is None:
+                self._timer = threading.Timer(self.batch_ms / 1000.0, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """fsync every file written since the last flush"""
+        with self._lock:
+            pending, self._pending = self._pending, set()
+            self._timer = None
+        directories = set()
+        for path in pending:
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.fsync(fd)
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+            directories.add(os.path.dirname(os.path.abspath(path)))
+        for directory in directories:
+            _fsync_directory(directory)
+
+
+def _fsync_directory(directory: str):
+    """fsync a directory so a rename inside it survives a crash (POSIX only)"""
+    if sys.platform.startswith("win"):
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def encode_records(records, indent: Optional[int] = 2) -> str:
+    """JSON array of ``record.to_dict()``, encoded one record at a time
+
+    Same text as json.dumps([r.to_dict() for r in records], indent=indent),
+    but only one record's dict exists at a time instead of one per record.
+    """
+    encoder = json.JSONEncoder(indent=indent, ensure_ascii=False)
+    if indent is None:
+        return "[" + ", ".join(encoder.encode(record.to_dict()) for record in records) + "]"
+    pad = " " * indent if isinstance(indent, int) else indent
+    items = [pad + encoder.encode(record.to_dict()).replace("\n", "\n" + pad) for record in records]
+    if not items:
+        return "[]"
+    return "[\n" + ",\n".join(items) + "\n]"
+
+
+_default_writer: Optional[AtomicWriter] = None
+
+
+def default_writer() -> AtomicWriter:
+    """Return the process-wide writer configured from config.py"""
+    global _default_writer
+    if _default_writer is None:
+        _default_writer = AtomicWriter()
+        atexit.register(_default_writer.flush)
+    return _default_writer
+
+
+def read_json_file(path: str, default=None):
+    """Read a JSON file, returning ``default`` if it does not exist
+
+    A file that exists but cannot be parsed raises ValueError instead of
+    being treated as empty, so a damaged registry is never overwritten.
+    """
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except ValueError as e:
+        raise ValueError(f"'{path}' is not valid JSON: {e}") from e
+
+
+# Characters read per step by iter_json_array
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def iter_json_array(path: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator:
+    """Yield the items of the JSON array in ``path`` one at a time
+
+    The file is read in chunks and each item is decoded as soon as it is
+    complete, so memory holds one chunk and one item rather than the whole
+    text plus every parsed item. A missing or blank file yields nothing;
+    anything else that is not a JSON array raises ValueError.
+    """
+    if not os.path.exists(path):
+        return
+    decoder = json.JSONDecoder()
+    whitespace = " \t\r\n"
+    delimiters = whitespace + ",]"
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = ""
+        pos = 0
+        eof = False
+        read_size = chunk_size
+
+        def fill() -> bool:
+            """Append the next chunk to the buffer (dropping what was consumed)"""
+            nonlocal buffer, pos, eof
+            chunk = f.read(read_size)
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            return True
+
+        def skip_whitespace():
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in whitespace:
+                    pos += 1
+                if pos < len(buffer) or not fill():
+                    return
+
+        skip_whitespace()
+        if pos == len(buffer):
+            return
+        if buffer[pos] != "[":
+            raise ValueError(f"'{path}' is not valid JSON: expected an array")
+        pos += 1
+        first = True
+        while True:
+            skip_whitespace()
+            if pos == len(buffer):
+                raise ValueError(f"'{path}' is not valid JSON: unterminated array")
+            if buffer[pos] == "]":
+                return
+            if not first:
+                if buffer[pos] != ",":
+                    raise ValueError(f"'{path}' is not valid JSON: expected ',' at offset {pos}")
+                pos += 1
+                skip_whitespace()
+            while True:
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                except ValueError as e:
+                    error = e
+                else:
+                    # A number cut by the chunk end ("12|34", "1|e5") decodes too
+                    # early; a complete item is always followed by a delimiter
+                    if eof or (end < len(buffer) and buffer[end] in delimiters):
+                        break
+                    error = None
+                if not fill():
+                    if error is None:
+                        item, end = decoder.raw_decode(buffer, pos)
+                        break
+                    raise ValueError(f"'{path}' is not valid JSON: {error}") from error
+                # Items larger than a chunk: grow the reads so retries stay linear
+                read_size *= 2
+            read_size = chunk_size
+            yield item
+            pos = end
+            first = False
+
+
+class JsonRepository:
+    """In-memory, id-indexed record repository backed by a JSON array file
+
+    The file is parsed once and kept in memory. Every access stats the file
+    and only re-parses it when its mtime or size changed on disk (e.g. it was
+    edited by hand or by another instance). Mutations update the in-memory
+    index and are then written back explicitly.
+    """
+
+    def __init__(self, path: str, from_dict: Callable[[Dict], object], indent: int = 2,
+                 writer: Optional[AtomicWriter] = None):
+        self.path = path
+        self.from_dict = from_dict
+        self.indent = indent
+        self.writer = writer or default_writer()
+        self._records: Dict[int, object] = {}
+        self._names: Dict[str, Set[int]] = {}
+        self._max_id: Optional[int] = 0
+        self._signature: Optional[Tuple[int, int]] = None
+        self._loaded = False
+        # Bumped whenever the records are replaced wholesale (load, reload,
+        # replace_all), so derived indexes know to rebuild
+        self.generation = 0
+        # The first load may run on a background thread (see ProjectManager.preload)
+        self._load_lock = threading.Lock()
+
+    # ----- disk synchronisation -----
+
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) of the backing file, or None if missing"""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _sync(self):
+        """Reload the repository if the backing file changed on disk"""
+        signature = self._file_signature()
+        if self._loaded and signature == self._signature:
+            return
+        with self._load_lock:
+            if not (self._loaded and signature == self._signature):
+                self._load(signature)
+
+    def _load(self, signature):
+        """Parse the backing file into the in-memory index"""
+        self._reset([self.from_dict(item) for item in self._read_snapshot()])
+        self._signature = signature
+        self._loaded = True
+
+    def _read_snapshot(self) -> List[Dict]:
+        """Read the raw record dicts from the backing file"""
+        return read_json_file(self.path, [])
+
+    def _reset(self, records: List[object]):
+        """Rebuild all indexes from a list of records"""
+        # Build aside and swap in, so readers never see a half-filled index
+        by_id = {}
+        names = {}
+        for record in records:
+            by_id[record.id] = record
+            names.setdefault(record.name, set()).add(record.id)
+        self._records = by_id
+        self._names = names
+        self._max_id = None
+        self.generation += 1
+
+    def _write(self):
+        """Write the in-memory records back to the backing file"""
+        self.writer.write_records(self.path, self._records.values(), self.indent)
+        self._signature = self._file_signature()
+
+    def reload(self):
+        """Force a re-read of the backing file"""
+        self._load(self._file_signature())
+
+    def sync(self):
+        """Re-read the backing file if it changed on disk (one stat otherwise)"""
+        self._sync()
+
+    # ----- queries -----
+
+    def all(self) -> List[object]:
+        """Return all records in file order"""
+        self._sync()
+        return list(self._records.values())
+
+    def count(self, where: Optional[Dict] = None) -> int:
+        """Return the number of records (matching ``where``, see scan)"""
+        if where:
+            return sum(1 for _ in self.scan(where))
+        self._sync()
+        return len(self._records)
+
+    def get(self, record_id: int) -> Optional[object]:
+        """Return the record with the given id, if any
+
+        Before the repository is loaded the file is scanned up to the
+        record instead of being loaded in full.
+        """
+        if self._can_stream():
+            return next(self.scan({"id": record_id}), None)
+        self._sync()
+        return self._records.get(record_id)
+
+    def _can_stream(self) -> bool:
+        """True while the backing file alone is the current state (nothing loaded yet)"""
+        return not self._loaded
+
+    def scan(self, where: Optional[Dict] = None) -> Iterator[object]:
+        """Yield the records whose attributes equal the values in ``where``
+
+        Once the repository is loaded the in-memory records are filtered.
+        Before that the file is streamed (see iter_json_array) and only
+        matching records are kept, so one-off queries from the command line
+        never hold the whole list.
+        """
+        where = where or {}
+        if self._can_stream():
+            # Most items are rejected on their raw values, before from_dict
+            records = (
+                self.from_dict(item) for item in iter_json_array(self.path)
+                if all(item.get(name) in (None, value) for name, value in where.items())
+            )
+        else:
+            self._sync()
+            records = list(self._records.values())
+        for record in records:
+            if all(getattr(record, name) == value for name, value in where.items()):
+                yield record
+
+    def find_by_name(self, name: str) -> Optional[object]:
+        """Return a record with the given name, if any"""
+        self._sync()
+        ids = self._names.get(name)
+        if not ids:
+            return None
+        return self._records[next(iter(ids))]
+
+    def next_id(self) -> int:
+        """Return the next free id (highest id + 1)"""
+        self._sync()
+        if self._max_id is None:
+            self._max_id = max(self._records, default=0)
+        return self._max_id + 1
+
+    # ----- mutations -----
+
+    def _index(self, record: object):
+        self._records[record.id] = record
+        self._names.setdefault(record.name, set()).add(record.id)
+        if self._max_id is not None and record.id > self._max_id:
+            self._max_id = record.id
+
+    def _unindex(self, record_id: int) -> Optional[object]:
+        record = self._records.pop(record_id, None)
+        if record is None:
+            return None
+        ids = self._names.get(record.name)
+        if ids is not None:
+            ids.discard(record_id)
+            if not ids:
+                del self._names[record.name]
+        if record_id == self._max_id:
+            self._max_id = None
+        return record
+
+    def _persist_put(self, record: object):
+        """Persist an added or updated record"""
+        self._write()
+
+    def _persist_delete(self, record_id: int):
+        """Persist the removal of a record"""
+        self._write()
+
+    def add(self, record: object):
+        """Add a record and write back"""
+        self._sync()
+        self._index(record)
+        self._persist_put(record)
+
+    def _persist_many(self, records: List[object]):
+        """Persist a batch of added records"""
+        self._write()
+
+    def add_many(self, records: List[object]):
+        """Add several records with a single write back"""
+        self._sync()
+        for record in records:
+            self._index(record)
+        if records:
+            self._persist_many(records)
+
+    def _replace(self, record: object) -> bool:
+        """Swap in the new version of an existing record (in memory only)"""
+        old = self._records.get(record.id)
+        if old is None:
+            return False
+        ids = self._names.get(old.name)
+        if ids is not None:
+            ids.discard(old.id)
+            if not ids:
+                del self._names[old.name]
+        self._records[record.id] = record
+        self._names.setdefault(record.name, set()).add(record.id)
+        return True
+
+    def update(self, record: object) -> bool:
+        """Replace the record with the same id and write back"""
+        self._sync()
+        if not self._replace(record):
+            return False
+        self._persist_put(record)
+        return True
+
+    def update_many(self, records: List[object]) -> List[object]:
+        """Replace several records with a single write back; returns those that existed"""
+        self._sync()
+        updated = [record for record in records if self._replace(record)]
+        if updated:
+            self._persist_many(updated)
+        return updated
+
+    def remove(self, record_id: int) -> Optional[object]:
+        """Remove a record by id and write back"""
+        self._sync()
+        record = self._unindex(record_id)
+        if record is not None:
+            self._persist_delete(record_id)
+        return record
+
+    def replace_all(self, records: List[object]):
+        """Replace every record and write back"""
+        self._reset(list(records))
+        self._loaded = True
+        self._write()
+
+
+class JournalRepository(JsonRepository):
+    """JsonRepository that appends one journal line per mutation
+
+    Instead of rewriting the whole JSON array on every add/update/delete,
+    each mutation is appended to ``<file>.journal`` as a single JSON line.
+    Once the journal holds ``compact_threshold`` entries it is rotated aside
+    and folded back into the JSON snapshot on a background thread. Loading
+    replays any journal entries on top of the last snapshot.
+    """
+
+    def __init__(self, path: str, from_dict: Callable[[Dict], object], indent: int = 2,
+                 writer: Optional[AtomicWriter] = None, compact_threshold: int = 500):
+        super().__init__(path, from_dict, indent, writer)
+        self.journal_path = path + ".journal"
+        self.segment_path = path + ".journal.compacting"
+        self.compact_threshold = max(1, compact_threshold)
+        self._entries = 0
+        self._lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+        # Error of the last background compaction that failed, if any
+        self.compaction_error: Optional[Exception] = None
+
+    # ----- disk synchronisation -----
+
+    def _file_signature(self):
+        """Combined signature of the snapshot and the journal"""
+        signatures = []
+        for path in (self.path, self.journal_path):
+            try:
+                st = os.stat(path)
+                signatures.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                signatures.append(None)
+        return tuple(signatures)
+
+    def _sync(self):
+        with self._lock:
+            # The compactor rewrites the snapshot behind our back; that is not
+            # an external change, so skip the staleness check while it runs.
+            if self._loaded and self._compactor is not None:
+                return
+            super()._sync()
+
+    def _can_stream(self) -> bool:
+        # Pending journal entries change the snapshot; those need a full load
+        return (not self._loaded and not os.path.exists(self.journal_path)
+                and not os.path.exists(self.segment_path))
+
+    def _load(self, signature):
+        records: Dict[int, Dict] = {}
+        for item in self._read_snapshot():
+            records[item.get("id", 0)] = item
+        self._replay(self.segment_path, records)
+        self._entries = self._replay(self.journal_path, records)
+        self._reset([self.from_dict(item) for item in records.values()])
+        self._signature = signature
+        self._loaded = True
+        if os.path.exists(self.segment_path):
+            # A previous compaction did not finish; redo it
+            self._start_compaction(rotate=False)
+
+    @staticmethod
+    def _replay(path: str, records: Dict[int, Dict]) -> int:
+        """Apply the journal entries in ``path`` to ``records``"""
+        if not os.path.exists(path):
+            return 0
+        count = 0
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Torn trailing line from an interrupted append
+                    continue
+                if entry.get("op") == "put":
+                    record = entry["record"]
+                    records[record.get("id", 0)] = record
+                elif entry.get("op") == "delete":
+                    records.pop(entry.get("id"), None)
+                count += 1
+        return count
+
+    # ----- persistence -----
+
+    def _append(self, entries: List[Dict]):
+        """Append journal entries with a single write"""
+        text = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+        with self._lock:
+            self.writer.append_text(self.journal_path, text)
+            self._entries += len(entries)
+            self._signature = self._file_signature()
+            if self._entries >= self.compact_threshold and self._compactor is None:
+                self._start_compaction()
+
+    def _persist_put(self, record: object):
+        self._append([{"op": "put", "record": record.to_dict()}])
+
+    def _persist_delete(self, record_id: int):
+        self._append([{"op": "delete", "id": record_id}])
+
+    def _persist_many(self, records: List[object]):
+        self._append([{"op": "put", "record": record.to_dict()} for record in records])
+
+    def _write(self):
+        """Write a full snapshot synchronously and drop the journal"""
+        self.wait_for_compaction()
+        with self._lock:
+            super()._write()
+            for path in (self.journal_path, self.segment_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._entries = 0
+            self._signature = self._file_signature()
+
+    # ----- compaction -----
+
+    def _start_compaction(self, rotate: bool = True):
+        """Rotate the journal aside and fold it into the snapshot in the background
+
+        Must be called with the lock held (or before the repository is shared).
+        """
+        if rotate:
+            if os.path.exists(self.segment_path):
+                # A failed compaction left its segment; replacing it would drop
+                # those entries, so move the journal onto its end instead
+                self._append_to_segment()
+            else:
+                os.replace(self.journal_path, self.segment_path)
+            self._entries = 0
+            self._signature = self._file_signature()
+        self._compactor = threading.Thread(
+            target=self._compact, name="journal-compactor", daemon=False
+        )
+        self._compactor.start()
+
+    def _append_to_segment(self):
+        """Move the live journal's entries onto the end of the existing segment
+
+        Replaying is idempotent, so a crash between the append and the
+        removal only replays the same entries twice, in the same order.
+        """
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            text = f.read()
+        with open(self.segment_path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    # Do not glue the first entry onto a torn trailing line
+                    text = "\n" + text
+        self.writer.append_text(self.segment_path, text)
+        os.remove(self.journal_path)
+
+    def _compact(self):
+        """Background worker: snapshot + rotated segment -> new snapshot"""
+        try:
+            records: Dict[int, Dict] = {}
+            for item in self._read_snapshot():
+                records[item.get("id", 0)] = item
+            self._replay(self.segment_path, records)
+            self.writer.write_json(self.path, list(records.values()), self.indent)
+            os.remove(self.segment_path)
+            self.compaction_error = None
+        except (OSError, ValueError) as e:
+            # Leave the segment in place; it is replayed on the next load and
+            # the next rotation appends to it
+            self.compaction_error = e
+            print(f"Journal compaction of '{self.path}' failed: {e}", file=sys.stderr)
+        finally:
+            with self._lock:
+                self._signature = self._file_signature()
+                self._compactor = None
+
+    def wait_for_compaction(self):
+        """Block until a running background compaction has finished"""
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+    def compact(self):
+        """Fold the journal into the snapshot now and wait for it"""
+        self.wait_for_compaction()
+        with self._lock:
+            if self._compactor is None:
+                if os.path.exists(self.journal_path):
+                    self._start_compaction()
+                elif os.path.exists(self.segment_path):
+                    # Retry a compaction that failed earlier
+                    self._start_compaction(rotate=False)
+        self.wait_for_compaction()
+
+
+class SQLiteRepository:
+    """Record repository backed by a table in a SQLite database
+
+    Offers the same interface as JsonRepository, but nothing is kept in
+    memory: lookups by id and name, the next id and counts are answered by
+    indexed queries, so large registries do not need to be parsed up front.
+    """
+
+    def __init__(self, connection, lock: threading.Lock, table: str,
+                 columns: List[Tuple[str, str]], from_dict: Callable[[Dict], object],
+                 indexes: Tuple[str, ...] = ()):
+        self.connection = connection
+        self.table = table
+        self.columns = columns
+        self.from_dict = from_dict
+        self._lock = lock
+        self._names = [name for name, _ in columns]
+        self._select = f"SELECT {', '.join(self._names)} FROM {table}"
+        placeholders = ", ".join("?" for _ in self._names)
+        self._insert = f"INSERT INTO {table} ({', '.join(self._names)}) VALUES ({placeholders})"
+        self._replace = f"INSERT OR REPLACE INTO {table} ({', '.join(self._names)}) VALUES ({placeholders})"
+        self._update = (
+            f"UPDATE {table} SET {', '.join(f'{name} = ?' for name in self._names[1:])} WHERE id = ?"
+        )
+        self._create_schema(indexes)
+
+    def _create_schema(self, indexes: Tuple[str, ...]):
+        """Create the table and its secondary indexes if missing"""
+        definition = ", ".join(f"{name} {sql_type}" for name, sql_type in self.columns)
+        with self._lock, self.connection:
+            self.connection.execute(f"CREATE TABLE IF NOT EXISTS {self.table} ({definition})")
+            # Columns added in later versions
+            existing = {row[1] for row in self.connection.execute(f"PRAGMA table_info({self.table})")}
+            for name, sql_type in self.columns:
+                if name not in existing:
+                    self.connection.execute(f"ALTER TABLE {self.table} ADD COLUMN {name} {sql_type}")
+            for column in indexes:
+                self.connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{self.table}_{column} ON {self.table} ({column})"
+                )
+
+    def _row_values(self, record: object) -> List:
+        data = record.to_dict()
+        return [data.get(name) for name in self._names]
+
+    def _to_record(self, row) -> object:
+        return self.from_dict(dict(zip(self._names, row)))
+
+    def _query(self, sql: str, params=()) -> List:
+        with self._lock:
+            return self.connection.execute(sql, params).fetchall()
+
+    def reload(self):
+        """Nothing is cached, so there is nothing to reload"""
+
+    # ----- queries -----
+
+    def all(self) -> List[object]:
+        """Return all records ordered by id"""
+        return [self._to_record(row) for row in self._query(f"{self._select} ORDER BY id")]
+
+    def _where(self, where: Optional[Dict]) -> Tuple[str, List]:
+        """SQL condition and parameters for equality filters on known columns"""
+        if not where:
+            return "1", []
+        unknown = [name for name in where if name not in self._names]
+        if unknown:
+            raise ValueError(f"Unknown column '{unknown[0]}'")
+        return " AND ".join(f"{name} = ?" for name in where), list(where.values())
+
+    def count(self, where: Optional[Dict] = None) -> int:
+        """Return the number of records (matching ``where``, see scan)"""
+        condition, params = self._where(where)
+        return self._query(f"SELECT COUNT(*) FROM {self.table} WHERE {condition}", params)[0][0]
+
+    def count_by(self, columns: Tuple[str, ...], where: Optional[Dict] = None) -> Dict[Tuple, int]:
+        """Record counts per distinct combination of ``columns`` (GROUP BY)"""
+        unknown = [name for name in columns if name not in self._names]
+        if unknown:
+            raise ValueError(f"Unknown column '{unknown[0]}'")
+        condition, params = self._where(where)
+        grouping = ", ".join(columns)
+        rows = self._query(
+            f"SELECT {grouping}, COUNT(*) FROM {self.table} WHERE {condition} GROUP BY {grouping}", params
+        )
+        return {tuple(row[:-1]): row[-1] for row in rows}
+
+    def ids(self, where: Optional[Dict] = None) -> Set[int]:
+        """Ids of the records matching ``where`` (see scan)"""
+        condition, params = self._where(where)
+        return {row[0] for row in self._query(f"SELECT id FROM {self.table} WHERE {condition}", params)}
+
+    def scan(self, where: Optional[Dict] = None, batch_size: int = 1000) -> Iterator[object]:
+        """Yield the records whose columns equal the values in ``where``, by id
+
+        Rows are fetched ``batch_size`` at a time (keyed on id), so the
+        lock is not held while the caller consumes them.
+        """
+        condition, params = self._where(where)
+        last_id = None
+        while True:
+            if last_id is None:
+                sql, values = f"{self._select} WHERE {condition} ORDER BY id LIMIT ?", params + [batch_size]
+            else:
+                sql = f"{self._select} WHERE {condition} AND id > ? ORDER BY id LIMIT ?"
+                values = params + [last_id, batch_size]
+            rows = self._query(sql, values)
+            for row in rows:
+                yield self._to_record(row)
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1][0]
+
+    def get(self, record_id: int) -> Optional[object]:
+        """Return the record with the given id, if any"""
+        rows = self._query(f"{self._select} WHERE id = ?", (record_id,))
+        return self._to_record(rows[0]) if rows else None
+
+    def find_by_name(self, name: str) -> Optional[object]:
+        """Return a record with the given name, if any"""
+        rows = self._query(f"{self._select} WHERE name = ? LIMIT 1", (name,))
+        return self._to_record(rows[0]) if rows else None
+
+    def next_id(self) -> int:
+        """Return the next free id (highest id + 1)"""
+        return self._query(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {self.table}")[0][0]
+
+    # ----- mutations -----
+
+    def add(self, record: object):
+        """Insert a record"""
+        with self._lock, self.connection:
+            self.connection.execute(self._insert, self._row_values(record))
+
+    def add_many(self, records: List[object]):
+        """Insert several records in a single transaction"""
+        rows = [self._row_values(record) for record in records]
+        with self._lock, self.connection:
+            self.connection.executemany(self._insert, rows)
+
+    def update(self, record: object) -> bool:
+        """Replace the record with the same id"""
+        values = self._row_values(record)
+        with self._lock, self.connection:
+            cursor = self.connection.execute(self._update, values[1:] + [values[0]])
+        return cursor.rowcount > 0
+
+    def update_many(self, records: List[object]) -> List[object]:
+        """Replace several records in a single transaction; returns those that existed"""
+        updated = []
+        with self._lock, self.connection:
+            for record in records:
+                values = self._row_values(record)
+                if self.connection.execute(self._update, values[1:] + [values[0]]).rowcount > 0:
+                    updated.append(record)
+        return updated
+
+    def remove(self, record_id: int) -> Optional[object]:
+        """Remove a record by id"""
+        record = self.get(record_id)
+        if record is not None:
+            with self._lock, self.connection:
+                self.connection.execute(f"DELETE FROM {self.table} WHERE id = ?", (record_id,))
+        return record
+
+    def replace_all(self, records: Iterable[object], batch_size: int = 1000) -> int:
+        """Replace every record in a single transaction; returns the record count
+
+        ``records`` may be a generator: rows are inserted ``batch_size`` at a
+        time, and an error while producing them rolls the whole swap back.
+        """
+        count = 0
+        batch = []
+        with self._lock, self.connection:
+            self.connection.execute(f"DELETE FROM {self.table}")
+            for record in records:
+                batch.append(self._row_values(record))
+                if len(batch) >= batch_size:
+                    self.connection.executemany(self._replace, batch)
+                    count += len(batch)
+                    batch = []
+            self.connection.executemany(self._replace, batch)
+            count += len(batch)
+        return count
+
+
+def open_sqlite(db_path: str):
+    """Open a SQLite connection configured for the registry"""
+    import sqlite3
+    connection = sqlite3.connect(db_path, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+def migrate_json_to_sqlite(json_path: str, repository: "SQLiteRepository",
+                           from_dict: Callable[[Dict], object]) -> int:
+    """Copy every record of a JSON array file into a SQLite repository
+
+    The file is streamed (see iter_json_array) and inserted in batches, so
+    the registry is never held in memory as a whole. Returns the number of
+    migrated records.
+    """
+    return repository.replace_all(from_dict(item) for item in iter_json_array(json_path))
@@ -3,10 +3,14 @@ Structure editor UI components
 """
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, filedialog
+import os
 import json
 from typing import Dict, List, Optional
 from .models import StructureManager
-from .ui_utils import DialogManager, ValidationHelper, FormBuilder
+from .events import ChangeEvent, EVENT_REMOVED, EVENT_RESET, ENTITY_FOLDER, ENTITY_FILE
+from .materializer import resolve_location
+from .reconcile import ReconcileScanner, RepairPlan
+from .ui_utils import DialogManager, ValidationHelper, FormBuilder, LazyJsonView
 
 
 class StructureItemDialog:
@@ -107,6 +111,9 @@ class StructurePanel:
         self.structure_manager = structure_manager
         self._create_ui()
         self.refresh()
+        # Apply template change events as node deltas while the panel exists
+        unsubscribe = self.structure_manager.subscribe(self._on_structure_changed)
+        self.frame.bind("<Destroy>", lambda e: unsubscribe() if e.widget is self.frame else None)
     
     def _create_ui(self):
         """Create the UI components"""
@@ -178,6 +185,12 @@ class StructurePanel:
         btn_frame.pack(pady=10)
         
         self.notebook.add(self.json_frame, text="Raw JSON")
+        self._json_view = LazyJsonView(
+            self.notebook, self.json_frame, self.json_text,
+            snapshot=self.structure_manager.get_cached_structure,
+            serialize=lambda structure: json.dumps(structure, indent=4, ensure_ascii=False),
+            fallback='{\n    "folders": [],\n    "files": []\n}'
+        )
     
     def _add_folder(self):
         """Add new folder"""
@@ -269,7 +282,7 @@ class StructurePanel:
                     structure["folders"].append(folder_item)
                 else:
                     # Add to selected folder
-                    self._add_to_selected_folder(structure["folders"], selected, folder_item)
+                    self._add_to_selected_folder(structure, selected, folder_item)
             else:
                 # Add to files list
                 file_item = {"name": item_data["name"]}
@@ -280,26 +293,23 @@ class StructurePanel:
                 structure["files"].append(file_item)
             
             self.structure_manager.save_structure(structure)
-            self.refresh()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to add item: {e}")
     
-    def _add_to_selected_folder(self, folders: List[Dict], selected_node: str, new_folder: Dict):
+    def _find_folder(self, structure: Dict, name: str) -> Optional[Dict]:
+        """Find the first folder with the given name via the compiled name index"""
+        location = self.structure_manager.get_compiled().folder_locations.get(name)
+        if location is None:
+            return None
+        container, index = resolve_location(structure, location)
+        return container[index]
+    
+    def _add_to_selected_folder(self, structure: Dict, selected_node: str, new_folder: Dict):
         """Add folder to selected parent folder"""
         selected_name = self.tree.item(selected_node, "text")
-        
-        def find_and_add(items):
-            for item in items:
-                if item["name"] == selected_name:
-                    if "folders" not in item:
-                        item["folders"] = []
-                    item["folders"].append(new_folder)
-                    return True
-                if "folders" in item and find_and_add(item["folders"]):
-                    return True
-            return False
-        
-        find_and_add(folders)
+        folder = self._find_folder(structure, selected_name)
+        if folder is not None:
+            folder.setdefault("folders", []).append(new_folder)
     
     def _update_item_in_structure(self, old_name: str, new_data: Dict, item_type: str):
         """Update item in structure"""
@@ -307,49 +317,31 @@ class StructurePanel:
             structure = self.structure_manager.load_structure()
             
             if item_type == "Folder":
-                self._update_folder_recursive(structure["folders"], old_name, new_data)
+                item = self._find_folder(structure, old_name)
             else:
-                # Update file
-                for file_item in structure["files"]:
-                    if file_item["name"] == old_name:
-                        file_item["name"] = new_data["name"]
-                        if new_data["comment"]:
-                            file_item["comment"] = new_data["comment"]
-                        elif "comment" in file_item:
-                            del file_item["comment"]
-                        
-                        # Handle attribute for files
-                        if new_data.get("attribute", "manual") != "manual":
-                            file_item["attribute"] = new_data["attribute"]
-                        elif "attribute" in file_item:
-                            del file_item["attribute"]
-                        break
+                location = self.structure_manager.get_compiled().file_locations.get(old_name)
+                item = structure["files"][location] if location is not None else None
+            
+            if item is not None:
+                self._apply_item_changes(item, new_data)
             
             self.structure_manager.save_structure(structure)
-            self.refresh()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to update item: {e}")
     
-    def _update_folder_recursive(self, folders: List[Dict], old_name: str, new_data: Dict):
-        """Update folder recursively"""
-        for folder in folders:
-            if folder["name"] == old_name:
-                folder["name"] = new_data["name"]
-                if new_data["comment"]:
-                    folder["comment"] = new_data["comment"]
-                elif "comment" in folder:
-                    del folder["comment"]
-                
-                # Handle attribute
-                if new_data.get("attribute", "manual") != "manual":
-                    folder["attribute"] = new_data["attribute"]
-                elif "attribute" in folder:
-                    del folder["attribute"]
-                
-                return True
-            if "folders" in folder and self._update_folder_recursive(folder["folders"], old_name, new_data):
-                return True
-        return False
+    def _apply_item_changes(self, item: Dict, new_data: Dict):
+        """Apply edited name, comment and attribute to a folder or file item"""
+        item["name"] = new_data["name"]
+        if new_data["comment"]:
+            item["comment"] = new_data["comment"]
+        elif "comment" in item:
+            del item["comment"]
+        
+        # Handle attribute
+        if new_data.get("attribute", "manual") != "manual":
+            item["attribute"] = new_data["attribute"]
+        elif "attribute" in item:
+            del item["attribute"]
     
     def _remove_item_from_structure(self, name: str, item_type: str):
         """Remove item from structure"""
@@ -357,32 +349,25 @@ class StructurePanel:
             structure = self.structure_manager.load_structure()
             
             if item_type == "Folder":
-                self._remove_folder_recursive(structure["folders"], name)
+                location = self.structure_manager.get_compiled().folder_locations.get(name)
+                if location is not None:
+                    container, index = resolve_location(structure, location)
+                    del container[index]
             else:
                 structure["files"] = [f for f in structure["files"] if f["name"] != name]
             
             self.structure_manager.save_structure(structure)
-            self.refresh()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to remove item: {e}")
     
-    def _remove_folder_recursive(self, folders: List[Dict], name: str):
-        """Remove folder recursively"""
-        for i, folder in enumerate(folders):
-            if folder["name"] == name:
-                del folders[i]
-                return True
-            if "folders" in folder and self._remove_folder_recursive(folder["folders"], name):
-                return True
-        return False
-    
     def _save_json(self):
         """Save JSON text"""
         try:
             json_text = self.json_text.get("1.0", tk.END)
             structure = json.loads(json_text)
             self.structure_manager.save_structure(structure)
-            self.refresh()
+            # Show the saved data, normalized, instead of the edited text
+            self._json_view.reload()
             messagebox.showinfo("Saved", "Structure saved successfully.")
         except Exception as e:
             messagebox.showerror("Error", f"Invalid JSON: {e}")
@@ -397,7 +382,7 @@ class StructurePanel:
         self.tree.delete(*self.tree.get_children())
         
         try:
-            structure = self.structure_manager.load_structure()
+            structure = self.structure_manager.get_cached_structure()
             # Sort folders and files by sync attribute first (manual before auto), then alphabetically by name
             def sort_key(x):
                 attr = x.get("attribute", "manual")
@@ -412,7 +397,72 @@ class StructurePanel:
         except Exception:
             pass
     
-    def _insert_items(self, parent: str, items: List[Dict], is_folder: bool):
+    @staticmethod
+    def _node_iid(entity: str, path: str) -> str:
+        """Tree item id of a template node: folders by relative path, files by name"""
+        return f"{entity}:{path}"
+    
+    @staticmethod
+    def _node_sort_key(is_folder: bool, attribute: str, name: str):
+        """Folders before files, manual before auto, then by name"""
+        return (0 if is_folder else 1, 0 if attribute == "manual" else 1, name.lower())
+    
+    @staticmethod
+    def _node_values(item: Dict, is_folder: bool) -> tuple:
+        return ("Folder" if is_folder else "File", item.get("attribute", "manual"), item.get("comment", ""))
+    
+    def _insert_node(self, parent: str, index, item: Dict, is_folder: bool, path: str) -> str:
+        iid = self._node_iid(ENTITY_FOLDER if is_folder else ENTITY_FILE, path)
+        if self.tree.exists(iid):
+            iid = None  # duplicate name under one parent; let Tk pick an id
+        return self.tree.insert(
+            parent, index,
+            iid=iid,
+            text=item["name"],
+            open=True,
+            values=self._node_values(item, is_folder)
+        )
+    
+    def _sorted_index(self, parent: str, item: Dict, is_folder: bool, skip: str = None) -> int:
+        """Position among the existing children of parent that keeps them sorted"""
+        key = self._node_sort_key(is_folder, item.get("attribute", "manual"), item["name"])
+        children = [child for child in self.tree.get_children(parent) if child != skip]
+        for index, child in enumerate(children):
+            values = self.tree.item(child, "values")
+            child_key = self._node_sort_key(values[0] == "Folder", values[1], self.tree.item(child, "text"))
+            if child_key > key:
+                return index
+        return len(children)
+    
+    def _on_structure_changed(self, events: List[ChangeEvent]):
+        """Apply folder/file change events to the tree"""
+        if any(e.kind == EVENT_RESET for e in events):
+            self.refresh()
+            return
+        
+        for event in events:
+            if event.entity not in (ENTITY_FOLDER, ENTITY_FILE):
+                continue
+            is_folder = event.entity == ENTITY_FOLDER
+            iid = self._node_iid(event.entity, event.record_id)
+            if event.kind == EVENT_REMOVED:
+                # Removing a folder also removes its subtree
+                if self.tree.exists(iid):
+                    self.tree.delete(iid)
+                continue
+            
+            parent = ""
+            if is_folder and os.path.dirname(event.record_id):
+                parent = self._node_iid(ENTITY_FOLDER, os.path.dirname(event.record_id))
+            index = self._sorted_index(parent, event.record, is_folder, skip=iid)
+            if self.tree.exists(iid):
+                self.tree.item(iid, text=event.record["name"], values=self._node_values(event.record, is_folder))
+                self.tree.move(iid, parent, index)
+            else:
+                self._insert_node(parent, index, event.record, is_folder, event.record_id)
+        self._refresh_json()
+    
+    def _insert_items(self, parent: str, items: List[Dict], is_folder: bool, parent_path: str = ""):
         """Insert items into tree"""
         # Sort items by sync attribute first (manual before auto), then alphabetically by name (case-insensitive)
         def sort_key(x):
@@ -424,34 +474,16 @@ class StructurePanel:
         sorted_items = sorted(items, key=sort_key)
         
         for item in sorted_items:
-            comment = item.get("comment", "")
-            item_type = "Folder" if is_folder else "File"
-            attribute = item.get("attribute", "manual")
-            
-            values = (item_type, attribute, comment)
-            
-            node = self.tree.insert(
-                parent, "end", 
-                text=item["name"], 
-                open=True,
-                values=values
-            )
+            path = os.path.join(parent_path, item["name"]) if parent_path else item["name"]
+            node = self._insert_node(parent, "end", item, is_folder, path)
             
             # Recursively add subfolders (they will also be sorted with manual before auto, then alphabetically)
             if is_folder and "folders" in item:
-                self._insert_items(node, item["folders"], True)
+                self._insert_items(node, item["folders"], True, path)
     
     def _refresh_json(self):
-        """Refresh JSON view"""
-        try:
-            structure = self.structure_manager.load_structure()
-            json_str = json.dumps(structure, indent=4, ensure_ascii=False)
-            
-            self.json_text.delete("1.0", tk.END)
-            self.json_text.insert(tk.END, json_str)
-        except Exception:
-            self.json_text.delete("1.0", tk.END)
-            self.json_text.insert(tk.END, '{\n    "folders": [],\n    "files": []\n}')
+        """Refresh JSON view (rendered when the Raw JSON tab is shown)"""
+        self._json_view.invalidate()
 
 
 class ParentDirectoryPanel:
@@ -593,3 +625,85 @@ class StructureConfigDialog:
         """Close the dialog"""
         if self.dialog:
             self.dialog.destroy()
+
+
+class TemplateRepairDialog:
+    """Dialog that previews and applies template changes to existing projects"""
+    
+    ALL_PROJECTS = "All projects"
+    
+    def __init__(self, parent: tk.Widget, scanner: ReconcileScanner):
+        self.parent = parent
+        self.scanner = scanner
+        self.plan: Optional[RepairPlan] = None
+        self.result: Optional[RepairPlan] = None
+        groups = scanner.project_manager.load_groups()
+        self._group_ids = {self.ALL_PROJECTS: None, "No group": 0}
+        # Group labels carry the id: names are free text and may repeat or
+        # equal a built-in scope
+        self._group_ids.update((f"{group.name} (#{group.id})", group.id) for group in groups)
+        self._create_dialog()
+    
+    def _create_dialog(self):
+        self.dialog = DialogManager.create_modal_dialog(self.parent, "Re-apply Template")
+        
+        tk.Label(
+            self.dialog,
+            text="Create folders, files and shortcuts that existing projects are missing.\n"
+                 "Nothing that already exists is changed.",
+            anchor="w", justify=tk.LEFT
+        ).pack(fill=tk.X, padx=10, pady=(10, 2))
+        
+        scope_frame = tk.Frame(self.dialog)
+        tk.Label(scope_frame, text="Projects:").pack(side=tk.LEFT, padx=(0, 5))
+        self.scope_var = tk.StringVar(value=self.ALL_PROJECTS)
+        ttk.Combobox(
+            scope_frame, textvariable=self.scope_var, values=list(self._group_ids),
+            state="readonly", width=25
+        ).pack(side=tk.LEFT, padx=(0, 5))
+        tk.Button(scope_frame, text="Preview", command=self._on_preview).pack(side=tk.LEFT)
+        scope_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        self.summary_var = tk.StringVar(value="Click Preview to check the project folders.")
+        tk.Label(self.dialog, textvariable=self.summary_var, anchor="w").pack(fill=tk.X, padx=10)
+        
+        # Dry-run plan
+        self.preview = scrolledtext.ScrolledText(self.dialog, wrap=tk.NONE, width=90, height=18)
+        self.preview.config(state="disabled")
+        self.preview.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        btn_frame = tk.Frame(self.dialog)
+        self.apply_button = tk.Button(btn_frame, text="Apply", command=self._on_apply, state="disabled")
+        self.apply_button.pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame, text="Cancel", command=self.dialog.destroy).pack(side=tk.LEFT, padx=5)
+        btn_frame.pack(pady=8)
+        
+        DialogManager.auto_size_and_center(self.dialog, self.parent)
+    
+    def _on_preview(self):
+        """Build the dry-run plan for the selected projects"""
+        try:
+            self.plan = self.scanner.plan_repair(self._group_ids[self.scope_var.get()])
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to check project folders: {e}", parent=self.dialog)
+            return
+        self.summary_var.set(self.plan.summary().split("\n", 1)[0])
+        self.preview.config(state="normal")
+        self.preview.delete("1.0", tk.END)
+        for project, steps in self.plan.items.items():
+            for step in steps:
+                target = f" -> {step.target}" if step.target else ""
+                self.preview.insert(tk.END, f"+ {project}: {step.kind} {step.path}{target}\n")
+        for name in self.plan.skipped:
+            self.preview.insert(tk.END, f"- {name}: no project folder, skipped\n")
+        self.preview.config(state="disabled")
+        self.apply_button.config(state="normal" if len(self.plan) else "disabled")
+    
+    def _on_apply(self):
+        self.result = self.plan
+        self.dialog.destroy()
+    
+    def show(self) -> Optional[RepairPlan]:
+        """Show dialog and return the plan to apply"""
+        self.dialog.wait_window()
+        return self.result
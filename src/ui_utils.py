@@ -4,7 +4,9 @@ Common UI utilities and dialog helpers
 import tkinter as tk
 from tkinter import messagebox
 import datetime
-from typing import Optional
+import threading
+from typing import Any, Callable, Optional
+from .config import JSON_BACKGROUND_THRESHOLD, JSON_STREAM_CHUNK
 
 
 class DialogManager:
@@ -156,3 +158,140 @@ class FormBuilder:
                 side=tk.LEFT, padx=5
             )
         self.row += 1
+
+
+class LazyJsonView:
+    """Raw JSON tab that is only rendered while visible and out of date
+    
+    Panels call invalidate() whenever their data changes, which just bumps a
+    version counter unless the tab is showing. Rendering takes a snapshot on
+    the Tk thread; large snapshots are serialized on a worker thread and
+    streamed into the text widget in chunks so the main loop stays responsive.
+    
+    Unsaved edits in the text are never overwritten by a change elsewhere: a
+    notice above the text offers to reload instead (see reload()).
+    """
+    
+    def __init__(self, notebook, tab: tk.Widget, text: tk.Text, snapshot: Callable[[], Any],
+                 serialize: Callable[[Any], str], fallback: str = "[]"):
+        self.notebook = notebook
+        self.tab = tab
+        self.text = text
+        self.snapshot = snapshot
+        self.serialize = serialize
+        self.fallback = fallback
+        self.version = 0
+        self._rendered_version = -1
+        self._generation = 0
+        self.loading = False
+        self._notice: Optional[tk.Frame] = None
+        notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed, add="+")
+    
+    def invalidate(self):
+        """Mark the data as changed; re-render now only if the tab is visible"""
+        self.version += 1
+        if self._is_visible():
+            self._render_or_notify()
+    
+    def has_unsaved_edits(self) -> bool:
+        """Whether the user changed the text since it was last rendered"""
+        return not self.loading and bool(self.text.edit_modified())
+    
+    def reload(self):
+        """Discard any edits and render the current data"""
+        self.render()
+    
+    def _is_visible(self) -> bool:
+        try:
+            return self.notebook.select() == str(self.tab)
+        except tk.TclError:
+            return False
+    
+    def _on_tab_changed(self, event=None):
+        if self._is_visible() and self._rendered_version != self.version:
+            self._render_or_notify()
+    
+    def _render_or_notify(self):
+        if self.has_unsaved_edits():
+            self._show_notice()
+        else:
+            self.render()
+    
+    def _show_notice(self):
+        """Tell the user the data changed under their edits"""
+        if self._notice is None:
+            self._notice = tk.Frame(self.tab)
+            tk.Label(
+                self._notice, text="The data changed since this view was loaded. Your edits are kept.",
+                fg="red", anchor="w"
+            ).pack(side=tk.LEFT, fill=tk.X, expand=True)
+            tk.Button(self._notice, text="Reload", command=self.reload).pack(side=tk.RIGHT)
+        if not self._notice.winfo_manager():
+            slaves = self.tab.pack_slaves()
+            if slaves:
+                self._notice.pack(fill=tk.X, padx=8, pady=(8, 0), before=slaves[0])
+            else:
+                self._notice.pack(fill=tk.X, padx=8, pady=(8, 0))
+    
+    def _hide_notice(self):
+        if self._notice is not None and self._notice.winfo_manager():
+            self._notice.pack_forget()
+    
+    def render(self):
+        """Render the current data (superseding any render in progress)"""
+        self._hide_notice()
+        self._generation += 1
+        generation = self._generation
+        self._rendered_version = self.version
+        try:
+            data = self.snapshot()
+        except Exception:
+            self._set_text(self.fallback)
+            return
+        
+        if not isinstance(data, list) or len(data) <= JSON_BACKGROUND_THRESHOLD:
+            self._set_text(self._serialize(data))
+            return
+        
+        self._set_text("Loading...")
+        self.loading = True
+        result = {}
+        
+        def work():
+            result["text"] = self._serialize(data)
+        
+        worker = threading.Thread(target=work, name="json-view", daemon=True)
+        worker.start()
+        self._wait_for(worker, result, generation)
+    
+    def _serialize(self, data) -> str:
+        try:
+            return self.serialize(data)
+        except Exception:
+            return self.fallback
+    
+    def _set_text(self, text: str):
+        self.loading = False
+        self.text.delete("1.0", tk.END)
+        self.text.insert(tk.END, text)
+        self.text.edit_modified(False)
+    
+    def _wait_for(self, worker: threading.Thread, result: dict, generation: int):
+        if generation != self._generation:
+            return  # superseded by a newer render
+        if worker.is_alive():
+            self.text.after(20, self._wait_for, worker, result, generation)
+            return
+        self.text.delete("1.0", tk.END)
+        self._stream(result["text"], 0, generation)
+    
+    def _stream(self, text: str, offset: int, generation: int):
+        if generation != self._generation:
+            return
+        end = offset + JSON_STREAM_CHUNK
+        self.text.insert(tk.END, text[offset:end])
+        if end < len(text):
+            self.text.after(1, self._stream, text, end, generation)
+        else:
+            self.loading = False
+            self.text.edit_modified(False)
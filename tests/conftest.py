@@ -0,0 +1,58 @@
+import os
+import sys
+import json
+import types
+import pytest
+
+# Make the src package importable however pytest is started
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# fsync on every write only slows the suite down; read when src.config is imported
+os.environ.setdefault("PFM_FSYNC_POLICY", "never")
+
+# Module paths of src.models redirected into the test's directory
+REGISTRY_PATHS = {
+    "PROJECT_LISTS_FILE": "project_lists.json",
+    "PROJECT_GROUPS_FILE": "project_groups.json",
+    "PROJECT_DB_FILE": "project_registry.db",
+    "STRUCTURE_JSON": "project_folder_structure.json",
+}
+
+TEMPLATE = {
+    "max_workers": 4,
+    "link_strategy": "symlink",
+    "folders": [
+        {"name": "backup", "folders": [{"name": "database"}, {"name": "images"}]},
+        {"name": "files"},
+        {"name": "docs", "attribute": "auto"},
+    ],
+    "files": [
+        {"name": "notes.txt"},
+        {"name": "code.txt", "attribute": "auto"},
+    ],
+}
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    """Project/structure managers on registry files and folders under tmp_path
+
+    The parent and sync directories are ``tmp_path/projects`` and
+    ``tmp_path/sync``; the template is TEMPLATE.
+    """
+    from src import models
+
+    for name, filename in REGISTRY_PATHS.items():
+        monkeypatch.setattr(models, name, str(tmp_path / filename))
+    parent = tmp_path / "projects"
+    sync = tmp_path / "sync"
+    parent.mkdir()
+    sync.mkdir()
+    structure = dict(TEMPLATE, parent_directory=str(parent), sync_directory=str(sync))
+    (tmp_path / "project_folder_structure.json").write_text(json.dumps(structure), encoding="utf-8")
+    (tmp_path / "project_lists.json").write_text("[]", encoding="utf-8")
+    (tmp_path / "project_groups.json").write_text("[]", encoding="utf-8")
+
+    return types.SimpleNamespace(
+        root=str(tmp_path), parent=str(parent), sync=str(sync),
+        pm=models.ProjectManager(), sm=models.StructureManager(),
+    )
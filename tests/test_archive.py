@@ -0,0 +1,146 @@
+"""
+Tests for archiving and restoring project folders (archive.py)
+"""
+import os
+import shutil
+import pytest
+from src.archive import ProjectArchiver, ArchiveError, ARCHIVE_FORMATS, is_archivable
+from src.config import STATUS_INACTIVE
+
+
+def make_inactive(registry, name: str):
+    """Register an ended project and create its folders from the template"""
+    registry.sm.create_project_folders(
+        os.path.join(registry.parent, name), sync_path=os.path.join(registry.sync, name)
+    )
+    project = registry.pm.add_project(name, "", STATUS_INACTIVE, 0)
+    project.end_date = "2024-12-31"
+    registry.pm.update_project(project)
+    with open(os.path.join(registry.parent, name, "files", "data.bin"), "wb") as f:
+        f.write(os.urandom(3000))
+    return registry.pm.get_project(project.id)
+
+
+def snapshot_tree(root: str) -> dict:
+    """relative path -> file bytes, link target or None for directories"""
+    tree = {}
+    for directory, dirs, files in os.walk(root):
+        for name in dirs + files:
+            path = os.path.join(directory, name)
+            rel = os.path.relpath(path, root)
+            if os.path.islink(path):
+                tree[rel] = ("link", os.readlink(path))
+            elif os.path.isdir(path):
+                tree[rel] = None
+            else:
+                with open(path, "rb") as f:
+                    tree[rel] = f.read()
+    return tree
+
+
+def archive_all(archiver):
+    result = archiver.archive(archiver.archivable())
+    archiver.record(result)
+    return result, archiver.clean_up(result)
+
+
+@pytest.mark.parametrize("fmt", sorted(ARCHIVE_FORMATS))
+def test_archive_and_restore_round_trip(registry, fmt):
+    project = make_inactive(registry, "Alpha")
+    parent_path = os.path.join(registry.parent, "Alpha")
+    sync_path = os.path.join(registry.sync, "Alpha")
+    before = (snapshot_tree(parent_path), snapshot_tree(sync_path))
+    assert os.path.islink(os.path.join(parent_path, "docs"))
+
+    archiver = ProjectArchiver(registry.pm, registry.sm, fmt=fmt, max_workers=2)
+    result, cleanup = archive_all(archiver)
+    assert [p.id for p, _ in result.done] == [project.id] and not result.failed
+    assert not cleanup.failed
+    archive_path = registry.pm.get_project(project.id).archive_path
+    assert archive_path.endswith(ARCHIVE_FORMATS[fmt][0]) and os.path.exists(archive_path)
+    assert not os.path.lexists(parent_path) and not os.path.lexists(sync_path)
+    assert archiver.archivable() == []
+
+    restored = archiver.restore([registry.pm.get_project(project.id)])
+    archiver.record(restored, archived=False)
+    assert not archiver.clean_up(restored, archived=False).failed
+    assert registry.pm.get_project(project.id).archive_path == ""
+    assert not os.path.exists(archive_path)
+    assert (snapshot_tree(parent_path), snapshot_tree(sync_path)) == before
+
+
+def test_archive_keeps_folders_until_recorded(registry):
+    make_inactive(registry, "Beta")
+    archiver = ProjectArchiver(registry.pm, registry.sm, max_workers=1)
+    result = archiver.archive(archiver.archivable())
+
+    assert os.path.isdir(os.path.join(registry.parent, "Beta"))
+    assert os.path.exists(result.done[0][1])
+    assert not registry.pm.get_project_by_name("Beta").archive_path
+
+
+def test_archive_after_interrupted_run_uses_a_new_name(registry):
+    make_inactive(registry, "Gamma")
+    archiver = ProjectArchiver(registry.pm, registry.sm, max_workers=1)
+    # A run that died before record(): the archive exists, nothing is recorded
+    first = archiver.archive(archiver.archivable())
+
+    result, cleanup = archive_all(archiver)
+    assert not result.failed and not cleanup.failed
+    second = registry.pm.get_project_by_name("Gamma").archive_path
+    assert second != first.done[0][1]
+    assert os.path.exists(first.done[0][1]) and os.path.exists(second)
+
+
+def test_archive_unlinks_symlinked_root(registry, tmp_path):
+    make_inactive(registry, "Delta")
+    # The sync counterpart is a symlink to a folder elsewhere
+    sync_path = os.path.join(registry.sync, "Delta")
+    elsewhere = tmp_path / "elsewhere"
+    shutil.move(sync_path, elsewhere)
+    os.symlink(elsewhere, sync_path)
+
+    archiver = ProjectArchiver(registry.pm, registry.sm, max_workers=1)
+    result, cleanup = archive_all(archiver)
+
+    assert not result.failed and not cleanup.failed
+    assert not os.path.lexists(sync_path)
+    assert elsewhere.is_dir()  # the link target is not deleted
+
+
+def test_archive_removal_failure_keeps_record(registry, monkeypatch):
+    make_inactive(registry, "Epsilon")
+
+    def failing_rmtree(path, *args, **kwargs):
+        raise PermissionError(13, "in use", path)
+
+    monkeypatch.setattr(shutil, "rmtree", failing_rmtree)
+    archiver = ProjectArchiver(registry.pm, registry.sm, max_workers=1)
+    result, cleanup = archive_all(archiver)
+
+    assert len(result.done) == 1 and not result.failed
+    project = registry.pm.get_project_by_name("Epsilon")
+    assert project.archive_path and os.path.exists(project.archive_path)
+    assert [name for name, _ in cleanup.failed] == ["Epsilon"]
+    assert "delete it by hand" in cleanup.failed[0][1]
+    assert os.path.isdir(os.path.join(registry.parent, "Epsilon"))
+
+
+def test_only_ended_inactive_projects_are_archivable(registry):
+    active = registry.pm.add_project("Active", "", "active", 0)
+    open_ended = registry.pm.add_project("Open", "", STATUS_INACTIVE, 0)
+    assert not is_archivable(active)
+    assert not is_archivable(open_ended)
+    with pytest.raises(ArchiveError):
+        ProjectArchiver(registry.pm, registry.sm).archive_one(active)
+
+
+def test_restore_refuses_existing_folder(registry):
+    make_inactive(registry, "Zeta")
+    archiver = ProjectArchiver(registry.pm, registry.sm, max_workers=1)
+    archive_all(archiver)
+    os.makedirs(os.path.join(registry.parent, "Zeta"))
+
+    restored = archiver.restore([registry.pm.get_project_by_name("Zeta")])
+    assert restored.failed and "already exists" in restored.failed[0][1]
+    assert os.path.exists(registry.pm.get_project_by_name("Zeta").archive_path)
@@ -0,0 +1,76 @@
+"""
+Tests for the hot-path benchmark driver (benchmarks/models_hot_paths.py)
+"""
+import os
+import json
+import importlib.util
+import pytest
+
+BENCHMARK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         "benchmarks", "models_hot_paths.py")
+
+
+@pytest.fixture(scope="module")
+def bench():
+    spec = importlib.util.spec_from_file_location("models_hot_paths", BENCHMARK)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def results(bench, **medians):
+    return {
+        "version": bench.RESULTS_VERSION,
+        "meta": {"backend": "json"},
+        "results": {case: {"median_ms": ms} for case, ms in medians.items()},
+    }
+
+
+def test_summarize(bench):
+    stats = bench.summarize([0.004, 0.001, 0.002, 0.003], number=2)
+    assert stats["samples"] == 4 and stats["number"] == 2
+    assert stats["min_ms"] == pytest.approx(0.5)
+    assert stats["median_ms"] == pytest.approx(1.25)
+    assert stats["p95_ms"] == pytest.approx(2.0)
+
+
+def test_compare_flags_regressions_above_threshold_and_noise_floor(bench):
+    base = results(bench, slow=10.0, fast=10.0, same=10.0, tiny=0.001, gone=1.0)
+    new = results(bench, slow=13.0, fast=5.0, same=10.5, tiny=0.01, added=2.0)
+    status = {row[0]: row[4] for row in bench.compare(base, new, threshold=0.2, min_ms=0.05)}
+
+    assert status == {
+        "slow": "REGRESSION", "fast": "faster", "same": "ok", "tiny": "ok", "added": "new", "gone": "missing",
+    }
+
+
+def test_compare_command_exit_status(bench, tmp_path, capsys):
+    base, good, bad = tmp_path / "base.json", tmp_path / "good.json", tmp_path / "bad.json"
+    base.write_text(json.dumps(results(bench, case=10.0)))
+    good.write_text(json.dumps(results(bench, case=9.0)))
+    bad.write_text(json.dumps(results(bench, case=20.0)))
+
+    assert bench.main(["compare", str(base), str(good)]) == 0
+    assert bench.main(["compare", str(base), str(bad)]) == 1
+    assert "1 regression(s)" in capsys.readouterr().out
+    bad.write_text(json.dumps({"version": 0}))
+    assert bench.main(["compare", str(base), str(bad)]) == 2
+
+
+def test_small_run_writes_results(bench, tmp_path):
+    from src import models
+
+    paths = {name: getattr(models, name) for name in bench.REGISTRY_PATHS}
+    output = tmp_path / "results.json"
+    code = bench.main([
+        "run", "--sizes", "30", "--groups", "3", "--nodes", "12", "--repeat", "1",
+        "--dir", str(tmp_path), "--output", str(output),
+    ])
+
+    assert code == 0
+    data = json.loads(output.read_text())
+    assert data["version"] == bench.RESULTS_VERSION
+    assert "projects=30/load_projects (cold)" in data["results"]
+    assert any(case.startswith("nodes=12/") for case in data["results"])
+    # The models module points at the real registry files again
+    assert {name: getattr(models, name) for name in bench.REGISTRY_PATHS} == paths
@@ -0,0 +1,72 @@
+"""
+Tests for project name checks and the bulk import pipeline (bulk_import.py)
+"""
+import os
+import pytest
+from src.bulk_import import BulkImporter
+from src.cli import main as cli_main
+from src.models import folder_name_error
+
+
+@pytest.mark.parametrize("name", ["..", "a/../b", "a/b", "a:b", "tab\there", "CON", "nul.txt", "ends.", "ends "])
+def test_folder_name_error_rejects(name):
+    assert folder_name_error(name)
+
+
+@pytest.mark.parametrize("name", ["Alpha", "Project 2024", "v1.2 release", "CONSOLE"])
+def test_folder_name_error_accepts(name):
+    assert folder_name_error(name) is None
+
+
+def test_validate_rejects_bad_rows(registry):
+    registry.pm.add_project("Taken")
+    os.makedirs(os.path.join(registry.parent, "OnDisk"))
+    importer = BulkImporter(registry.pm, registry.sm)
+    valid, rejected = importer.validate([
+        {"name": "Good", "status": "active"},
+        {"name": "Good"},
+        {"name": "../escape"},
+        {"name": "Taken"},
+        {"name": "OnDisk"},
+        {"name": "Bad status", "status": "nope"},
+        {"name": "Bad date", "start_date": "2024-13-01"},
+        {"name": ""},
+    ])
+    assert [p.name for p in valid] == ["Good"]
+    assert [name for name, _ in rejected] == [
+        "Good", "../escape", "Taken", "OnDisk", "Bad status", "Bad date", ""
+    ]
+
+
+def test_prepare_then_commit(registry):
+    importer = BulkImporter(registry.pm, registry.sm)
+    projects, _ = importer.validate([{"name": "One"}, {"name": "Two"}])
+    reports = []
+    result = importer.prepare(projects, progress=lambda done, total: reports.append((done, total)))
+
+    # Folders exist but nothing is registered until commit()
+    assert sorted(p.name for p in result.ready) == ["One", "Two"]
+    assert os.path.isdir(os.path.join(registry.parent, "One", "backup", "database"))
+    assert registry.pm.get_project_by_name("One") is None
+    assert sorted(reports) == [(1, 2), (2, 2)]
+
+    importer.commit(result)
+    assert sorted(p.name for p in result.created) == ["One", "Two"]
+    assert registry.pm.get_project_by_name("Two") is not None
+
+
+def test_prepare_cancelled_skips_remaining(registry):
+    importer = BulkImporter(registry.pm, registry.sm)
+    projects, _ = importer.validate([{"name": "A"}, {"name": "B"}])
+    result = importer.prepare(projects, cancelled=lambda: True)
+
+    assert result.ready == []
+    assert result.skipped == [("A", "Cancelled"), ("B", "Cancelled")]
+    assert not os.path.exists(os.path.join(registry.parent, "A"))
+
+
+def test_cli_create_refuses_folder_escape(registry, capsys):
+    assert cli_main(["create", "../outside"]) != 0
+    assert "'..'" in capsys.readouterr().err
+    assert registry.pm.get_project_by_name("../outside") is None
+    assert not os.path.exists(os.path.join(registry.root, "outside"))
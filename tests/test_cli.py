@@ -0,0 +1,64 @@
+"""
+Tests for the headless command line interface (cli.py)
+"""
+import os
+import sys
+import json
+import subprocess
+import pytest
+from src.cli import main
+
+
+def run(capsys, *argv):
+    """Run the CLI; returns (exit code, stdout, stderr)"""
+    code = main(list(argv))
+    captured = capsys.readouterr()
+    return code, captured.out, captured.err
+
+
+@pytest.mark.parametrize("backend", ["json", "journal", "sqlite"])
+def test_project_commands(registry, capsys, backend):
+    assert run(capsys, "--backend", backend, "group", "create", "Clients")[0] == 0
+    code, out, _ = run(capsys, "--backend", backend, "create", "Alpha", "--group", "Clients")
+    assert code == 0 and "created with ID 1" in out
+    assert os.path.isdir(os.path.join(registry.parent, "Alpha", "backup", "images"))
+    assert run(capsys, "--backend", backend, "create", "Beta", "--no-folders", "--status", "inactive")[0] == 0
+    assert not os.path.exists(os.path.join(registry.parent, "Beta"))
+
+    code, out, _ = run(capsys, "--backend", backend, "list", "--json")
+    assert [(p["name"], p["status"]) for p in json.loads(out)] == [("Beta", "inactive"), ("Alpha", "active")]
+    assert run(capsys, "--backend", backend, "count", "--group", "Clients")[1].strip() == "1"
+    assert run(capsys, "--backend", backend, "count", "--status", "inactive")[1].strip() == "1"
+
+    assert run(capsys, "--backend", backend, "update", "2", "--end-date", "2024-05-01")[0] == 0
+    assert json.loads(run(capsys, "--backend", backend, "show", "2")[1])["end_date"] == "2024-05-01"
+    assert run(capsys, "--backend", backend, "delete", "2")[0] == 0
+    assert run(capsys, "--backend", backend, "count")[1].strip() == "1"
+
+
+def test_user_errors_exit_with_message(registry, capsys):
+    code, _, err = run(capsys, "show", "42")
+    assert code == 1 and "Project with ID 42 not found" in err
+    code, _, err = run(capsys, "update", "1", "--start-date", "yesterday")
+    assert code == 1 and "not found" in err
+    run(capsys, "create", "Alpha", "--no-folders")
+    code, _, err = run(capsys, "update", "1", "--start-date", "yesterday")
+    assert code == 1 and "YYYY-MM-DD" in err
+    code, _, err = run(capsys, "create", "Gamma", "--group", "Missing")
+    assert code == 1 and "Group 'Missing' not found" in err
+    code, _, err = run(capsys, "create", "Alpha", "--no-folders")
+    assert code == 1 and "already exists" in err
+
+
+def test_existing_folder_is_not_reused(registry, capsys):
+    os.makedirs(os.path.join(registry.parent, "Taken"))
+    code, _, err = run(capsys, "create", "Taken")
+    assert code == 1 and "already exists" in err
+    assert registry.pm.get_project_by_name("Taken") is None
+
+
+def test_cli_does_not_import_tkinter():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = "import sys, src.cli; print('tkinter' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", script], cwd=root, capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "False"
@@ -0,0 +1,84 @@
+"""
+Tests for per-project folder statistics (folder_stats.py)
+"""
+import os
+import pytest
+from src import folder_stats
+from src.folder_stats import FolderStatsIndex, format_size
+from src.materializer import MaterializeCancelled
+
+
+def make_project(registry, name: str, sizes=(100, 250)):
+    """Create a project's folders with files of the given sizes in files/ and docs/"""
+    registry.sm.create_project_folders(
+        os.path.join(registry.parent, name), sync_path=os.path.join(registry.sync, name)
+    )
+    for folder, size in zip(("files", "docs"), sizes):
+        with open(os.path.join(registry.parent, name, folder, "data.bin"), "wb") as f:
+            f.write(b"x" * size)
+
+
+@pytest.fixture
+def index(registry, monkeypatch):
+    monkeypatch.setattr(folder_stats, "CACHE_MIN_AGE_NS", -1)
+    return FolderStatsIndex(registry.sm, cache_file=os.path.join(registry.root, "folder_stats.json"))
+
+
+def test_totals_cover_parent_and_sync_without_following_links(registry, index):
+    make_project(registry, "Alpha")
+    stats = index.collect(["Alpha"])["Alpha"]
+
+    # notes.txt + files/data.bin in the parent tree, code.txt + docs/data.bin
+    # in the sync tree; the docs and code.txt shortcuts are not followed
+    assert (stats.size, stats.files) == (350, 4)
+    assert stats.modified > 0
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_unchanged_directories_are_reused(registry, index, max_workers):
+    make_project(registry, "Alpha")
+    make_project(registry, "Beta")
+    first = index.collect(["Alpha", "Beta"], max_workers=max_workers)
+    listed = index.listed
+
+    second = index.collect(["Alpha", "Beta"], max_workers=max_workers)
+    assert index.listed == 0 and index.reused == listed
+    assert {name: s.to_list() for name, s in second.items()} == {name: s.to_list() for name, s in first.items()}
+
+    # A new index picks the listings up from the cache file
+    reloaded = FolderStatsIndex(registry.sm, cache_file=index.cache_file)
+    assert reloaded.get("Alpha").to_list() == first["Alpha"].to_list()
+    reloaded.collect(["Alpha", "Beta"], max_workers=max_workers)
+    assert reloaded.listed == 0
+
+
+def test_added_file_is_counted(registry, index):
+    make_project(registry, "Alpha")
+    before = index.collect(["Alpha"])["Alpha"]
+    with open(os.path.join(registry.parent, "Alpha", "backup", "new.bin"), "wb") as f:
+        f.write(b"y" * 10)
+
+    after = index.collect(["Alpha"])["Alpha"]
+    assert index.listed == 1
+    assert (after.size, after.files) == (before.size + 10, before.files + 1)
+
+
+def test_projects_no_longer_listed_are_dropped(registry, index):
+    make_project(registry, "Alpha")
+    make_project(registry, "Beta")
+    index.collect(["Alpha", "Beta"])
+
+    assert set(index.collect(["Beta"])) == {"Beta"}
+    assert index.get("Alpha") is None
+
+
+def test_collect_cancelled(registry, index):
+    make_project(registry, "Alpha")
+    with pytest.raises(MaterializeCancelled):
+        index.collect(["Alpha"], cancelled=lambda: True)
+
+
+def test_format_size():
+    assert format_size(512) == "512 B"
+    assert format_size(1536) == "1.5 KB"
+    assert format_size(5 * 1024 ** 3) == "5.0 GB"
@@ -0,0 +1,78 @@
+"""
+Tests for the group -> projects index and group aggregates (group_index.py)
+"""
+import random
+import pytest
+from src import models
+
+
+def expected(pm):
+    """Group members and status counts computed from the full project list"""
+    members, counts = {}, {}
+    for project in pm.load_projects():
+        members.setdefault(project.group_id, set()).add(project.id)
+        group_counts = counts.setdefault(project.group_id, {})
+        group_counts[project.status] = group_counts.get(project.status, 0) + 1
+    return members, counts
+
+
+def assert_consistent(pm):
+    members, counts = expected(pm)
+    assert pm.get_group_counts() == counts
+    for group_id in set(members) | {g.id for g in pm.load_groups()}:
+        assert pm.get_group_project_ids(group_id) == members.get(group_id, set())
+        assert pm.get_group_counts(group_id) == counts.get(group_id, {})
+        assert [p.id for p in pm.get_projects_in_group(group_id)] == sorted(members.get(group_id, ()))
+
+
+@pytest.mark.parametrize("backend", ["json", "journal", "sqlite"])
+def test_index_follows_random_changes(registry, backend):
+    pm = models.ProjectManager(backend)
+    rng = random.Random(25)
+    groups = [pm.add_group(f"group {i}").id for i in range(4)]
+    for i in range(60):
+        pm.add_project(f"p{i}", "", rng.choice(["active", "inactive"]), rng.choice([0] + groups))
+    assert_consistent(pm)
+
+    for step in range(80):
+        projects = pm.load_projects()
+        action = rng.random()
+        if action < 0.5:
+            project = rng.choice(projects)
+            project.group_id = rng.choice([0] + groups)
+            project.status = rng.choice(["active", "inactive"])
+            pm.update_project(project)
+        elif action < 0.7:
+            pm.delete_project(rng.choice(projects).id)
+        elif action < 0.9:
+            pm.add_project(f"new {step}", "", "active", rng.choice([0] + groups))
+        else:
+            pm.set_group_project_status(rng.choice(groups), rng.choice(["active", "inactive"]))
+    assert_consistent(pm)
+
+    pm.delete_group(groups[0])
+    assert_consistent(pm)
+
+
+def test_index_rebuilds_after_outside_change(registry):
+    pm = models.ProjectManager("json")
+    group = pm.add_group("Clients")
+    pm.add_project("Alpha", "", "active", group.id)
+    assert pm.get_group_counts(group.id) == {"active": 1}
+
+    # Another process (here: another manager) changes the file
+    other = models.ProjectManager("json")
+    other.add_project("Beta", "", "inactive", group.id)
+
+    assert pm.get_group_counts(group.id) == {"active": 1, "inactive": 1}
+    assert_consistent(pm)
+
+
+def test_index_after_bulk_save(registry):
+    pm = models.ProjectManager("json")
+    pm.add_project("Alpha")
+    assert pm.get_group_counts(0) == {"active": 1}
+
+    pm.save_projects([models.Project(5, "Five", status="inactive", group_id=2)])
+    assert pm.get_group_counts() == {2: {"inactive": 1}}
+    assert_consistent(pm)
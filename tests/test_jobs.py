@@ -0,0 +1,121 @@
+"""
+Tests for the background job queue (jobs.py)
+"""
+import time
+import threading
+import pytest
+from src.events import EVENT_ADDED, EVENT_UPDATED, EVENT_REMOVED
+from src.jobs import JobQueue, JOB_DONE, JOB_FAILED, JOB_CANCELLED, JOB_QUEUED
+from src.materializer import MaterializeCancelled
+
+
+class FakeRoot:
+    """Stands in for the Tk root: after() callbacks run when pumped"""
+
+    def __init__(self):
+        self.thread = threading.current_thread()
+        self.pending = []
+
+    def after(self, ms, func, *args):
+        self.pending.append((func, args))
+
+    def pump(self, queue: JobQueue, timeout: float = 10):
+        """Run scheduled callbacks until no job is active"""
+        deadline = time.monotonic() + timeout
+        while self.pending or queue.active():
+            assert time.monotonic() < deadline, "jobs did not finish"
+            pending, self.pending = self.pending, []
+            for func, args in pending:
+                func(*args)
+            time.sleep(0.005)
+
+
+@pytest.fixture
+def root():
+    return FakeRoot()
+
+
+@pytest.fixture
+def jobs(root):
+    queue = JobQueue(root, max_workers=2)
+    yield queue
+    queue.shutdown()
+
+
+def test_callbacks_run_on_the_polling_thread(root, jobs):
+    calls = []
+
+    def work(job):
+        job.report(1, 2)
+        return threading.current_thread()
+
+    def on_done(job):
+        calls.append((job.status, threading.current_thread()))
+
+    job = jobs.submit("work", work, on_done)
+    root.pump(jobs)
+
+    assert calls == [(JOB_DONE, root.thread)]
+    assert job.result is not root.thread  # the work itself ran on a worker
+    assert (job.done, job.total) == (1, 2) and job.progress_text() == "1/2 (50%)"
+
+
+def test_failed_and_cancelled_jobs(root, jobs):
+    def fail(job):
+        raise OSError("disk full")
+
+    def stop(job):
+        raise MaterializeCancelled()
+
+    failed = jobs.submit("fail", fail)
+    cancelled = jobs.submit("stop", stop)
+    root.pump(jobs)
+
+    assert failed.status == JOB_FAILED and str(failed.error) == "disk full"
+    assert cancelled.status == JOB_CANCELLED
+
+
+def test_queued_job_cancelled_before_start_never_runs(root):
+    jobs = JobQueue(root, max_workers=1)
+    release = threading.Event()
+    ran = []
+    try:
+        blocker = jobs.submit("blocker", lambda job: release.wait(10))
+        queued = jobs.submit("queued", lambda job: ran.append(job.id))
+        assert queued.status == JOB_QUEUED
+        queued.cancel()
+        release.set()
+        root.pump(jobs)
+    finally:
+        jobs.shutdown()
+
+    assert blocker.status == JOB_DONE
+    assert queued.status == JOB_CANCELLED and ran == []
+
+
+def test_listeners_see_added_updated_removed(root, jobs):
+    seen = []
+    jobs.subscribe(lambda events: seen.extend((event.kind, event.record_id) for event in events))
+
+    job = jobs.submit("work", lambda job: None)
+    root.pump(jobs)
+    jobs.clear_finished()
+
+    assert seen[0] == (EVENT_ADDED, job.id)
+    assert (EVENT_UPDATED, job.id) in seen
+    assert seen[-1] == (EVENT_REMOVED, job.id)
+    assert jobs.jobs == []
+
+
+def test_failing_callback_does_not_stop_the_queue(root, jobs, capsys):
+    done = []
+
+    def broken(job):
+        raise RuntimeError("callback bug")
+
+    jobs.submit("first", lambda job: 1, broken)
+    jobs.submit("second", lambda job: 2, lambda job: done.append(job.result))
+    root.pump(jobs)
+
+    assert done == [2]
+    assert "callback bug" in capsys.readouterr().err
@@ -0,0 +1,46 @@
+"""
+Tests for the streaming JSON array reader (storage.iter_json_array)
+"""
+import json
+import pytest
+from src.models import Project
+from src.storage import iter_json_array
+
+
+ITEMS = [
+    1, -12345678901234567890, 1.5e300, 0.000123, True, False, None,
+    "plain", "with ] and , and \" inside", "unicodé ✓  ", "",
+    {}, [], {"nested": [1, {"deep": ["x", 2.5]}], "empty": {}},
+    [[[]]], Project(id=7, name="project-7", description="a, b ] c").to_dict(),
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64 * 1024])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_iter_json_array_round_trip(tmp_path, chunk_size, indent):
+    path = str(tmp_path / "items.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(ITEMS, f, indent=indent, ensure_ascii=False)
+
+    assert list(iter_json_array(path, chunk_size)) == ITEMS
+
+
+@pytest.mark.parametrize("text", ["[]", "  [ \n ]  \n", "", "   \n"])
+def test_iter_json_array_empty(tmp_path, text):
+    path = tmp_path / "items.json"
+    path.write_text(text, encoding="utf-8")
+
+    assert list(iter_json_array(str(path), 3)) == []
+
+
+def test_iter_json_array_missing_file(tmp_path):
+    assert list(iter_json_array(str(tmp_path / "missing.json"))) == []
+
+
+@pytest.mark.parametrize("text", ['{"id": 1}', "[1, 2", "[1 2]", '[{"id": 1}, {"id": ', "[1,]x"])
+def test_iter_json_array_rejects_invalid(tmp_path, text):
+    path = tmp_path / "items.json"
+    path.write_text(text, encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        list(iter_json_array(str(path), 2))
@@ -0,0 +1,103 @@
+"""
+Tests for the link strategies and the "auto" probe (links.py)
+"""
+import os
+import pytest
+from src import links
+from src.links import (
+    LinkMaker, SymlinkStrategy, RelativeSymlinkStrategy, HardlinkStrategy, TextStubStrategy,
+    choose_strategy, STUB_SUFFIX,
+)
+
+
+@pytest.fixture
+def trees(tmp_path):
+    parent = tmp_path / "parent"
+    sync = tmp_path / "sync"
+    parent.mkdir()
+    sync.mkdir()
+    (sync / "docs").mkdir()
+    (sync / "code.txt").write_text("code", encoding="utf-8")
+    return str(parent), str(sync)
+
+
+def test_symlink_strategies_link_files_and_folders(trees):
+    parent, sync = trees
+    for strategy in (SymlinkStrategy(), RelativeSymlinkStrategy()):
+        folder_link = os.path.join(parent, f"docs-{strategy.name}")
+        file_link = os.path.join(parent, f"code-{strategy.name}.txt")
+        strategy.create(folder_link, os.path.join(sync, "docs"), True)
+        strategy.create(file_link, os.path.join(sync, "code.txt"), False)
+        assert os.path.samefile(folder_link, os.path.join(sync, "docs"))
+        with open(file_link, encoding="utf-8") as f:
+            assert f.read() == "code"
+    assert not os.path.isabs(os.readlink(os.path.join(parent, "docs-relative-symlink")))
+
+
+def test_hardlink_refuses_folders(trees):
+    parent, sync = trees
+    strategy = HardlinkStrategy()
+    strategy.create(os.path.join(parent, "code.txt"), os.path.join(sync, "code.txt"), False)
+    assert os.path.samefile(os.path.join(parent, "code.txt"), os.path.join(sync, "code.txt"))
+    with pytest.raises(OSError):
+        strategy.create(os.path.join(parent, "docs"), os.path.join(sync, "docs"), True)
+
+
+def test_link_maker_writes_stub_and_records_failure(trees):
+    parent, sync = trees
+    maker = LinkMaker(HardlinkStrategy())
+    maker(os.path.join(parent, "code.txt"), os.path.join(sync, "code.txt"))
+    maker(os.path.join(parent, "docs"), os.path.join(sync, "docs"))
+
+    assert maker.created == 1
+    assert [failure[0] for failure in maker.failures] == [os.path.join(parent, "docs")]
+    with open(os.path.join(parent, "docs" + STUB_SUFFIX), encoding="utf-8") as f:
+        stub = f.read()
+    assert os.path.join(sync, "docs") in stub and "Error creating shortcut" in stub
+    assert "1 shortcut(s) created with 'hardlink', 1 failed." in maker.summary()
+
+
+def test_choose_strategy_by_name(trees):
+    parent, sync = trees
+    assert isinstance(choose_strategy("stub", parent, sync), TextStubStrategy)
+    with pytest.raises(ValueError):
+        choose_strategy("carrier-pigeon", parent, sync)
+
+
+def test_auto_skips_hardlink_when_folders_need_links(trees, monkeypatch):
+    parent, sync = trees
+    # No symlink permission: only hard links work on this "file system"
+    monkeypatch.setattr(links, "candidate_strategies", lambda: ["symlink", "hardlink", "stub"])
+
+    def no_symlinks(*args, **kwargs):
+        raise PermissionError("symlinks not permitted")
+
+    monkeypatch.setattr(os, "symlink", no_symlinks)
+    assert isinstance(choose_strategy("auto", parent, sync, directories=True), TextStubStrategy)
+    assert isinstance(choose_strategy("auto", parent, sync, directories=False), HardlinkStrategy)
+
+
+def test_auto_probe_leaves_no_scratch_folders(trees):
+    parent, sync = trees
+    before = (sorted(os.listdir(parent)), sorted(os.listdir(sync)))
+    assert choose_strategy("auto", parent, sync).name in ("symlink", "lnk")
+    assert (sorted(os.listdir(parent)), sorted(os.listdir(sync))) == before
+
+
+def test_auto_probe_of_missing_root_uses_temp_dir(tmp_path, monkeypatch):
+    scratch = tmp_path / "tmp"
+    scratch.mkdir()
+    monkeypatch.setattr(links.tempfile, "gettempdir", lambda: str(scratch))
+    created = []
+    real_mkdtemp = links.tempfile.mkdtemp
+
+    def recording_mkdtemp(*args, **kwargs):
+        path = real_mkdtemp(*args, **kwargs)
+        created.append(os.path.dirname(path))
+        return path
+
+    monkeypatch.setattr(links.tempfile, "mkdtemp", recording_mkdtemp)
+    choose_strategy("auto", str(tmp_path / "not" / "yet" / "parent"), str(tmp_path / "nor" / "sync"))
+
+    assert created and set(created) == {str(scratch)}
+    assert sorted(os.listdir(tmp_path)) == ["tmp"]
@@ -0,0 +1,142 @@
+"""
+Tests for materialization plans and their threaded and asyncio execution
+(materializer.py)
+"""
+import os
+import asyncio
+import pytest
+from conftest import TEMPLATE
+from src.materializer import (
+    CompiledStructure, MaterializeCancelled, STEP_DIR, STEP_FILE, STEP_LINK,
+    build_plan, execute_plan, execute_plan_async, resolve_location,
+)
+
+
+def tree(root: str) -> set:
+    """Relative paths below root, with "/" for directories and "@" for links"""
+    paths = set()
+    for directory, dirs, files in os.walk(root):
+        for name in dirs + files:
+            path = os.path.join(directory, name)
+            rel = os.path.relpath(path, root)
+            if os.path.islink(path):
+                paths.add(rel + "@")
+            elif os.path.isdir(path):
+                paths.add(rel + "/")
+            else:
+                paths.add(rel)
+    return paths
+
+
+def make_link(path, target, target_is_dir):
+    os.symlink(target, path, target_is_directory=bool(target_is_dir))
+
+
+def test_plan_levels_follow_dependencies(tmp_path):
+    parent, sync = str(tmp_path / "p"), str(tmp_path / "s")
+    plan = build_plan(TEMPLATE, parent, sync)
+    level_of = {step.path: step.level for step in plan.steps()}
+
+    for step in plan.steps():
+        parent_level = level_of.get(os.path.dirname(step.path))
+        if parent_level is not None:
+            assert step.level > parent_level
+        if step.kind == STEP_LINK:
+            assert step.level > level_of[step.target]
+    links = {step.path: (step.target, step.target_is_dir) for step in plan.steps() if step.kind == STEP_LINK}
+    assert links == {
+        os.path.join(parent, "docs"): (os.path.join(sync, "docs"), True),
+        os.path.join(parent, "code.txt"): (os.path.join(sync, "code.txt"), False),
+    }
+
+
+def test_plan_without_sync_creates_everything_in_parent(tmp_path):
+    parent = str(tmp_path / "p")
+    plan = build_plan(TEMPLATE, parent, None)
+
+    assert {step.kind for step in plan.steps()} == {STEP_DIR, STEP_FILE}
+    assert all(step.path.startswith(parent) for step in plan.steps())
+
+
+def test_compiled_structure_locations():
+    compiled = CompiledStructure(TEMPLATE)
+
+    assert compiled.has_auto_items
+    container, index = resolve_location(TEMPLATE, compiled.folder_locations["images"])
+    assert container[index]["name"] == "images"
+    container, index = resolve_location(TEMPLATE, compiled.file_locations["code.txt"])
+    assert container[index]["name"] == "code.txt"
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_execute_plan_creates_tree(tmp_path, max_workers):
+    parent, sync = str(tmp_path / "p"), str(tmp_path / "s")
+    plan = build_plan(TEMPLATE, parent, sync)
+    reports = []
+
+    execute_plan(plan, make_link, max_workers, progress=lambda done, total: reports.append((done, total)))
+
+    assert tree(parent) == {
+        "backup/", "backup/database/", "backup/images/", "files/", "docs@", "notes.txt", "code.txt@"
+    }
+    assert tree(sync) == {"docs/", "code.txt"}
+    assert sorted(reports) == [(i, len(plan)) for i in range(1, len(plan) + 1)]
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_execute_plan_cancelled(tmp_path, max_workers):
+    parent = str(tmp_path / "p")
+    plan = build_plan(TEMPLATE, parent, None)
+
+    with pytest.raises(MaterializeCancelled):
+        execute_plan(plan, make_link, max_workers, cancelled=lambda: True)
+    assert not os.path.exists(parent)
+
+
+def test_execute_plan_raises_first_error(tmp_path):
+    parent, sync = str(tmp_path / "p"), str(tmp_path / "s")
+
+    def failing_link(path, target, target_is_dir):
+        raise OSError("no links here")
+
+    with pytest.raises(OSError, match="no links here"):
+        execute_plan(build_plan(TEMPLATE, parent, sync), failing_link, 4)
+
+
+
+# ----- asyncio variant -----
+
+def test_execute_plan_async_matches_threaded(tmp_path):
+    threaded, awaited = tmp_path / "threaded", tmp_path / "async"
+    execute_plan(build_plan(TEMPLATE, str(threaded / "p"), str(threaded / "s")), make_link, 4)
+    plan = build_plan(TEMPLATE, str(awaited / "p"), str(awaited / "s"))
+    reports = []
+
+    asyncio.run(execute_plan_async(plan, make_link, 3, progress=lambda done, total: reports.append(done)))
+
+    assert tree(str(awaited)) == tree(str(threaded))
+    assert sorted(reports) == list(range(1, len(plan) + 1))
+
+
+def test_execute_plan_async_cancelled_and_failing(tmp_path):
+    plan = build_plan(TEMPLATE, str(tmp_path / "p"), str(tmp_path / "s"))
+    with pytest.raises(MaterializeCancelled):
+        asyncio.run(execute_plan_async(plan, make_link, cancelled=lambda: True))
+    assert not os.path.exists(tmp_path / "p")
+
+    def failing_link(path, target, target_is_dir):
+        raise OSError("no links here")
+
+    with pytest.raises(OSError, match="no links here"):
+        asyncio.run(execute_plan_async(plan, failing_link))
+
+
+def test_create_project_folders_async(registry):
+    project = os.path.join(registry.parent, "Alpha")
+    links = asyncio.run(registry.sm.create_project_folders_async(
+        project, sync_path=os.path.join(registry.sync, "Alpha"), concurrency=2
+    ))
+
+    assert not links.failures
+    assert os.path.islink(os.path.join(project, "docs"))
+    assert os.path.isdir(os.path.join(registry.sync, "Alpha", "docs"))
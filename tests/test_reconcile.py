@@ -0,0 +1,180 @@
+"""
+Tests for the registry/disk reconciliation scanner and template repair
+(reconcile.py)
+"""
+import os
+import time
+import shutil
+import threading
+import pytest
+from src import reconcile
+from src.reconcile import DirectoryLister, ReconcileScanner
+
+
+def make_project(registry, name: str):
+    """Register a project and create its folders from the template"""
+    registry.sm.create_project_folders(
+        os.path.join(registry.parent, name), sync_path=os.path.join(registry.sync, name)
+    )
+    return registry.pm.add_project(name)
+
+
+@pytest.fixture
+def scanner(registry):
+    return ReconcileScanner(registry.pm, registry.sm, cache_file=os.path.join(registry.root, "reconcile.json"))
+
+
+def test_clean_registry(registry, scanner):
+    make_project(registry, "Alpha")
+    make_project(registry, "Beta")
+    report = scanner.scan()
+
+    assert report.clean, report.summary()
+    assert report.checked == 2
+
+
+def test_scan_reports_each_kind_of_drift(registry, scanner):
+    make_project(registry, "Alpha")
+    make_project(registry, "Beta")
+    registry.pm.add_project("Ghost")
+    os.makedirs(os.path.join(registry.parent, "Stray"))
+    os.makedirs(os.path.join(registry.sync, "Leftover"))
+    shutil.rmtree(os.path.join(registry.parent, "Alpha", "backup", "images"))
+    os.remove(os.path.join(registry.parent, "Alpha", "notes.txt"))
+    shutil.rmtree(os.path.join(registry.sync, "Beta", "docs"))
+
+    report = scanner.scan()
+
+    assert report.missing == ["Ghost"]
+    assert report.orphaned == [os.path.join(registry.parent, "Stray"), os.path.join(registry.sync, "Leftover")]
+    assert sorted(report.drifted["Alpha"]) == [os.path.join("backup", "images"), "notes.txt"]
+    assert report.broken_links == [("Beta", os.path.join(registry.parent, "Beta", "docs"), "target missing")]
+    assert "Beta" in report.drifted  # the sync folder behind the link is gone too
+
+
+def test_archived_projects_are_not_missing(registry, scanner):
+    project = registry.pm.add_project("Old")
+    project.archive_path = os.path.join(registry.root, "Old.zip")
+    registry.pm.update_project(project)
+
+    assert scanner.scan().clean
+
+
+def test_second_scan_reuses_cached_listings(registry, scanner, monkeypatch):
+    monkeypatch.setattr(reconcile, "CACHE_MIN_AGE_NS", -1)
+    make_project(registry, "Alpha")
+    first = scanner.scan()
+    second = scanner.scan()
+
+    assert first.reused == 0 and first.listed > 0
+    assert second.listed == 0 and second.reused == first.listed
+    assert scanner.scan(incremental=False).reused == 0
+
+    # A changed directory is listed again
+    os.makedirs(os.path.join(registry.parent, "Stray"))
+    third = scanner.scan()
+    assert third.listed == 1 and third.orphaned == [os.path.join(registry.parent, "Stray")]
+
+
+def test_concurrent_listings_of_one_directory_read_it_once(tmp_path, monkeypatch):
+    (tmp_path / "a").mkdir()
+    calls = []
+    real_scandir = os.scandir
+
+    def slow_scandir(path):
+        calls.append(path)
+        time.sleep(0.05)
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", slow_scandir)
+    lister = DirectoryLister()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(lister.list(str(tmp_path)))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1 and lister.listed == 1
+    assert results == [{"a": reconcile.KIND_DIR}] * 8
+
+
+def test_concurrent_cache_hits_are_counted_once(tmp_path, monkeypatch):
+    key = os.path.normcase(str(tmp_path))
+    cache = {key: [os.stat(tmp_path).st_mtime_ns, {"cached": reconcile.KIND_FILE}]}
+    real_stat = os.stat
+
+    def slow_stat(path, *args, **kwargs):
+        time.sleep(0.02)
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "stat", slow_stat)
+    lister = DirectoryLister(cache)
+    threads = [threading.Thread(target=lister.list, args=(str(tmp_path),)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert lister.reused == 1 and lister.listed == 0
+    assert lister.cache() == cache
+
+
+def test_listing_a_missing_directory(tmp_path):
+    lister = DirectoryLister()
+    assert lister.list(str(tmp_path / "missing")) is None
+    assert lister.list(str(tmp_path / "missing")) is None
+
+
+# ----- template repair -----
+
+def extend_template(registry):
+    structure = registry.sm.load_structure()
+    structure["folders"].append({"name": "reports", "folders": [{"name": "2024"}]})
+    structure["files"].append({"name": "todo.txt", "attribute": "auto"})
+    registry.sm.save_structure(structure)
+
+
+def test_plan_repair_is_a_dry_run(registry, scanner):
+    make_project(registry, "Alpha")
+    extend_template(registry)
+    repair = scanner.plan_repair()
+
+    assert repair.checked == 1 and len(repair) == 4
+    paths = {step.path for step in repair.items["Alpha"]}
+    assert os.path.join(registry.parent, "Alpha", "reports", "2024") in paths
+    assert os.path.join(registry.sync, "Alpha", "todo.txt") in paths
+    assert not os.path.exists(os.path.join(registry.parent, "Alpha", "reports"))
+
+
+def test_repair_creates_only_missing_items(registry, scanner):
+    make_project(registry, "Alpha")
+    notes = os.path.join(registry.parent, "Alpha", "notes.txt")
+    with open(notes, "w", encoding="utf-8") as f:
+        f.write("keep me")
+    extend_template(registry)
+
+    links = scanner.repair(scanner.plan_repair())
+
+    assert not links.failures
+    assert os.path.isdir(os.path.join(registry.parent, "Alpha", "reports", "2024"))
+    assert os.path.islink(os.path.join(registry.parent, "Alpha", "todo.txt"))
+    with open(notes, encoding="utf-8") as f:
+        assert f.read() == "keep me"
+    assert len(scanner.plan_repair()) == 0
+    assert scanner.scan().clean
+
+
+def test_plan_repair_for_one_group(registry, scanner):
+    group = registry.pm.add_group("Clients")
+    make_project(registry, "Alpha")
+    beta = make_project(registry, "Beta")
+    beta.group_id = group.id
+    registry.pm.update_project(beta)
+    registry.pm.add_project("Ghost", group_id=group.id)
+    extend_template(registry)
+
+    repair = scanner.plan_repair(group.id)
+    assert list(repair.items) == ["Beta"]
+    assert repair.skipped == ["Ghost"]
+    assert list(scanner.plan_repair(0).items) == ["Alpha"]
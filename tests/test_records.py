@@ -0,0 +1,46 @@
+"""
+Tests for the slotted record classes and per-record encoding (models.py,
+storage.encode_records)
+"""
+import json
+import pytest
+from src.config import FSYNC_NEVER
+from src.models import Project, ProjectGroup
+from src.storage import AtomicWriter, encode_records
+
+PROJECTS = [
+    Project(1, "Alpha", "multi\nline \"quoted\"", "active", "2024-01-01", "", 3),
+    Project(2, "Bêta ✓", "", "inactive", "2024-02-01", "2024-06-30", 0, "/archive/Beta.zip"),
+    Project(3, "Gamma", "tab\tand ] , chars"),
+]
+
+
+@pytest.mark.parametrize("record", [PROJECTS[0], ProjectGroup(1, "Clients", "desc")])
+def test_records_have_no_instance_dict(record):
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(AttributeError):
+        record.unknown = 1
+
+
+def test_dict_round_trip_shares_repeated_strings():
+    data = [p.to_dict() for p in PROJECTS]
+    copies = [Project.from_dict(json.loads(json.dumps(item))) for item in data]
+
+    assert [p.to_dict() for p in copies] == data
+    assert copies[0].status is Project.from_dict({"status": "active"}).status
+    assert ProjectGroup.from_dict(ProjectGroup(4, "G").to_dict()).to_dict() == ProjectGroup(4, "G").to_dict()
+
+
+@pytest.mark.parametrize("indent", [None, 2, 4])
+@pytest.mark.parametrize("records", [PROJECTS, PROJECTS[:1], []])
+def test_encode_records_matches_json_dumps(records, indent):
+    expected = json.dumps([r.to_dict() for r in records], indent=indent, ensure_ascii=False)
+    assert encode_records(records, indent) == expected
+
+
+def test_encode_records_accepts_a_generator(tmp_path):
+    path = str(tmp_path / "projects.json")
+    AtomicWriter(policy=FSYNC_NEVER).write_records(path, (p for p in PROJECTS))
+
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == [p.to_dict() for p in PROJECTS]
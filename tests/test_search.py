@@ -0,0 +1,81 @@
+"""
+Tests for the project search index (search.py)
+"""
+import random
+from src.search import ProjectSearchIndex, tokenize
+
+
+def brute_force(pm, query: str) -> set:
+    """Ids matching every query word as a token prefix, without an index"""
+    groups = {group.id: group.name for group in pm.load_groups()}
+    words = tokenize(query)
+    return {
+        p.id for p in pm.load_projects()
+        if all(any(token.startswith(word)
+                   for token in tokenize(p.name, p.description, p.status, groups.get(p.group_id, "")))
+               for word in words)
+    }
+
+
+def test_search_matches_prefixes_of_every_word(registry):
+    pm = registry.pm
+    clients = pm.add_group("Clients")
+    alpha = pm.add_project("Alpha Website", "Redesign for ACME", "active", clients.id)
+    beta = pm.add_project("Beta App", "mobile redesign", "inactive", 0)
+    index = ProjectSearchIndex(pm)
+
+    assert index.search("") is None
+    assert index.search("red") == {alpha.id, beta.id}
+    assert index.search("redesign acme") == {alpha.id}
+    assert index.search("cli") == {alpha.id}  # group name
+    assert index.search("inact") == {beta.id}
+    assert index.search("website mobile") == set()
+
+
+def test_search_follows_change_events(registry):
+    pm = registry.pm
+    group = pm.add_group("Research")
+    project = pm.add_project("Gamma", "", "active", 0)
+    index = ProjectSearchIndex(pm)
+    assert index.search("research") == set()
+
+    project.group_id = group.id
+    project.name = "Gamma Ray"
+    pm.update_project(project)
+    assert index.search("research ray") == {project.id}
+
+    pm.update_group(group.id, "Lab", group.description, group.status)
+    assert index.search("research") == set()
+    assert index.search("lab") == {project.id}
+
+    other = pm.add_project("Raytracer", "", "active", 0)
+    assert index.search("ray") == {project.id, other.id}
+    pm.delete_project(project.id)
+    assert index.search("ray") == {other.id}
+    index.close()
+
+
+def test_search_agrees_with_brute_force(registry):
+    pm = registry.pm
+    rng = random.Random(7)
+    words = ["alpha", "alps", "beta", "bet", "gamma", "gam", "delta", "x"]
+    groups = [pm.add_group(f"{rng.choice(words)} team {i}") for i in range(4)]
+    for i in range(120):
+        pm.add_project(
+            f"{rng.choice(words)} {rng.choice(words)} {i}", " ".join(rng.sample(words, 2)),
+            rng.choice(["active", "inactive"]), rng.choice([0] + [g.id for g in groups])
+        )
+    index = ProjectSearchIndex(pm)
+    queries = ["a", "al", "alp", "be", "gam ma", "team", "x 1", "delta inactive", "zzz"]
+    for query in queries:
+        assert index.search(query) == brute_force(pm, query), query
+
+    # Mutations are applied as deltas and must keep the index exact
+    for project in rng.sample(pm.load_projects(), 30):
+        project.name = f"{rng.choice(words)} renamed {project.id}"
+        project.group_id = rng.choice([0] + [g.id for g in groups])
+        pm.update_project(project)
+    for project in rng.sample(pm.load_projects(), 20):
+        pm.delete_project(project.id)
+    for query in queries + ["renamed"]:
+        assert index.search(query) == brute_force(pm, query), query
@@ -0,0 +1,81 @@
+"""
+Tests for the SQLite repository and the migration from JSON (storage.py)
+"""
+import json
+import threading
+import pytest
+from src.models import Project, PROJECT_COLUMNS
+from src.storage import SQLiteRepository, open_sqlite, migrate_json_to_sqlite
+
+
+def make_project(project_id: int, **fields) -> Project:
+    return Project(id=project_id, name=f"project-{project_id}", **fields)
+
+
+@pytest.fixture
+def sqlite_repo(tmp_path):
+    connection = open_sqlite(str(tmp_path / "registry.db"))
+    yield SQLiteRepository(connection, threading.Lock(), "projects", PROJECT_COLUMNS, Project.from_dict,
+                           indexes=("name", "group_id", "status"))
+    connection.close()
+
+
+def test_migrate_json_to_sqlite_round_trip(tmp_path, sqlite_repo):
+    projects = [
+        make_project(i, description=f"déscription {i}", status="inactive" if i % 3 else "active",
+                     start_date="2024-01-02", group_id=i % 5, archive_path="" if i % 7 else f"/a/{i}.zip")
+        for i in range(1, 2501)
+    ]
+    path = str(tmp_path / "projects.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([p.to_dict() for p in projects], f, indent=2, ensure_ascii=False)
+
+    assert migrate_json_to_sqlite(path, sqlite_repo, Project.from_dict) == len(projects)
+    assert [p.to_dict() for p in sqlite_repo.all()] == [p.to_dict() for p in projects]
+
+
+def test_migrate_json_to_sqlite_rolls_back_invalid_file(tmp_path, sqlite_repo):
+    path = tmp_path / "projects.json"
+    path.write_text(json.dumps([make_project(1).to_dict(), make_project(2).to_dict()]), encoding="utf-8")
+    migrate_json_to_sqlite(str(path), sqlite_repo, Project.from_dict)
+
+    path.write_text('[{"id": 5, "name": "x"}, {"id": 6, ', encoding="utf-8")
+    with pytest.raises(ValueError):
+        migrate_json_to_sqlite(str(path), sqlite_repo, Project.from_dict)
+    assert sorted(p.id for p in sqlite_repo.all()) == [1, 2]
+
+
+def test_migrate_json_to_sqlite_missing_file(tmp_path, sqlite_repo):
+    assert migrate_json_to_sqlite(str(tmp_path / "missing.json"), sqlite_repo, Project.from_dict) == 0
+    assert sqlite_repo.count() == 0
+
+
+# ----- queries -----
+
+def test_sqlite_repository_queries(sqlite_repo):
+    sqlite_repo.add_many([
+        make_project(i, status="inactive" if i % 2 else "active", group_id=i % 3) for i in range(1, 11)
+    ])
+
+    assert sqlite_repo.count() == 10
+    assert sqlite_repo.next_id() == 11
+    assert sqlite_repo.find_by_name("project-4").id == 4
+    assert sqlite_repo.find_by_name("missing") is None
+    assert sqlite_repo.ids({"group_id": 0}) == {3, 6, 9}
+    assert sqlite_repo.count({"status": "active"}) == 5
+    assert sqlite_repo.count_by(("group_id",))[(1,)] == 4
+    assert [p.id for p in sqlite_repo.scan({"status": "inactive"}, batch_size=2)] == [1, 3, 5, 7, 9]
+    with pytest.raises(ValueError):
+        sqlite_repo.count_by(("nope",))
+
+
+def test_sqlite_repository_mutations(sqlite_repo):
+    sqlite_repo.add_many([make_project(1), make_project(2)])
+    changed = make_project(2, description="changed")
+
+    assert sqlite_repo.update_many([changed, make_project(9)]) == [changed]
+    assert sqlite_repo.get(2).description == "changed"
+    assert sqlite_repo.remove(1).id == 1
+    assert sqlite_repo.remove(1) is None
+    assert sqlite_repo.replace_all((make_project(i) for i in range(5, 8)), batch_size=2) == 3
+    assert sorted(p.id for p in sqlite_repo.all()) == [5, 6, 7]
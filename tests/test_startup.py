@@ -0,0 +1,70 @@
+"""
+Tests for the startup path: deferred imports, background preloading and the
+startup timer (main.py, models.py, profiling.py)
+"""
+import io
+import os
+import sys
+import json
+import threading
+import subprocess
+from src import models
+from src.profiling import StartupTimer
+from src.storage import JsonRepository
+
+DEFERRED_MODULES = ["src.structure_ui", "src.group_ui", "src.archive", "src.reconcile", "src.cli", "src.debug_ui"]
+
+
+def test_main_window_module_defers_dialog_modules():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = f"import sys, src.main; print([m for m in {DEFERRED_MODULES!r} if m in sys.modules])"
+    output = subprocess.run([sys.executable, "-c", script], cwd=root, capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "[]"
+
+
+def test_preload_races_with_readers_and_parses_once(registry, monkeypatch):
+    with open(models.PROJECT_LISTS_FILE, "w", encoding="utf-8") as f:
+        json.dump([models.Project(id=i, name=f"p{i}").to_dict() for i in range(1, 5001)], f)
+    reads = []
+    real_read = JsonRepository._read_snapshot
+
+    def counting_read(self):
+        reads.append(self.path)
+        return real_read(self)
+
+    monkeypatch.setattr(JsonRepository, "_read_snapshot", counting_read)
+    pm = models.ProjectManager("json")
+    seen = []
+    loader = threading.Thread(target=pm.preload)
+    readers = [threading.Thread(target=lambda: seen.append(len(pm.load_projects()))) for _ in range(4)]
+    loader.start()
+    for reader in readers:
+        reader.start()
+    loader.join()
+    for reader in readers:
+        reader.join()
+
+    assert seen == [5000] * 4
+    assert reads.count(models.PROJECT_LISTS_FILE) == 1
+    assert pm.get_project_by_name("p4321").id == 4321
+
+
+def test_startup_timer_report():
+    timer = StartupTimer(True, start=0.0)
+    timer.marks = [("imports", 0.010), ("first frame", 0.035)]
+    stream = io.StringIO()
+    timer.report(stream)
+
+    lines = stream.getvalue().splitlines()
+    assert lines[0] == "Startup timing (ms):"
+    assert lines[2].split() == ["first", "frame", "35.0", "(+25.0)"]
+    assert timer.elapsed_ms("imports") == 10.0 and timer.elapsed_ms("missing") is None
+
+
+def test_disabled_startup_timer_records_nothing():
+    timer = StartupTimer(False)
+    timer.mark("imports")
+    stream = io.StringIO()
+    timer.report(stream)
+
+    assert timer.marks == [] and stream.getvalue() == ""
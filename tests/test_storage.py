@@ -0,0 +1,245 @@
+"""
+Tests for the storage backends: journal replay and compaction, and reloading
+after outside changes.
+"""
+import os
+import json
+import threading
+import pytest
+from src.config import FSYNC_NEVER
+from src.models import Project
+from src.storage import AtomicWriter, JsonRepository, JournalRepository
+
+
+def make_project(project_id: int, **fields) -> Project:
+    return Project(id=project_id, name=f"project-{project_id}", **fields)
+
+
+def write_lines(path, entries, tail: str = ""):
+    with open(path, "w", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+        f.write(tail)
+
+
+def read_ids(path):
+    with open(path, encoding="utf-8") as f:
+        return sorted(item["id"] for item in json.load(f))
+
+
+class BlockingWriter(AtomicWriter):
+    """Writer whose snapshot rewrites (compaction) wait until released"""
+
+    def __init__(self):
+        super().__init__(policy=FSYNC_NEVER)
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def write_json(self, path, data, indent=2):
+        self.entered.set()
+        assert self.release.wait(10), "compaction was never released"
+        super().write_json(path, data, indent)
+
+
+@pytest.fixture
+def writer():
+    return AtomicWriter(policy=FSYNC_NEVER)
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    path = str(tmp_path / "projects.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([make_project(1).to_dict(), make_project(2).to_dict()], f)
+    return path
+
+
+# ----- journal -----
+
+def test_journal_replays_segment_left_by_crash_mid_compaction(snapshot, writer):
+    repo = JournalRepository(snapshot, Project.from_dict, writer=writer)
+    # Journal rotated aside, then the process died before folding it in
+    write_lines(repo.segment_path, [
+        {"op": "put", "record": make_project(3).to_dict()},
+        {"op": "put", "record": make_project(1, description="edited").to_dict()},
+        {"op": "delete", "id": 2},
+    ])
+    # Later appends, the last one torn
+    write_lines(repo.journal_path, [{"op": "put", "record": make_project(4).to_dict()}],
+                tail='{"op": "put", "rec')
+
+    assert sorted(p.id for p in repo.all()) == [1, 3, 4]
+    assert repo.get(1).description == "edited"
+
+    # Loading restarts the unfinished compaction of the segment only
+    repo.wait_for_compaction()
+    assert not os.path.exists(repo.segment_path)
+    assert read_ids(snapshot) == [1, 3]
+    assert os.path.exists(repo.journal_path)
+
+    reopened = JournalRepository(snapshot, Project.from_dict, writer=writer)
+    assert sorted(p.id for p in reopened.all()) == [1, 3, 4]
+    assert reopened.get(1).description == "edited"
+
+
+def test_journal_segment_replay_is_idempotent(snapshot, writer):
+    # Crash after the new snapshot was written but before the segment was removed
+    with open(snapshot, "w", encoding="utf-8") as f:
+        json.dump([make_project(1).to_dict(), make_project(3).to_dict()], f)
+    repo = JournalRepository(snapshot, Project.from_dict, writer=writer)
+    write_lines(repo.segment_path, [
+        {"op": "put", "record": make_project(3).to_dict()},
+        {"op": "delete", "id": 2},
+    ])
+
+    assert sorted(p.id for p in repo.all()) == [1, 3]
+    repo.wait_for_compaction()
+    assert not os.path.exists(repo.segment_path)
+    assert read_ids(snapshot) == [1, 3]
+
+
+def test_journal_writes_during_compaction_are_kept(snapshot):
+    writer = BlockingWriter()
+    repo = JournalRepository(snapshot, Project.from_dict, writer=writer, compact_threshold=3)
+    for project_id in (3, 4, 5):
+        repo.add(make_project(project_id))
+    assert writer.entered.wait(10)
+
+    # Compaction is stuck mid-way; keep writing from two threads
+    def add_range(ids):
+        for project_id in ids:
+            repo.add(make_project(project_id))
+
+    workers = [threading.Thread(target=add_range, args=(range(start, start + 10),)) for start in (6, 16)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    repo.update(make_project(1, description="during compaction"))
+    repo.remove(2)
+
+    expected = [1] + list(range(3, 26))
+    assert sorted(p.id for p in repo.all()) == expected
+
+    writer.release.set()
+    repo.wait_for_compaction()
+    assert not os.path.exists(repo.segment_path)
+    assert read_ids(snapshot) == [1, 2, 3, 4, 5]
+    assert sorted(p.id for p in repo.all()) == expected
+
+    reopened = JournalRepository(snapshot, Project.from_dict, writer=writer)
+    assert sorted(p.id for p in reopened.all()) == expected
+    assert reopened.get(1).description == "during compaction"
+
+    repo.compact()
+    assert not os.path.exists(repo.journal_path)
+    assert read_ids(snapshot) == expected
+
+
+def test_journal_full_write_waits_for_compaction(snapshot):
+    writer = BlockingWriter()
+    repo = JournalRepository(snapshot, Project.from_dict, writer=writer, compact_threshold=1)
+    repo.add(make_project(3))
+    assert writer.entered.wait(10)
+    repo.add(make_project(4))
+
+    replacing = threading.Thread(target=repo.replace_all, args=([make_project(100)],))
+    replacing.start()
+    replacing.join(0.2)
+    assert replacing.is_alive()
+
+    writer.release.set()
+    replacing.join(10)
+    assert not replacing.is_alive()
+    assert not os.path.exists(repo.journal_path)
+    assert not os.path.exists(repo.segment_path)
+    assert read_ids(snapshot) == [100]
+    assert [p.id for p in JournalRepository(snapshot, Project.from_dict, writer=writer).all()] == [100]
+
+
+def test_journal_sees_changes_from_another_instance(snapshot, writer):
+    repo = JournalRepository(snapshot, Project.from_dict, writer=writer)
+    assert repo.count() == 2
+    other = JournalRepository(snapshot, Project.from_dict, writer=writer)
+    other.add(make_project(3))
+    other.remove(1)
+
+    assert sorted(p.id for p in repo.all()) == [2, 3]
+
+
+# ----- external changes -----
+
+def test_json_repository_reloads_after_external_change(snapshot, writer):
+    repo = JsonRepository(snapshot, Project.from_dict, writer=writer)
+    assert sorted(p.id for p in repo.all()) == [1, 2]
+    generation = repo.generation
+
+    with open(snapshot, "w", encoding="utf-8") as f:
+        json.dump([make_project(2, description="by hand").to_dict(), make_project(3).to_dict()], f)
+
+    assert repo.get(3) is not None
+    assert repo.get(1) is None
+    assert repo.get(2).description == "by hand"
+    assert repo.generation > generation
+
+
+def test_json_repository_keeps_own_writes(snapshot, writer):
+    repo = JsonRepository(snapshot, Project.from_dict, writer=writer)
+    repo.all()
+    generation = repo.generation
+    repo.add(make_project(3))
+
+    assert repo.generation == generation  # no re-read of its own write
+    assert read_ids(snapshot) == [1, 2, 3]
+
+
+class FailingOnceWriter(AtomicWriter):
+    """Writer whose first snapshot rewrite (compaction) fails"""
+
+    def __init__(self):
+        super().__init__(policy=FSYNC_NEVER)
+        self.failures = 1
+
+    def write_json(self, path, data, indent=2):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+        super().write_json(path, data, indent)
+
+
+def test_journal_failed_compaction_keeps_segment_entries(snapshot, capsys):
+    writer = FailingOnceWriter()
+    repo = JournalRepository(snapshot, Project.from_dict, writer=writer, compact_threshold=2)
+    repo.add(make_project(3))
+    repo.add(make_project(4))
+    repo.wait_for_compaction()
+    assert isinstance(repo.compaction_error, OSError)
+    assert "disk full" in capsys.readouterr().err
+    assert os.path.exists(repo.segment_path)
+
+    # Crossing the threshold again must not replace the leftover segment
+    repo.remove(1)
+    repo.add(make_project(5))
+    repo.wait_for_compaction()
+    assert repo.compaction_error is None
+    assert not os.path.exists(repo.segment_path)
+    assert read_ids(snapshot) == [2, 3, 4, 5]
+
+    reopened = JournalRepository(snapshot, Project.from_dict, writer=writer)
+    assert sorted(p.id for p in reopened.all()) == [2, 3, 4, 5]
+
+
+def test_journal_rotation_after_torn_segment(snapshot, writer):
+    repo = JournalRepository(snapshot, Project.from_dict, writer=writer, compact_threshold=1)
+    write_lines(repo.segment_path, [{"op": "put", "record": make_project(3).to_dict()}],
+                tail='{"op": "put", "rec')
+    repo.all()
+    repo.wait_for_compaction()
+    assert read_ids(snapshot) == [1, 2, 3]
+    # The torn line is gone with the segment; simulate a second failure leaving one
+    write_lines(repo.segment_path, [{"op": "delete", "id": 1}], tail='{"op": "del')
+    repo.add(make_project(4))
+    repo.wait_for_compaction()
+
+    assert read_ids(snapshot) == [2, 3, 4]
+    assert sorted(p.id for p in JournalRepository(snapshot, Project.from_dict, writer=writer).all()) == [2, 3, 4]